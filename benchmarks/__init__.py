@@ -0,0 +1,5 @@
+"""Performance benchmarks.
+
+Each module is a script that can be run from the root of the repository,
+e.g. `python -m benchmarks.classify`.
+"""
@@ -0,0 +1,123 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Benchmark of paragraph classification, per paragraph type.
+
+Compares InputParagraph.update_list with the chain of trials it replaced,
+where every paragraph was tested against each kind of paragraph in turn.
+"""
+
+import itertools
+from collections import defaultdict
+from io import StringIO
+
+from screenplain.export.html import convert_bare
+from screenplain.parsers import fountain
+from screenplain.parsers.fountain import InputParagraph, note_re
+
+from benchmarks.common import best_time, example_files, print_table, read_file
+
+
+class TrialChainParagraph(InputParagraph):
+    def update_list(self, previous_paragraphs):
+        (
+            self.append_forced_action(previous_paragraphs) or
+            self.append_page_break(previous_paragraphs) or
+            self.append_synopsis(previous_paragraphs) or
+            self.append_sections_and_synopsises(previous_paragraphs) or
+            self.append_slug(previous_paragraphs) or
+            self.append_centered_action(previous_paragraphs) or
+            self.append_dialog(previous_paragraphs) or
+            self.append_transition(previous_paragraphs) or
+            self.append_action(previous_paragraphs)
+        )
+
+    def append_forced_action(self, paragraphs):
+        if self.lines[0].startswith('!'):
+            return self.append_action(paragraphs)
+        else:
+            return False
+
+
+def get_cases(content):
+    """Get the input paragraphs of a script.
+
+    Returns a list of tuples of (lines, previous) where `previous` is the
+    paragraph that precedes the input paragraph, or None.
+
+    """
+    cases = []
+    paragraphs = []
+    _, body, _ = fountain._split_title_page(fountain.linebreak_re.split(
+        fountain.boneyard_re.sub('', content)
+    ))
+    for blank, input_lines in itertools.groupby(body, fountain._is_blank):
+        if blank:
+            continue
+        as_string = note_re.sub('', '\n'.join(input_lines))
+        if fountain._is_blank(as_string):
+            continue
+        lines = as_string.split('\n')
+        cases.append((lines, paragraphs[-1] if paragraphs else None))
+        InputParagraph(lines).update_list(paragraphs)
+    return cases
+
+
+def classify(paragraph_class, lines, previous):
+    paragraphs = [previous] if previous else []
+    paragraph_class(lines).update_list(paragraphs)
+    if paragraphs and paragraphs[-1] is previous:
+        return 'Synopsis', paragraphs
+    return type(paragraphs[-1]).__name__, paragraphs
+
+
+def to_html(paragraphs):
+    out = StringIO()
+    convert_bare(paragraphs, out)
+    return out.getvalue()
+
+
+def main():
+    cases_by_type = defaultdict(list)
+    for path in example_files():
+        for lines, previous in get_cases(read_file(path)):
+            kind, result = classify(InputParagraph, lines, previous)
+            legacy_kind, legacy_result = classify(
+                TrialChainParagraph, lines, previous
+            )
+            assert kind == legacy_kind, lines
+            assert to_html(result) == to_html(legacy_result), lines
+            cases_by_type[kind].append((lines, previous))
+
+    rows = []
+    for kind, cases in sorted(cases_by_type.items()):
+        def run(paragraph_class):
+            def function():
+                for lines, previous in cases:
+                    paragraph_class(lines).update_list(
+                        [previous] if previous else []
+                    )
+            return best_time(function, number=20) / len(cases) * 1e6
+
+        legacy = run(TrialChainParagraph)
+        current = run(InputParagraph)
+        rows.append((
+            kind, len(cases),
+            f'{legacy:.2f}', f'{current:.2f}', f'{legacy / current:.2f}x'
+        ))
+    print_table(
+        ('Type', 'Count', 'Trials (us)', 'Classifier (us)', 'Speedup'),
+        rows
+    )
+
+    for path in example_files():
+        content = read_file(path)
+
+        def parse():
+            fountain.parse(StringIO(content))
+        print(f'{path}: full parse {best_time(parse) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
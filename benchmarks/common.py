@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Helpers shared by the benchmark scripts."""
+
+import glob
+import os.path
+import random
+import timeit
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def example_files():
+    """Get the paths of the Fountain files in the examples directory."""
+    return sorted(glob.glob(os.path.join(root_dir, 'examples', '*.fountain')))
+
+
+def read_file(path):
+    with open(path, encoding='utf-8-sig') as stream:
+        return stream.read()
+
+
+_characters = ('BRICK', 'STEEL', 'JOHN', 'MARY', 'THE BOSS', 'DOCTOR')
+_locations = ('KITCHEN', 'STREET', 'OFFICE', 'CAR', 'ROOFTOP', 'BAR')
+_words = (
+    'the', 'a', 'he', 'she', 'walks', 'looks', 'at', 'door', 'slowly',
+    'gun', 'window', 'turns', 'around', 'and', 'smiles', 'never', 'here',
+    'what', 'you', 'I', 'know', 'it', 'was', 'not', 'me', 'again',
+)
+
+
+def _sentence(rng, styled):
+    words = [rng.choice(_words) for _ in range(rng.randint(4, 14))]
+    if styled and rng.random() < 0.2:
+        index = rng.randrange(len(words))
+        marker = rng.choice(('*', '**', '_'))
+        words[index] = marker + words[index] + marker
+    return ' '.join(words).capitalize() + rng.choice('.!?')
+
+
+def synthetic_script(pages, seed=0, styled=True):
+    """Create a Fountain screenplay of roughly `pages` pages.
+
+    It has the kinds of paragraphs a real screenplay has: sections,
+    scenes with synopses, action, dialog with parentheticals, dual
+    dialog and transitions, and some emphasis if `styled` is true.
+
+    """
+    rng = random.Random(seed)
+    lines = ['Title: Synthetic', 'Author: Benchmark', '']
+    # Approximate number of lines on a page of output
+    page_lines = 55
+    total = 0
+    scene = 0
+    while total < pages * page_lines:
+        if scene % 40 == 0:
+            lines += [f'# Act {scene // 40 + 1}', '']
+        scene += 1
+        lines += [
+            f'INT. {rng.choice(_locations)} - DAY #{scene}#', '',
+            f'= Scene {scene}', '',
+        ]
+        total += 2
+        for _ in range(rng.randint(3, 8)):
+            kind = rng.random()
+            if kind < 0.35:
+                sentences = [
+                    _sentence(rng, styled) for _ in range(rng.randint(1, 3))
+                ]
+                lines += [' '.join(sentences), '']
+                total += 2 + len(lines[-2]) // 61
+            elif kind < 0.9:
+                lines.append(rng.choice(_characters))
+                if rng.random() < 0.2:
+                    lines.append('(quietly)')
+                lines += [_sentence(rng, styled), '']
+                total += 4
+            else:
+                lines += [
+                    rng.choice(_characters), _sentence(rng, styled), '',
+                    rng.choice(_characters) + ' ^', _sentence(rng, styled),
+                    '',
+                ]
+                total += 4
+        if rng.random() < 0.3:
+            lines += ['CUT TO:', '']
+            total += 2
+    return '\n'.join(lines)
+
+
+def best_time(function, number=1, repeat=5):
+    """Get the best time in seconds of one call to `function`."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def print_table(headers, rows):
+    """Print rows of values as a table with aligned columns."""
+    rows = [headers] + [[str(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+    for row in rows:
+        print('  '.join(
+            value.ljust(width) if i == 0 else value.rjust(width)
+            for i, (value, width) in enumerate(zip(row, widths))
+        ))
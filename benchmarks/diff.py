@@ -0,0 +1,75 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures the time to compare two revisions of a screenplay,
+where the second revision has some paragraphs changed, inserted and
+deleted.
+"""
+
+import os.path
+import random
+from io import StringIO
+
+from screenplain.diff import diff
+from screenplain.parsers import fountain
+from screenplain.types import Screenplay
+
+from benchmarks.common import (
+    best_time, print_table, read_file, root_dir, synthetic_script
+)
+
+path = os.path.join(root_dir, 'examples', 'Big-Fish.fountain')
+
+
+def revise(screenplay, edits, rng):
+    """Create a copy of a screenplay with some paragraphs moved,
+    duplicated and removed."""
+    paragraphs = list(screenplay.paragraphs)
+    for _ in range(edits):
+        index = rng.randrange(len(paragraphs))
+        kind = rng.randrange(3)
+        if kind == 0:
+            del paragraphs[index]
+        elif kind == 1:
+            paragraphs.insert(index, rng.choice(paragraphs))
+        else:
+            paragraphs[index] = rng.choice(paragraphs)
+    return Screenplay(screenplay.title_page, paragraphs)
+
+
+def main():
+    rng = random.Random(5)
+    rows = []
+    for name, source in (
+        ('Big Fish', read_file(path)),
+        ('Synthetic, 500 pages', synthetic_script(500)),
+    ):
+        old = fountain.parse(StringIO(source))
+        for edits in (0, 10, 100, 1000):
+            new = revise(old, edits, rng)
+
+            def run():
+                # Don't reuse the scene index between runs
+                old.invalidate_index()
+                new.invalidate_index()
+                return diff(old, new)
+
+            result = run()
+            rows.append((
+                name, len(old.paragraphs), edits,
+                len(result.changed), len(result.inserted),
+                len(result.deleted),
+                f'{best_time(run) * 1e3:.1f}',
+            ))
+    print_table(
+        (
+            'Screenplay', 'Paragraphs', 'Edits', 'Changed', 'Inserted',
+            'Deleted', 'Time (ms)'
+        ),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
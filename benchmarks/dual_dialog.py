@@ -0,0 +1,114 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares laying out dual dialog in the PDF export with a platypus
+Table, as before, and with DualDialogColumns, on a screenplay where
+most of the dialog is dual dialog.
+"""
+
+import random
+from io import BytesIO, StringIO
+
+from reportlab import platypus
+
+from screenplain.export import pdf
+from screenplain.parsers import fountain
+from screenplain.types import Dialog, DualDialog, Slug
+
+from benchmarks.common import _sentence, best_time, print_table
+
+_characters = ('BRICK', 'STEEL', 'JOHN', 'MARY')
+
+
+def dual_dialog_script(pages, seed=0):
+    """Create a Fountain screenplay of roughly `pages` pages
+    that is mostly dual dialog of different lengths."""
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < pages * 55:
+        lines += ['INT. ROOM - NIGHT', '', 'They talk at once.', '']
+        total += 4
+        for _ in range(rng.randint(3, 6)):
+            left, right = rng.sample(_characters, 2)
+            for name in (left, right + ' ^'):
+                lines.append(name)
+                for _ in range(rng.randint(1, 6)):
+                    if rng.random() < 0.2:
+                        lines.append('(beat)')
+                    lines.append(_sentence(rng, True))
+                lines.append('')
+            total += 12
+    return '\n'.join(lines)
+
+
+def add_table_dual_dialog(story, dual, settings):
+    """Add dual dialog as a Table, like pdf.add_dual_dialog did."""
+    col_width = settings.frame_width / 2
+    story.append(platypus.Table(
+        [[
+            pdf._dialog_to_flowables(
+                dialog, settings, column_width=col_width
+            )
+            for dialog in (dual.left, dual.right)
+        ]],
+        splitInRow=1,
+        spaceBefore=settings.line_height,
+        colWidths=[col_width, col_width],
+        style=settings.dual_dialog_table_style,
+    ))
+
+
+def create_story(screenplay, settings, add_dual_dialog):
+    story = []
+    for para in screenplay:
+        if isinstance(para, DualDialog):
+            add_dual_dialog(story, para, settings)
+        elif isinstance(para, Dialog):
+            pdf.add_dialog(story, para, settings)
+        elif isinstance(para, Slug):
+            pdf.add_slug(story, para, settings)
+        else:
+            pdf.add_paragraph(story, para, settings.action_style)
+    return story
+
+
+def write(screenplay, settings, add_dual_dialog):
+    pdf.DocTemplate(BytesIO(), settings=settings).build(
+        create_story(screenplay, settings, add_dual_dialog)
+    )
+
+
+def main():
+    rows = []
+    screenplay = fountain.parse(StringIO(dual_dialog_script(50)))
+    duals = sum(isinstance(para, DualDialog) for para in screenplay)
+    for font, font_settings in (
+        ('Courier Prime', None),
+        ('Courier', pdf.get_standard_font_settings()),
+    ):
+        settings = pdf.Settings(font_settings=font_settings)
+        table_time, columns_time = (
+            best_time(
+                lambda: write(screenplay, settings, add_dual_dialog),
+                repeat=3,
+            )
+            for add_dual_dialog in (
+                add_table_dual_dialog, pdf.add_dual_dialog
+            )
+        )
+        rows.append((
+            font,
+            f'{table_time * 1e3:.0f}',
+            f'{columns_time * 1e3:.0f}',
+            f'{table_time / columns_time:.1f}x',
+        ))
+    print(f'{duals} dual dialogs')
+    print_table(
+        ('Font', 'Table (ms)', 'DualDialogColumns (ms)', 'Speedup'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
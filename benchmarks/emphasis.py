@@ -0,0 +1,87 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Micro-benchmark of parse_emphasis on lines with different amounts
+of styling.
+
+Compares with the original implementation, which made one substitution
+pass per style. The cache of parse_emphasis is bypassed for the
+comparison; its hit rate on the example screenplays is shown last.
+"""
+
+import os.path
+import random
+from io import StringIO
+
+from screenplain.parsers import fountain
+from screenplain.richstring import parse_emphasis
+from tests.richstring_test import random_markup, reference_parse_emphasis
+
+from benchmarks.common import (
+    best_time, example_files, print_table, read_file
+)
+
+lines = {
+    'plain': [
+        'Brick strolls down the street, looking at the houses.',
+        'STEEL',
+        'INT. BRICK\'S PATIO - DAY',
+        'I had no idea.',
+    ],
+    'light': [
+        'Brick strolls down the *quiet* street.',
+        'He has **never** been here before.',
+        'The sign says _CLOSED_ in big letters.',
+        'I had no idea. Really\\*.',
+    ],
+    'heavy': [
+        'You can _underline_ words, make them **bold** or *italic* '
+        'or even ***bold italic.***',
+        '*Swedish **style** rules* and _**underlined bold**_ too',
+        '**Swedish *style* rules** _*he_llo*',
+        '*first* *second* **third** **fourth** _fifth_ _sixth_',
+    ],
+}
+
+
+def main():
+    rng = random.Random(1)
+    fuzz_corpus = [random_markup(rng, rng.randint(0, 20)) for _ in range(5000)]
+    for source in fuzz_corpus + sum(lines.values(), []):
+        assert parse_emphasis(source) == reference_parse_emphasis(source)
+
+    rows = []
+    for kind, sources in lines.items():
+        def run(function):
+            def parse_all():
+                for source in sources:
+                    function(source)
+            return best_time(parse_all, number=2000) / len(sources) * 1e6
+
+        reference = run(reference_parse_emphasis)
+        current = run(parse_emphasis.__wrapped__)
+        rows.append((
+            kind, f'{reference:.2f}', f'{current:.2f}',
+            f'{reference / current:.2f}x'
+        ))
+    print_table(
+        ('Lines', 'Substitutions (us)', 'Tokenizer (us)', 'Speedup'), rows
+    )
+    print()
+
+    rows = []
+    for path in example_files():
+        source = read_file(path)
+        parse_emphasis.cache_clear()
+        fountain.parse(StringIO(source))
+        info = parse_emphasis.cache_info()
+        rows.append((
+            os.path.basename(path), info.hits, info.misses,
+            f'{info.hits / (info.hits + info.misses):.0%}'
+        ))
+    print_table(('Screenplay', 'Cache hits', 'Misses', 'Hit rate'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures creating PDF Settings, which registers the Courier Prime
+fonts, with the font registry and with loading the font files each
+time as before the registry, and the time to convert a short
+screenplay to PDF either way.
+"""
+
+import os.path
+from io import BytesIO, StringIO
+
+from screenplain.export import pdf
+from screenplain.parsers import fountain
+
+from benchmarks.common import best_time, print_table, read_file, root_dir
+
+
+def uncached_settings():
+    font_settings = pdf.get_courier_prime_settings()
+    font_settings._register_fonts()
+    return pdf.Settings(font_settings=font_settings)
+
+
+def main():
+    screenplay = fountain.parse(StringIO(read_file(
+        os.path.join(root_dir, 'tests', 'files', 'simple.fountain')
+    )))
+    rows = []
+    for name, create_settings in (
+        ('loading font files', uncached_settings),
+        ('font registry', pdf.Settings),
+    ):
+        settings_time = best_time(create_settings, number=20)
+        convert_time = best_time(
+            lambda: pdf.to_pdf(
+                screenplay, BytesIO(), settings=create_settings()
+            ),
+            number=5,
+        )
+        rows.append((
+            name,
+            f'{settings_time * 1e3:.2f}',
+            f'{convert_time * 1e3:.1f}',
+        ))
+    print_table(('Fonts', 'Settings (ms)', 'Short PDF (ms)'), rows)
+
+
+if __name__ == '__main__':
+    main()
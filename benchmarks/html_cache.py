@@ -0,0 +1,63 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures converting a screenplay to HTML again after a small edit,
+with and without a FragmentCache.
+
+Like in a live preview, the edited source is parsed again for each
+conversion, and the time of the parsing is not included.
+"""
+
+import os.path
+import time
+from io import StringIO
+
+from screenplain.export.html import FragmentCache, convert_bare
+from screenplain.parsers import fountain
+
+from benchmarks.common import (
+    print_table, read_file, root_dir, synthetic_script
+)
+
+
+def main():
+    rows = []
+    for name, source in (
+        (
+            'Big Fish',
+            read_file(os.path.join(root_dir, 'examples', 'Big-Fish.fountain'))
+        ),
+        ('Synthetic, 500 pages', synthetic_script(500)),
+    ):
+        before = fountain.parse(StringIO(source))
+        edited = source.replace('.', '!', 1)
+        after = fountain.parse(StringIO(edited))
+
+        def render(cache):
+            """Get the best time of converting freshly parsed copies."""
+            times = []
+            for _ in range(5):
+                screenplay = fountain.parse(StringIO(edited))
+                start = time.perf_counter()
+                convert_bare(screenplay, StringIO(), fragment_cache=cache)
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        cache = FragmentCache()
+        convert_bare(before, StringIO(), fragment_cache=cache)
+        convert_bare(after, StringIO(), fragment_cache=cache)
+        uncached = render(None)
+        cached = render(cache)
+        rows.append((
+            name, f'{uncached * 1e3:.1f}', f'{cached * 1e3:.1f}',
+            f'{cache.hit_rate:.1%}',
+        ))
+    print_table(
+        ('Screenplay', 'Without cache (ms)', 'With cache (ms)', 'Hit rate'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures HTML export of a synthetic 5000 page screenplay
+in one process and in 1 to N worker processes,
+where N is the number of CPUs, or the first argument.
+"""
+
+import os
+import sys
+from io import StringIO
+
+from screenplain.export.html import convert_bare, convert_parallel
+from screenplain.parsers import fountain
+
+from benchmarks.common import best_time, print_table, synthetic_script
+
+
+def main(max_workers):
+    screenplay = fountain.parse(StringIO(synthetic_script(5000)))
+    paragraphs = list(screenplay)
+    print(f'{len(paragraphs)} paragraphs')
+
+    serial = best_time(lambda: convert_bare(paragraphs, StringIO()), repeat=3)
+    rows = [('serial', f'{serial:.2f}', '1.00')]
+    for workers in range(1, max_workers + 1):
+        time = best_time(
+            lambda: convert_parallel(paragraphs, StringIO(), workers),
+            repeat=3,
+        )
+        rows.append((workers, f'{time:.2f}', f'{serial / time:.2f}'))
+    print_table(('Workers', 'Time (s)', 'Speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count())
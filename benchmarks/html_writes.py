@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures the number of write calls and the time of HTML export
+through a codecs writer, as used by the command line tool, with and
+without collecting the output in chunks.
+"""
+
+import codecs
+import os.path
+from io import BytesIO, StringIO
+
+from screenplain.export.html import Formatter
+from screenplain.parsers import fountain
+
+from benchmarks.common import (
+    best_time, print_table, read_file, root_dir, synthetic_script
+)
+
+
+class CountingWriter:
+    """Counts the calls to write of a file-like object."""
+
+    def __init__(self, out):
+        self.out = out
+        self.count = 0
+
+    def write(self, text):
+        self.count += 1
+        self.out.write(text)
+
+
+class DirectWriter:
+    """Writes every string directly, as the Formatter used to."""
+
+    def __init__(self, out):
+        self.write = out.write
+
+    def check(self):
+        pass
+
+    def flush(self):
+        pass
+
+
+def convert(screenplay, chunk_size):
+    out = CountingWriter(codecs.getwriter('utf-8')(BytesIO()))
+    formatter = Formatter(out, chunk_size)
+    if chunk_size is None:
+        formatter.out = DirectWriter(out)
+    formatter.convert(screenplay)
+    return out
+
+
+def main():
+    rows = []
+    for name, source in (
+        (
+            'Big Fish',
+            read_file(os.path.join(root_dir, 'examples', 'Big-Fish.fountain'))
+        ),
+        ('Synthetic, 500 pages', synthetic_script(500)),
+    ):
+        screenplay = fountain.parse(StringIO(source))
+        for chunk_size in (None, 4 * 1024, 64 * 1024):
+            writes = convert(screenplay, chunk_size).count
+            time = best_time(lambda: convert(screenplay, chunk_size))
+            rows.append((
+                name,
+                'unbuffered' if chunk_size is None else chunk_size,
+                writes,
+                f'{time * 1e3:.1f}',
+            ))
+    print_table(('Screenplay', 'Chunk size', 'Writes', 'Time (ms)'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures the time of an edit with IncrementalParser on Big Fish
+repeated several times, to show how it depends on the size of the
+screenplay.
+
+Each edit is made in the middle of the screenplay: inserting an action
+and removing it again, which moves the lines and paragraphs after it,
+and replacing a line with one of the same length, which does not.
+"""
+
+import os.path
+
+from screenplain.parsers.fountain import IncrementalParser
+
+from benchmarks.common import best_time, print_table, read_file, root_dir
+
+
+def main():
+    source = read_file(
+        os.path.join(root_dir, 'examples', 'Big-Fish.fountain')
+    ).splitlines()
+    rows = []
+    for copies in (1, 10, 40):
+        lines = source * copies
+        parser = IncrementalParser(lines)
+        # A blank line in the middle of the body
+        middle = lines.index('', len(lines) // 2)
+        # A line of action after it
+        action = middle + 1
+        while not lines[action]:
+            action += 1
+
+        def insert_and_remove():
+            parser.edit(middle, middle, ['', 'A new action.'])
+            parser.edit(middle, middle + 2, [])
+
+        def replace():
+            parser.edit(action, action + 1, [lines[action]])
+
+        rows.append((
+            copies, len(lines), len(parser.screenplay.paragraphs),
+            f'{best_time(insert_and_remove, number=100) / 2 * 1e3:.3f}',
+            f'{best_time(replace, number=100) * 1e3:.3f}',
+        ))
+    print_table(
+        (
+            'Copies', 'Lines', 'Paragraphs', 'Insert or remove (ms)',
+            'Replace (ms)',
+        ),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
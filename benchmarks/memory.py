@@ -0,0 +1,181 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Measures the memory used by a large screenplay.
+
+The rich strings are compared with the original layout, where every
+object had a __dict__ and every segment had its own set of styles.
+
+The whole screenplay is measured per page with paragraph objects
+that have a __dict__, with __slots__, and in ColumnarParagraphs.
+"""
+
+import sys
+import tracemalloc
+from io import StringIO
+
+from screenplain.parsers import fountain
+from screenplain.richstring import (
+    RichString, Segment, all_styles, parse_emphasis
+)
+from screenplain.types import ColumnarParagraphs
+
+from benchmarks.common import print_table, synthetic_script
+
+pages = 500
+
+
+class LegacyRichString:
+    def __init__(self, *segments):
+        self.segments = segments
+
+
+class LegacySegment:
+    def __init__(self, text, styles):
+        self.text = text
+        self.styles = set(styles)
+
+
+class LegacyParagraph:
+    def __init__(self, attributes):
+        self.__dict__.update(attributes)
+
+
+def attributes(value):
+    """Get the attributes of an object as a dict."""
+    if hasattr(value, '__dict__'):
+        return vars(value)
+    return {
+        name: getattr(value, name)
+        for cls in type(value).__mro__
+        for name in getattr(cls, '__slots__', ())
+        if hasattr(value, name)
+    }
+
+
+def rich_strings(value):
+    """Get all the RichString objects in a paragraph or list."""
+    if isinstance(value, RichString):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from rich_strings(item)
+    elif value is not None and not isinstance(value, (str, int)):
+        yield from rich_strings(list(attributes(value).values()))
+
+
+def to_legacy(paragraph):
+    """Copy a paragraph to an object with a __dict__."""
+    return LegacyParagraph({
+        name: (
+            to_legacy(value) if name in ('left', 'right') else value
+        )
+        for name, value in attributes(paragraph).items()
+    })
+
+
+def deep_size(value, seen=None):
+    """Get the number of bytes used by an object
+    and everything it refers to."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen or isinstance(value, type):
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        children = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple)):
+        children = value
+    elif isinstance(value, (str, int, float, bytes)) or value is None:
+        children = ()
+    else:
+        if hasattr(value, '__dict__'):
+            size += deep_size(vars(value), seen)
+        children = list(attributes(value).values())
+    return size + sum(deep_size(child, seen) for child in children)
+
+
+def allocated(function, argument):
+    """Get the number of bytes that are still allocated
+    after calling a function."""
+    tracemalloc.start()
+    result = function(argument)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def build_current(lines):
+    return [
+        RichString(*(
+            Segment.from_mask(text, mask) for text, mask in segments
+        ))
+        for segments in lines
+    ]
+
+
+def build_legacy(lines):
+    return [
+        LegacyRichString(*(
+            LegacySegment(text, [s for s in all_styles if s.mask & mask])
+            for text, mask in segments
+        ))
+        for segments in lines
+    ]
+
+
+def main():
+    source = synthetic_script(pages)
+    screenplay = fountain.parse(StringIO(source))
+    # The texts are shared, so only the size of the objects is measured
+    lines = [
+        [(segment.text, segment.style_mask) for segment in string.segments]
+        for string in rich_strings(screenplay.paragraphs)
+    ]
+    segment_count = sum(len(segments) for segments in lines)
+
+    legacy, legacy_strings = allocated(build_legacy, lines)
+    current, current_strings = allocated(build_current, lines)
+    assert len(legacy_strings) == len(current_strings)
+    print(
+        f'{pages} pages, {len(lines)} rich strings, '
+        f'{segment_count} segments'
+    )
+    print_table(
+        ('Layout', 'Total (kB)', 'Per segment (bytes)'),
+        [
+            (
+                name, f'{size / 1024:.0f}',
+                f'{size / segment_count:.0f}'
+            )
+            for name, size in (
+                ('__dict__ and set', legacy),
+                ('__slots__ and mask', current),
+            )
+        ]
+    )
+    print(f'Saved {1 - current / legacy:.0%}')
+    print()
+
+    # Measure a screenplay parsed from scratch
+    del screenplay, legacy_strings, current_strings
+    parse_emphasis.cache_clear()
+    paragraphs = fountain.parse(StringIO(source)).paragraphs
+    parse_emphasis.cache_clear()
+    rows = []
+    for name, value in (
+        ('__dict__', [to_legacy(p) for p in paragraphs]),
+        ('__slots__', paragraphs),
+        ('ColumnarParagraphs', ColumnarParagraphs(paragraphs)),
+    ):
+        size = deep_size(value)
+        rows.append((
+            name, f'{size / 1024:.0f}', f'{size / pages / 1024:.1f}'
+        ))
+    print_table(('Paragraphs', 'Total (kB)', 'Per page (kB)'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares writing PDF files with ReportLab and with the native
+PDF writer, and the time it takes to import them.
+"""
+
+import os.path
+import subprocess
+import sys
+from io import BytesIO, StringIO
+
+from screenplain.export import native_pdf, pdf
+from screenplain.parsers import fountain
+
+from benchmarks.common import (
+    best_time, print_table, read_file, root_dir, synthetic_script
+)
+
+
+def import_time(module):
+    """Time a new Python process that imports a module."""
+    return best_time(lambda: subprocess.run(
+        [sys.executable, '-c', f'import {module}'],
+        check=True, cwd=root_dir,
+    ))
+
+
+def main():
+    rows = []
+    for name, source in (
+        (
+            'Big Fish',
+            read_file(os.path.join(root_dir, 'examples', 'Big-Fish.fountain'))
+        ),
+        ('Synthetic, 100 pages', synthetic_script(100)),
+    ):
+        screenplay = fountain.parse(StringIO(source))
+        for font, font_settings, standard_font in (
+            ('Courier Prime', None, False),
+            ('Courier', pdf.get_standard_font_settings(), True),
+        ):
+            settings = pdf.Settings(font_settings=font_settings)
+            reportlab_time = best_time(
+                lambda: pdf.to_pdf(screenplay, BytesIO(), settings=settings),
+                repeat=3,
+            )
+            native_time = best_time(lambda: native_pdf.to_pdf(
+                screenplay, BytesIO(), standard_font=standard_font
+            ))
+            rows.append((
+                name, font,
+                f'{reportlab_time * 1e3:.0f}',
+                f'{native_time * 1e3:.1f}',
+                f'{reportlab_time / native_time:.0f}x',
+            ))
+    print_table(
+        ('Screenplay', 'Font', 'ReportLab (ms)', 'Native (ms)', 'Speedup'),
+        rows
+    )
+    print()
+    print_table(('Module', 'Import in a new process (ms)'), [
+        (module, f'{import_time(module) * 1e3:.0f}')
+        for module in (
+            'screenplain.export.pdf', 'screenplain.export.native_pdf'
+        )
+    ])
+
+
+if __name__ == '__main__':
+    main()
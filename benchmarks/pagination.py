@@ -0,0 +1,51 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares finding the page count with the pagination module
+to building the PDF with ReportLab.
+"""
+
+import os.path
+from io import BytesIO, StringIO
+
+from screenplain.export import pdf
+from screenplain.export.pagination import paginate
+from screenplain.parsers import fountain
+
+from benchmarks.common import (
+    best_time, print_table, read_file, root_dir, synthetic_script
+)
+
+
+def main():
+    settings = pdf.Settings()
+    rows = []
+    for name, source in (
+        (
+            'Big Fish',
+            read_file(os.path.join(root_dir, 'examples', 'Big-Fish.fountain'))
+        ),
+        ('Synthetic, 100 pages', synthetic_script(100)),
+    ):
+        screenplay = fountain.parse(StringIO(source))
+        pdf_time = best_time(
+            lambda: pdf.to_pdf(screenplay, BytesIO(), settings=settings),
+            repeat=3,
+        )
+        paginate_time = best_time(lambda: paginate(screenplay))
+        rows.append((
+            name,
+            paginate(screenplay).page_count,
+            f'{pdf_time * 1e3:.0f}',
+            f'{paginate_time * 1e3:.1f}',
+            f'{pdf_time / paginate_time:.0f}x',
+        ))
+    print_table(
+        ('Screenplay', 'Pages', 'to_pdf (ms)', 'paginate (ms)', 'Speedup'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
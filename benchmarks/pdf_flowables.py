@@ -0,0 +1,111 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares the flowables for the text of a screenplay in the PDF export:
+ReportLab Paragraphs of the HTML of the text, as before, and
+RichParagraph, which takes the RichStrings directly.
+
+Measures creating the flowables, creating and laying them out in the
+width of the page, and writing the whole PDF with them. Dual dialog
+is left out, as it is laid out by a Table.
+"""
+
+import os.path
+from io import BytesIO, StringIO
+
+from reportlab.platypus import Paragraph, Spacer
+
+from screenplain.export import pdf
+from screenplain.parsers import fountain
+from screenplain.types import Action, Dialog, Slug, Transition
+
+from benchmarks.common import (
+    best_time, print_table, read_file, root_dir, synthetic_script
+)
+
+
+def html_paragraph(lines, style):
+    return Paragraph('<br/>'.join(line.to_html() for line in lines), style)
+
+
+def create_story(screenplay, settings, flowable):
+    """Create the flowables of the screenplay like pdf.to_pdf,
+    with `flowable` creating the flowables for text."""
+    story = []
+    for para in screenplay:
+        if isinstance(para, Dialog):
+            story.append(flowable([para.character], settings.character_style))
+            for is_parenthetical, line in para.blocks:
+                if not line.to_html():
+                    story.append(Spacer(1, settings.line_height))
+                else:
+                    story.append(flowable([line], (
+                        settings.parenthentical_style if is_parenthetical
+                        else settings.dialog_style
+                    )))
+        elif isinstance(para, Action):
+            story.append(flowable(para.lines, (
+                settings.centered_action_style if para.centered
+                else settings.action_style
+            )))
+        elif isinstance(para, Slug):
+            for line in para.lines:
+                story.append(flowable([line], settings.slug_style))
+        elif isinstance(para, Transition):
+            story.append(flowable(para.lines, settings.transition_style))
+    return story
+
+
+def layout(screenplay, settings, flowable):
+    for item in create_story(screenplay, settings, flowable):
+        item.wrap(settings.frame_width, settings.frame_height)
+
+
+def write(screenplay, settings, flowable):
+    pdf.DocTemplate(BytesIO(), settings=settings).build(
+        create_story(screenplay, settings, flowable)
+    )
+
+
+def main():
+    rows = []
+    for name, source in (
+        (
+            'Big Fish',
+            read_file(os.path.join(root_dir, 'examples', 'Big-Fish.fountain'))
+        ),
+        ('Synthetic, 100 pages', synthetic_script(100)),
+    ):
+        screenplay = fountain.parse(StringIO(source))
+        for font, font_settings in (
+            ('Courier Prime', None),
+            ('Courier', pdf.get_standard_font_settings()),
+        ):
+            settings = pdf.Settings(font_settings=font_settings)
+            for flowable_name, flowable in (
+                ('Paragraph', html_paragraph),
+                ('RichParagraph', pdf.RichParagraph),
+            ):
+                times = [
+                    best_time(
+                        lambda: function(screenplay, settings, flowable),
+                        repeat=3,
+                    )
+                    for function in (create_story, layout, write)
+                ]
+                rows.append((
+                    name, font, flowable_name,
+                    *(f'{time * 1e3:.0f}' for time in times),
+                ))
+    print_table(
+        (
+            'Screenplay', 'Font', 'Flowable', 'Story (ms)',
+            'Story and layout (ms)', 'PDF (ms)',
+        ),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Benchmark of the fast path for lines without markup.
+
+Every line of Big Fish is converted to a RichString and then to HTML,
+once with the fast path and once the way all lines used to be handled.
+The cache of parse_emphasis is bypassed.
+"""
+
+import os.path
+import re
+from html import escape
+
+from screenplain.richstring import _parse_markup, parse_emphasis
+
+from benchmarks.common import best_time, print_table, read_file, root_dir
+
+path = os.path.join(root_dir, 'examples', 'Big-Fish.fountain')
+
+
+def reference_to_html(rich):
+    """The original implementation of RichString.to_html."""
+    html = ''.join(
+        ''.join(style.start_html for style in seg.get_ordered_styles()) +
+        re.sub(
+            '  +',
+            lambda m: '&nbsp;' * (len(m.group(0)) - 1) + ' ',
+            escape(seg.text, quote=False).encode(
+                'ascii', 'xmlcharrefreplace'
+            ).decode('ascii'),
+        ) +
+        ''.join(
+            style.end_html for style in reversed(seg.get_ordered_styles())
+        )
+        for seg in rich.segments
+    )
+    if html.startswith(' '):
+        return '&nbsp;' + html[1:]
+    else:
+        return html
+
+
+def main():
+    lines = [line.strip() for line in read_file(path).splitlines()]
+    lines = [line for line in lines if line]
+    parse = parse_emphasis.__wrapped__
+    for line in lines:
+        assert parse(line) == _parse_markup(line)
+        assert parse(line).to_html() == reference_to_html(_parse_markup(line))
+    plain_count = sum(1 for line in lines if parse(line)._html is not None)
+
+    def run(function):
+        def convert_all():
+            for line in lines:
+                function(line)
+        return best_time(convert_all, number=20) * 1e3
+
+    rows = []
+    for name, general, fast in (
+        ('parse_emphasis', _parse_markup, parse),
+        (
+            'parse_emphasis + to_html',
+            lambda line: reference_to_html(_parse_markup(line)),
+            lambda line: parse(line).to_html(),
+        ),
+    ):
+        before = run(general)
+        after = run(fast)
+        rows.append((
+            name, f'{before:.2f}', f'{after:.2f}', f'{before / after:.2f}x'
+        ))
+    print(
+        f'{len(lines)} lines, {plain_count} '
+        f'({plain_count / len(lines):.0%}) without markup or HTML escapes'
+    )
+    print_table(('Step', 'General (ms)', 'Fast path (ms)', 'Speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
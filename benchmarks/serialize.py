@@ -0,0 +1,64 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares loading a serialized screenplay with parsing it again,
+and the binary format with pickle.
+"""
+
+import os.path
+import pickle
+import zlib
+from io import StringIO
+
+from screenplain import serialize
+from screenplain.parsers import fountain
+from screenplain.richstring import parse_emphasis
+
+from benchmarks.common import (
+    best_time, example_files, print_table, read_file, synthetic_script
+)
+
+
+def main():
+    sources = [
+        (os.path.basename(path), read_file(path)) for path in example_files()
+    ]
+    sources.append(('Synthetic, 200 pages', synthetic_script(200)))
+
+    rows = []
+    for name, source in sources:
+        def parse():
+            parse_emphasis.cache_clear()
+            return fountain.parse(StringIO(source))
+
+        screenplay = parse()
+        binary = serialize.dumps(screenplay)
+        pickled = pickle.dumps(screenplay, pickle.HIGHEST_PROTOCOL)
+        number = 5
+        parse_time = best_time(parse, number=number)
+        load_time = best_time(lambda: serialize.loads(binary), number=number)
+        columnar_time = best_time(
+            lambda: serialize.loads(binary, columnar=True), number=number
+        )
+        unpickle_time = best_time(lambda: pickle.loads(pickled), number)
+        rows.append((
+            name,
+            f'{parse_time * 1e3:.2f}',
+            f'{load_time * 1e3:.2f}',
+            f'{columnar_time * 1e3:.2f}',
+            f'{unpickle_time * 1e3:.2f}',
+            f'{len(binary) // 1024} / {len(zlib.compress(binary)) // 1024}',
+            f'{len(pickled) // 1024} / {len(zlib.compress(pickled)) // 1024}',
+        ))
+    print_table(
+        (
+            'Screenplay', 'Parse (ms)', 'Load (ms)', 'Load columnar (ms)',
+            'Unpickle (ms)', 'Binary / zlib (kB)', 'Pickle / zlib (kB)',
+        ),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,2 @@
 nosetests --nocapture --with-doctest --doctest-tests
-pycodestyle --ignore=E402,W504 screenplain tests
+pycodestyle --ignore=E402,W504 screenplain tests benchmarks
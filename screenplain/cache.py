@@ -0,0 +1,190 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Cache of parsed screenplays, so unchanged input doesn't have to be
+parsed again.
+"""
+
+import hashlib
+import os
+import os.path
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from io import StringIO
+
+from screenplain import serialize
+from screenplain.parsers import fountain
+
+# File name extension of the files in a cache directory
+CACHE_FILE_EXTENSION = '.screenplay'
+
+
+class ParseCache:
+    """Parses Fountain source, keeping the results in a cache.
+
+    The cache has two tiers: the most recently used screenplays are kept
+    in memory, and optionally all screenplays are stored as files in a
+    directory, so the cache can be shared between processes and runs.
+
+    The Screenplay objects returned are shared between callers,
+    so they must not be modified.
+
+    The files are compressed in the format of screenplain.serialize.
+
+    """
+
+    def __init__(
+        self,
+        max_entries=64,
+        directory=None,
+        max_disk_size=256 * 1024 * 1024,
+    ):
+        """Creates a cache.
+
+        `max_entries` is the number of screenplays to keep in memory.
+        `directory` is the path of the directory to store files in,
+        or None to only cache in memory.
+        `max_disk_size` is the total size in bytes the files in
+        `directory` may take before the least recently used ones are
+        deleted.
+
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_size = max_disk_size
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, data, encoding='utf-8-sig', errors='strict'):
+        """Parses Fountain source, unless it's in the cache.
+
+        `data` is the bytes of the source, which are decoded using
+        `encoding` and `errors` as with `bytes.decode`.
+        Returns a Screenplay object.
+
+        """
+        key = get_key(data, encoding, errors)
+        with self._lock:
+            screenplay = self._memory.get(key)
+            if screenplay is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return screenplay
+
+        screenplay = self._load(key) if self.directory else None
+        if screenplay is not None:
+            hit = True
+        else:
+            hit = False
+            text = data.decode(encoding, errors)
+            screenplay = fountain.parse(StringIO(text))
+            if self.directory:
+                self._store(key, screenplay)
+
+        with self._lock:
+            if hit:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            self._memory[key] = screenplay
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return screenplay
+
+    def parse_file(self, path, encoding='utf-8-sig', errors='strict'):
+        """Parses a Fountain file, unless it's in the cache."""
+        with open(path, 'rb') as stream:
+            data = stream.read()
+        return self.parse(data, encoding, errors)
+
+    def clear(self):
+        """Removes all screenplays from the in-memory cache."""
+        with self._lock:
+            self._memory.clear()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_FILE_EXTENSION)
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as stream:
+                screenplay = serialize.loads(zlib.decompress(stream.read()))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupt or incompatible file is the same as a miss
+            return None
+        try:
+            # Mark as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return screenplay
+
+    def _store(self, key, screenplay):
+        data = zlib.compress(serialize.dumps(screenplay))
+        # Write to a temporary file and rename it, so other processes
+        # never see a partially written file.
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used files in the cache directory
+        until they fit in max_disk_size.
+
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(CACHE_FILE_EXTENSION):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Deleted by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_disk_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+
+def get_key(data, encoding, errors):
+    """Get the cache key for source data as a hexadecimal string."""
+    digest = hashlib.sha256()
+    digest.update(
+        f'{fountain.PARSER_VERSION}:{serialize.FORMAT_VERSION}:'
+        f'{encoding}:{errors}:'.encode('ascii')
+    )
+    digest.update(data)
+    return digest.hexdigest()
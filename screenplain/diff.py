@@ -0,0 +1,288 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compares two revisions of a screenplay paragraph by paragraph.
+
+>>> from screenplain.richstring import plain
+>>> from screenplain.types import Action, Screenplay, Slug
+>>> old = Screenplay(paragraphs=[
+...     Slug(plain('INT. HOUSE')), Action([plain('One.')]),
+...     Slug(plain('EXT. HOUSE')), Action([plain('Two.')]),
+... ])
+>>> new = Screenplay(paragraphs=[
+...     Slug(plain('INT. HOUSE')), Action([plain('One!')]),
+...     Slug(plain('EXT. HOUSE')), Action([plain('Two.')]),
+...     Action([plain('Three.')]),
+... ])
+>>> result = diff(old, new)
+>>> result.changed, result.inserted, result.deleted
+([(1, 1)], [4], [])
+>>> result.changed_scenes
+[(0, 0), (1, 1)]
+
+"""
+
+from itertools import zip_longest
+
+
+class ScreenplayDiff:
+    """The differences between two screenplays.
+
+    Paragraphs and scenes are referred to by their index in the old and
+    new screenplay. A scene is numbered as in ScreenplayIndex, and
+    consists of a scene heading and the paragraphs up to the next one.
+
+    `opcodes` is a list of (tag, i1, i2, j1, j2) tuples, where tag is
+    'equal', 'insert', 'delete' or 'replace', meaning that
+    old[i1:i2] is equal to, or should be replaced with, new[j1:j2],
+    like difflib.SequenceMatcher.get_opcodes.
+
+    Paragraphs are compared by their content_hash, see `content_hashes`.
+    A paragraph in a replaced range is changed if it has a paragraph of
+    the same type at the same position in the other screenplay's range,
+    otherwise it is inserted or deleted. Changed paragraphs are
+    (old index, new index) pairs. Scenes are compared the same way,
+    where two scenes are equal if all their paragraphs are.
+
+    """
+
+    def __init__(self, old, new):
+        old_paragraphs = list(old.paragraphs)
+        new_paragraphs = list(new.paragraphs)
+        old_keys, new_keys = _keys(
+            content_hashes(old_paragraphs), content_hashes(new_paragraphs)
+        )
+        self.opcodes = _get_opcodes(old_keys, new_keys)
+        self.inserted, self.deleted, self.changed = _classify(
+            self.opcodes,
+            lambda i, j: (
+                type(old_paragraphs[i]) is type(new_paragraphs[j])
+            ),
+        )
+
+        old_scenes = _scene_keys(old_keys, old.index.scene_starts)
+        new_scenes = _scene_keys(new_keys, new.index.scene_starts)
+        self.scene_opcodes = diff_sequences(old_scenes, new_scenes)
+        (
+            self.inserted_scenes, self.deleted_scenes, self.changed_scenes
+        ) = _classify(self.scene_opcodes, lambda i, j: True)
+
+    def __bool__(self):
+        """True if the screenplays differ."""
+        return any(tag != 'equal' for tag, *_ in self.opcodes)
+
+
+def diff(old, new):
+    """Compares two Screenplay objects.
+
+    Returns a ScreenplayDiff.
+
+    """
+    return ScreenplayDiff(old, new)
+
+
+def content_hashes(paragraphs):
+    """Get the content_hash of each paragraph, for instance of
+    a Screenplay.
+
+    The hashes are the same in every process, so they can be stored
+    to find out later which paragraphs of a revision have changed.
+
+    """
+    return [paragraph.content_hash() for paragraph in paragraphs]
+
+
+def diff_sequences(a, b):
+    """Get the opcodes for changing sequence `a` into sequence `b`.
+
+    The items must be hashable. Returns a list of (tag, i1, i2, j1, j2)
+    tuples, like difflib.SequenceMatcher.get_opcodes.
+
+    Uses Myers' O((N+M)D) algorithm in linear space, where D is the
+    number of inserted and deleted items, so similar sequences
+    are compared in close to linear time.
+
+    >>> diff_sequences('abcd', 'acde')
+    [('equal', 0, 1, 0, 1), ('delete', 1, 2, 1, 1), \
+('equal', 2, 4, 1, 3), ('insert', 4, 4, 3, 4)]
+
+    """
+    # Compare integers instead of items
+    return _get_opcodes(*_keys(a, b))
+
+
+def _get_opcodes(a, b):
+    """Implements diff_sequences for lists of integers."""
+    # Matching (i, j) ranges of equal items
+    matches = []
+    _find_matches(a, 0, len(a), b, 0, len(b), matches)
+    matches.append((len(a), len(a), len(b), len(b)))
+
+    opcodes = []
+    i = j = 0
+    for i1, i2, j1, j2 in matches:
+        if i < i1 and j < j1:
+            opcodes.append(('replace', i, i1, j, j1))
+        elif i < i1:
+            opcodes.append(('delete', i, i1, j, j1))
+        elif j < j1:
+            opcodes.append(('insert', i, i1, j, j1))
+        if i1 < i2:
+            if opcodes and opcodes[-1][0] == 'equal':
+                # Join adjacent matches
+                _, i1, _, j1, _ = opcodes.pop()
+            opcodes.append(('equal', i1, i2, j1, j2))
+        i, j = i2, j2
+    return opcodes
+
+
+def _keys(a, b):
+    """Replace the items of two sequences with integers
+    that are equal for equal items."""
+    ids = {}
+    return (
+        [ids.setdefault(item, len(ids)) for item in a],
+        [ids.setdefault(item, len(ids)) for item in b],
+    )
+
+
+def _scene_keys(keys, scene_starts):
+    """Get a key for each scene from the keys of the paragraphs."""
+    ends = list(scene_starts[1:]) + [len(keys)]
+    return [
+        tuple(keys[start:end]) for start, end in zip(scene_starts, ends)
+    ]
+
+
+def _classify(opcodes, same_kind):
+    """Get the inserted, deleted and changed items from opcodes."""
+    inserted = []
+    deleted = []
+    changed = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'insert':
+            inserted.extend(range(j1, j2))
+        elif tag == 'delete':
+            deleted.extend(range(i1, i2))
+        elif tag == 'replace':
+            for i, j in zip_longest(range(i1, i2), range(j1, j2)):
+                if i is None:
+                    inserted.append(j)
+                elif j is None:
+                    deleted.append(i)
+                elif same_kind(i, j):
+                    changed.append((i, j))
+                else:
+                    deleted.append(i)
+                    inserted.append(j)
+    inserted.sort()
+    return inserted, deleted, changed
+
+
+def _find_matches(a, a_start, a_end, b, b_start, b_end, matches):
+    """Append the ranges (i1, i2, j1, j2) where a[i1:i2] equals b[j1:j2]
+    in a shortest edit script of a[a_start:a_end] to b[b_start:b_end]
+    to `matches`, in order.
+
+    """
+    # Common prefix
+    start = a_start
+    while start < a_end and b_start < b_end and a[start] == b[b_start]:
+        start += 1
+        b_start += 1
+    if start > a_start:
+        matches.append((a_start, start, b_start - (start - a_start), b_start))
+    a_start = start
+
+    # Common suffix
+    end = a_end
+    while end > a_start and b_end > b_start and a[end - 1] == b[b_end - 1]:
+        end -= 1
+        b_end -= 1
+    if end < a_end:
+        suffix = (end, a_end, b_end, b_end + (a_end - end))
+    else:
+        suffix = None
+    a_end = end
+
+    if a_start < a_end and b_start < b_end:
+        x, y, u, v = _middle_snake(a, a_start, a_end, b, b_start, b_end)
+        _find_matches(a, a_start, x, b, b_start, y, matches)
+        if x < u:
+            matches.append((x, u, y, v))
+        _find_matches(a, u, a_end, b, v, b_end, matches)
+
+    if suffix:
+        matches.append(suffix)
+
+
+def _middle_snake(a, a_start, a_end, b, b_start, b_end):
+    """Find the middle snake of a shortest edit script,
+    as described by Myers.
+
+    Returns (x, y, u, v), where a[x:u] equals b[y:v] and is where the
+    forward and backward searches meet.
+    The first and last items of the ranges must differ.
+
+    """
+    n = a_end - a_start
+    m = b_end - b_start
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    # Furthest x reached on each diagonal k = x - y,
+    # forward from the start and backward from the end
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (
+                k != d and forward[offset + k - 1] < forward[offset + k + 1]
+            ):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            snake_x, snake_y = x, y
+            while (
+                x < n and y < m and a[a_start + x] == b[b_start + y]
+            ):
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            # The same diagonal counted from the end
+            c = delta - k
+            if odd and -(d - 1) <= c <= d - 1:
+                if x + backward[offset + c] >= n:
+                    return (
+                        a_start + snake_x, b_start + snake_y,
+                        a_start + x, b_start + y,
+                    )
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (
+                k != d and
+                backward[offset + k - 1] < backward[offset + k + 1]
+            ):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            snake_x, snake_y = x, y
+            while (
+                x < n and y < m and
+                a[a_end - 1 - x] == b[b_end - 1 - y]
+            ):
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            c = delta - k
+            if not odd and -d <= c <= d:
+                if x + forward[offset + c] >= n:
+                    return (
+                        a_end - x, b_end - y,
+                        a_end - snake_x, b_end - snake_y,
+                    )
+    raise AssertionError('No middle snake found')
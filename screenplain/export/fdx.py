@@ -30,6 +30,13 @@ def _write_text_element(out, styles, text):
 
 def write_text(out, rich, trailing_linebreak):
     """Writes <Text Style="..."> elements."""
+    if len(rich.segments) == 1 and not rich.segments[0].style_mask:
+        # Fast path for the common case of a line without styles
+        text = rich.segments[0].text
+        if trailing_linebreak:
+            text += '\n'
+        out.write(f'      <Text>{escape(text)}</Text>\n')
+        return
     for seg_no, segment in enumerate(rich.segments):
         fdx_styles = [style_names[n] for n in segment.get_ordered_styles()]
         if trailing_linebreak and seg_no == len(rich.segments) - 1:
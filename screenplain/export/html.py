@@ -2,8 +2,14 @@
 # Licensed under the MIT license:
 # http://www.opensource.org/licenses/mit-license.php
 
+import json
 import os
 import os.path
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html import escape as html_escape
 
 from screenplain.richstring import plain
 from screenplain.types import (
@@ -59,6 +65,111 @@ class tag:
         return False
 
 
+# Number of characters to collect before writing to the output
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Number of paragraphs for a worker process to convert at a time
+PARAGRAPHS_PER_JOB = 2000
+
+
+class ChunkWriter:
+    """Collects strings and writes them to a file-like object in large
+    chunks, so the output gets few but large write calls.
+
+    `write` only collects the string. `check` writes what has been
+    collected if it is at least `chunk_size` characters, and `flush`
+    writes it in any case.
+
+    >>> import sys
+    >>> writer = ChunkWriter(sys.stdout, chunk_size=5)
+    >>> writer.write('<p>')
+    >>> writer.check()
+    >>> writer.write('Hello</p>\\n')
+    >>> writer.check()
+    <p>Hello</p>
+    """
+
+    def __init__(self, out, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.out = out
+        self.chunk_size = chunk_size
+        self._parts = []
+        # Number of parts whose lengths are included in _size
+        self._counted = 0
+        self._size = 0
+        self.write = self._parts.append
+
+    def check(self):
+        """Writes the collected strings if they are
+        at least chunk_size characters."""
+        parts = self._parts
+        self._size += sum(map(len, parts[self._counted:]))
+        self._counted = len(parts)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the collected strings."""
+        if self._parts:
+            self.out.write(''.join(self._parts))
+            self._parts.clear()
+        self._counted = 0
+        self._size = 0
+
+
+class FragmentCache:
+    """Cache of the HTML of paragraphs, for Formatter.
+
+    When the same screenplay is converted again with small changes,
+    only the changed paragraphs have to be converted.
+
+    The key of a paragraph is its type and contents, and whether it
+    comes after a page break. Paragraphs in the cache must therefore
+    not be modified.
+
+    The least recently used paragraphs are removed when there are more
+    than `max_entries`. `hits` and `misses` count the lookups.
+
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the value for a key, or None if it's not in the cache."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """The fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 def to_html(text):
     html = text.to_html()
     if html == '':
@@ -70,15 +181,23 @@ def to_html(text):
 class Formatter:
     """Class for converting paragraphs into HTML."""
 
-    def __init__(self, out):
+    def __init__(
+        self, out, chunk_size=DEFAULT_CHUNK_SIZE, fragment_cache=None
+    ):
         """Initializes the formatter.
 
         `out` is a file-like object to write to.
+        The output is written to it in chunks of about `chunk_size`
+        characters.
+        `fragment_cache` is an optional FragmentCache with the HTML
+        of paragraphs converted earlier.
         After initializing, call the convert function to convert
         any number of paragraphs.
 
         """
-        self.out = out
+        self.out = ChunkWriter(out, chunk_size)
+        self.fragment_cache = fragment_cache
+        self.page_break_before_next = False
         self._format_functions = {
             Slug: self.format_slug,
             Action: self.format_action,
@@ -97,10 +216,40 @@ class Formatter:
         """
         self.page_break_before_next = False
         for para in screenplay:
-            format_function = self._format_functions.get(type(para), None)
-            if format_function:
+            self.convert_paragraph(para)
+        self.out.flush()
+
+    def convert_paragraph(self, para):
+        """Converts a single paragraph.
+        The output may be kept in a buffer until `out.flush()` is called.
+
+        """
+        format_function = self._format_functions.get(type(para), None)
+        if not format_function:
+            return
+        if self.fragment_cache is None:
+            format_function(para)
+            self.out.write('\n')
+        else:
+            self._convert_cached(para, format_function)
+        self.out.check()
+
+    def _convert_cached(self, para, format_function):
+        key = (type(para), para, self.page_break_before_next)
+        fragment = self.fragment_cache.get(key)
+        if fragment is None:
+            out = self.out
+            parts = []
+            self.out = _PartsWriter(parts)
+            try:
                 format_function(para)
-                self.out.write('\n')
+            finally:
+                self.out = out
+            parts.append('\n')
+            fragment = (''.join(parts), self.page_break_before_next)
+            self.fragment_cache.put(key, fragment)
+        html, self.page_break_before_next = fragment
+        self.out.write(html)
 
     def format_dialog(self, dialog):
         with self._tag('div', classes=['dialog']):
@@ -169,55 +318,351 @@ class Formatter:
         return tag(self.out, tag_name, classes)
 
 
-def convert(screenplay, out, css_file=None, bare=False):
+def convert(
+    screenplay, out, css_file=None, bare=False,
+    chunk_size=DEFAULT_CHUNK_SIZE, fragment_cache=None, css_url=None,
+    workers=1,
+):
     """Convert the screenplay into HTML, written to the file-like object `out`.
 
     The output will be a complete HTML document unless `bare` is true.
+    The document contains the CSS in `css_file`, or the default CSS,
+    unless `css_url` is given, in which case it links to the stylesheet
+    at that URL instead.
+    It is written in chunks of about `chunk_size` characters.
+    `fragment_cache` is an optional FragmentCache.
+    If `workers` is more than 1, the paragraphs are converted
+    by that many processes, see `convert_parallel`.
+    None means one process per CPU. The processes can not use
+    a FragmentCache, so ValueError is raised if `fragment_cache` is
+    given with other `workers` than 1.
 
     """
     if bare:
-        convert_bare(screenplay, out)
+        convert_bare(screenplay, out, chunk_size, fragment_cache, workers)
     else:
         convert_full(
             screenplay, out,
-            css_file or os.path.join(os.path.dirname(__file__), 'default.css')
+            css_file or _default_css_file,
+            chunk_size, fragment_cache, css_url, workers,
         )
 
 
-def convert_full(screenplay, out, css_file):
+def convert_full(
+    screenplay, out, css_file,
+    chunk_size=DEFAULT_CHUNK_SIZE, fragment_cache=None, css_url=None,
+    workers=1,
+):
     """Convert the screenplay into a complete HTML document,
     written to the file-like object `out`.
 
     """
+    _check_workers(fragment_cache, workers)
+    out.write(_document_header(css_file, css_url))
+    convert_bare(screenplay, out, chunk_size, fragment_cache, workers)
+    out.write(_document_footer)
+
+
+def convert_bare(
+    screenplay, out, chunk_size=DEFAULT_CHUNK_SIZE, fragment_cache=None,
+    workers=1,
+):
+    """Convert the screenplay into HTML, written to the file-like object `out`.
+    Does not create a complete HTML document, as it doesn't include
+    <html>, <body>, etc.
+
+    """
+    _check_workers(fragment_cache, workers)
+    if workers != 1:
+        convert_parallel(screenplay, out, workers, chunk_size=chunk_size)
+        return
+    formatter = Formatter(out, chunk_size, fragment_cache)
+    formatter.convert(screenplay)
+
+
+def _check_workers(fragment_cache, workers):
+    if fragment_cache is not None and workers != 1:
+        raise ValueError(
+            'A fragment cache can only be used with a single worker'
+        )
+
+
+def convert_parallel(
+    screenplay, out, workers=None, paragraphs_per_job=PARAGRAPHS_PER_JOB,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """Convert the screenplay into HTML like `convert_bare`,
+    using `workers` processes, or one per CPU if it is None.
+
+    The paragraphs are split into jobs of `paragraphs_per_job`
+    consecutive paragraphs, which are converted by the processes,
+    and the results are written to `out` in order, in chunks of about
+    `chunk_size` characters.
+
+    The processes get all the paragraphs when they start. Where they
+    are started by forking, as on Linux, this is fast, otherwise the
+    paragraphs are pickled for each process, which is only worth it
+    for very long screenplays.
+
+    """
+    paragraphs = list(screenplay)
+    writer = ChunkWriter(out, chunk_size)
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_set_job_paragraphs, initargs=(paragraphs,),
+    ) as executor:
+        for html in executor.map(
+            _convert_job, _split_jobs(paragraphs, paragraphs_per_job)
+        ):
+            writer.write(html)
+            writer.check()
+    writer.flush()
+
+
+def _split_jobs(paragraphs, size):
+    """Split a list of paragraphs into jobs for `_convert_job`."""
+    # Whether the next paragraph starts on a new page.
+    # Every converted paragraph except a PageBreak consumes the break.
+    page_break = False
+    for start in range(0, len(paragraphs), size):
+        end = min(start + size, len(paragraphs))
+        yield page_break, start, end
+        for para in paragraphs[start:end]:
+            if type(para) is PageBreak:
+                page_break = True
+            elif type(para) in _paragraph_types:
+                page_break = False
+
+
+# The paragraphs converted by _convert_job in a worker process
+_job_paragraphs = None
+
+
+def _set_job_paragraphs(paragraphs):
+    global _job_paragraphs
+    _job_paragraphs = paragraphs
+
+
+def _convert_job(job):
+    """Convert the paragraphs from index start to end to a string."""
+    page_break, start, end = job
+    parts = []
+    formatter = Formatter(_PartsWriter(parts))
+    formatter.page_break_before_next = page_break
+    for para in _job_paragraphs[start:end]:
+        formatter.convert_paragraph(para)
+    formatter.out.flush()
+    return ''.join(parts)
+
+
+def iter_html(
+    screenplay, css_file=None, bare=False,
+    chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8', fragment_cache=None,
+    css_url=None,
+):
+    """Convert the screenplay into HTML, generating it in chunks of
+    bytes in `encoding`, e.g. for a streamed web response.
+
+    `screenplay` may be any iterable of paragraphs, like a Screenplay
+    or the generator from fountain.iter_paragraphs, in which case the
+    first chunks are generated before the rest of the input is parsed.
+
+    A chunk is generated before each scene heading, and whenever about
+    `chunk_size` characters have been converted.
+    The other arguments are as for `convert`.
+
+    """
+    parts = []
+    formatter = Formatter(_PartsWriter(parts), chunk_size, fragment_cache)
+
+    def take():
+        data = ''.join(parts).encode(encoding)
+        parts.clear()
+        return data
+
+    if not bare:
+        header = _document_header(css_file or _default_css_file, css_url)
+        yield header.encode(encoding)
+    for para in screenplay:
+        if isinstance(para, Slug):
+            formatter.out.flush()
+            if parts:
+                yield take()
+        formatter.convert_paragraph(para)
+        if parts:
+            yield take()
+    formatter.out.flush()
+    if parts:
+        yield take()
+    if not bare:
+        yield _document_footer.encode(encoding)
+
+
+# Names of the files written by convert_scenes
+MANIFEST_FILE = 'manifest.json'
+STYLESHEET_FILE = 'screenplay.css'
+
+
+def convert_scenes(screenplay, directory, css_file=None, encoding='utf-8'):
+    """Convert the screenplay into one HTML fragment file per scene,
+    so a viewer can load the scenes when they are needed.
+
+    The files are written to `directory`, which is created if needed.
+    Each fragment contains the HTML of a scene heading and the
+    paragraphs up to the next one, as from `convert_bare`. Paragraphs
+    before the first scene heading are in a fragment of their own.
+    Section headings are not in the fragments, but describe how the
+    scenes are grouped.
+
+    A JSON manifest is written to MANIFEST_FILE, and the CSS, by default
+    the default CSS, to STYLESHEET_FILE. The manifest has:
+
+    - "stylesheet": the CSS file name
+    - "scenes": for each scene, "slug", "scene_number" and "synopsis",
+      which may be null, "path" of the fragment relative to the
+      directory, its "size" in bytes, and "section", the number of the
+      innermost section it is in, or null
+    - "sections": for each section, "title", "level", "synopsis",
+      "parent", the number of the section it is in, or null,
+      and the numbers of the "scenes" directly in it
+
+    Returns the manifest as a dict.
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    shutil.copyfile(
+        css_file or _default_css_file,
+        os.path.join(directory, STYLESHEET_FILE)
+    )
+
+    scenes = []
+    sections = []
+    # Numbers of the sections that contain the current paragraph
+    open_sections = []
+    parts = []
+    formatter = Formatter(_PartsWriter(parts))
+    scene = None
+
+    def finish_scene():
+        formatter.out.flush()
+        if scene is None and not parts:
+            return
+        data = ''.join(parts).encode(encoding)
+        parts.clear()
+        path = f'scene-{len(scenes):04d}.html'
+        with open(os.path.join(directory, path), 'wb') as stream:
+            stream.write(data)
+        scene_section = open_sections[-1] if open_sections else None
+        scenes.append({
+            'slug': str(scene.line) if scene else None,
+            'scene_number': (
+                str(scene.scene_number)
+                if scene and scene.scene_number else None
+            ),
+            'synopsis': scene.synopsis if scene else None,
+            'path': path,
+            'size': len(data),
+            'section': scene_section,
+        })
+        if scene_section is not None:
+            sections[scene_section]['scenes'].append(len(scenes) - 1)
+
+    for para in screenplay:
+        if isinstance(para, Slug):
+            finish_scene()
+            scene = para
+        elif isinstance(para, Section):
+            finish_scene()
+            scene = None
+            while (
+                open_sections and
+                sections[open_sections[-1]]['level'] >= para.level
+            ):
+                open_sections.pop()
+            sections.append({
+                'title': str(para.text),
+                'level': para.level,
+                'synopsis': para.synopsis,
+                'parent': open_sections[-1] if open_sections else None,
+                'scenes': [],
+            })
+            open_sections.append(len(sections) - 1)
+            continue
+        formatter.convert_paragraph(para)
+    finish_scene()
+
+    manifest = {
+        'stylesheet': STYLESHEET_FILE,
+        'scenes': scenes,
+        'sections': sections,
+    }
+    with open(
+        os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8'
+    ) as stream:
+        json.dump(manifest, stream, indent=1)
+    return manifest
+
+
+# The paragraph types that Formatter converts
+_paragraph_types = frozenset((
+    Slug, Action, Dialog, DualDialog, Transition, Section, PageBreak,
+))
+
+
+class _PartsWriter:
+    """File-like object that appends what is written to a list."""
+
+    def __init__(self, parts):
+        self.write = parts.append
+
+
+_default_css_file = os.path.join(os.path.dirname(__file__), 'default.css')
+
+_document_footer = (
+    '</div>'
+    '</body>'
+    '</html>\n'
+)
+
+
+# CSS file path -> (modification time, size, document header)
+_headers = {}
+
+
+def _document_header(css_file, css_url=None):
+    """Get the start of an HTML document, up to the screenplay.
+
+    The header with the CSS of a file is kept and used again as long as
+    the modification time and size of the file are the same.
+
+    """
+    if css_url is not None:
+        return _build_document_header(
+            f'<link rel="stylesheet" type="text/css" '
+            f'href="{html_escape(css_url)}">'
+        )
+    stat = os.stat(css_file)
+    key = os.path.abspath(css_file)
+    cached = _headers.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
     with open(css_file, encoding='utf-8') as stream:
         css = stream.read()
-    out.write(
+    header = _build_document_header(
+        '<style type="text/css">' + css + '</style>'
+    )
+    _headers[key] = (stat.st_mtime_ns, stat.st_size, header)
+    return header
+
+
+def _build_document_header(style):
+    return (
         '<!DOCTYPE html>\n'
         '<html>'
         '<head>'
-        '<title>Screenplay</title>'
-        '<style type="text/css">'
-    )
-    out.write(css)
-    out.write(
-        '</style>'
+        '<title>Screenplay</title>' +
+        style +
         '</head>'
         '<body>'
         '<div id="wrapper" class="screenplay">\n'
     )
-    convert_bare(screenplay, out)
-    out.write(
-        '</div>'
-        '</body>'
-        '</html>\n'
-    )
-
-
-def convert_bare(screenplay, out):
-    """Convert the screenplay into HTML, written to the file-like object `out`.
-    Does not create a complete HTML document, as it doesn't include
-    <html>, <body>, etc.
-
-    """
-    formatter = Formatter(out)
-    formatter.convert(screenplay)
@@ -0,0 +1,924 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Writes screenplays to PDF without ReportLab.
+
+The pages are laid out by the pagination module, which follows the same
+rules as the ReportLab export in screenplain.export.pdf, and the text is
+drawn at the same positions. Each page is written to the output as soon
+as it is laid out. The fonts, which are only known when all pages have
+been written, are written last.
+
+The font is Courier Prime, which is embedded in the PDF, or the
+Courier font that is built into PDF readers.
+
+"""
+
+import os
+import struct
+import zlib
+from functools import lru_cache
+
+from screenplain.export.pagination import (
+    CENTER,
+    RIGHT,
+    TITLE_PAGE_KEYS,
+    Block,
+    DualBlock,
+    Layout,
+    Paginator,
+    paragraph_height,
+    wrap_line,
+)
+from screenplain.types import Slug
+
+_courier_prime_dir = os.path.join(os.path.dirname(__file__), 'courier_prime')
+
+# The files of the regular, bold, italic and bold italic Courier Prime
+COURIER_PRIME_FILES = tuple(
+    os.path.join(_courier_prime_dir, f'Courier Prime{suffix}.ttf')
+    for suffix in ('', ' Bold', ' Italic', ' Bold Italic')
+)
+
+# The fonts of the regular, bold, italic and bold italic Courier
+# that are built into PDF readers
+STANDARD_FONTS = (
+    'Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique',
+)
+
+# Bits of Segment.style_mask for bold and italic
+_BOLD_ITALIC = 3
+
+
+def to_pdf(
+    screenplay, output, layout=None, font_settings=None,
+    standard_font=False,
+):
+    """Write a screenplay as PDF to `output`, which is a binary file
+    object or a file name.
+
+    `layout` is a pagination.Layout, by default that of the default
+    pdf.Settings.
+    The font is Courier Prime, or the built-in Courier if
+    `standard_font` is true. `font_settings` may be a pdf.FontSettings,
+    or an object with the same attributes, to use other font files.
+    A FontSettings without font files, like the one from
+    pdf.get_standard_font_settings, means the built-in Courier.
+
+    """
+    layout = layout or Layout()
+    if standard_font:
+        fonts = _standard_fonts()
+    elif font_settings is None:
+        fonts = _true_type_fonts(COURIER_PRIME_FILES)
+    elif font_settings.file_normal:
+        normal = font_settings.file_normal
+        fonts = _true_type_fonts((
+            normal,
+            font_settings.file_bold or normal,
+            font_settings.file_italic or normal,
+            font_settings.file_bold_italic or normal,
+        ))
+    elif font_settings.family_name == 'Courier':
+        fonts = _standard_fonts()
+    else:
+        raise ValueError(
+            f'No font files set for font {font_settings.family_name}'
+        )
+
+    if isinstance(output, str):
+        with open(output, 'wb') as stream:
+            _write(screenplay, stream, layout, fonts)
+    else:
+        _write(screenplay, output, layout, fonts)
+
+
+def _write(screenplay, stream, layout, fonts):
+    pdf = _PdfFile(stream)
+    has_title_page = any(
+        screenplay.title_page.get(key) for key in TITLE_PAGE_KEYS
+    )
+    writer = _PageWriter(pdf, layout, fonts, list(screenplay))
+    if has_title_page:
+        writer.title_page(screenplay)
+    else:
+        writer.layout = layout.without_title_page()
+    writer.run(writer.paragraphs, writer.layout)
+    writer.end_page()
+    if not pdf.pages:
+        # Like ReportLab, an empty screenplay gets an empty page
+        writer.begin_page()
+        writer.end_page()
+    pdf.finish(fonts)
+
+
+class _PageWriter(Paginator):
+    """Lays out the screenplay like Paginator, and draws each page."""
+
+    def __init__(self, pdf, layout, fonts, paragraphs):
+        super().__init__(
+            layout.lines_per_page, [0] * len(paragraphs)
+        )
+        self.pdf = pdf
+        self.layout = layout
+        self.fonts = fonts
+        self.paragraphs = paragraphs
+        self.has_title_page = False
+        self.content = None
+        self.frame_top = layout.page_height - layout.top_margin
+        # The width of a character of the font, which the alignment
+        # of the text depends on, like in ReportLab
+        self.advance = fonts.glyph_width * layout.font_size
+
+    def text_block(self, index, lines, style, splittable=True):
+        """Create a block like Paginator.text_block,
+        with the wrapped lines of text."""
+        rows = tuple(wrap_line(line, style.width) for line in lines)
+        counts = tuple(len(line_rows) for line_rows in rows)
+        return Block(
+            index, paragraph_height(counts), style,
+            counts if splittable else None, rows,
+        )
+
+    def begin_page(self):
+        self.end_page()
+        super().begin_page()
+        self.content = []
+        number = self.page - 1 if self.has_title_page else self.page
+        if number >= 2:
+            # The page number, like DocTemplate.handle_pageBegin
+            layout = self.layout
+            text = f'{number}.'
+            self.text(
+                layout.left_margin + layout.characters_per_line *
+                layout.character_width - len(text) * self.advance,
+                layout.page_height - 42,
+                [(text, 0)], layout.font_size,
+            )
+
+    def end_page(self):
+        """Write the current page, if there is one."""
+        if self.content is not None:
+            self.pdf.add_page(self.layout, b'\n'.join(self.content))
+            self.content = None
+
+    def placed(self, item, line):
+        super().placed(item, line)
+        layout = self.layout
+        x = layout.left_margin
+        if type(item) is DualBlock:
+            column_width = (
+                layout.characters_per_line * layout.character_width / 2
+            )
+            # The table of the dual dialog is centered in the frame
+            x += (
+                layout.frame_characters - layout.characters_per_line
+            ) * layout.character_width / 2
+            for number, blocks in enumerate(item.columns):
+                top = line
+                for block_number, block in enumerate(blocks):
+                    if block_number:
+                        top += block.space_before
+                    self.block(block, x + number * column_width, top)
+                    top += block.lines + block.space_after
+            # Drawn by ReportLab for the LINEBEFORE of the table style
+            x += column_width
+            self.content.append(
+                b'q 1 J 1 j 1 1 1 RG %s %s m %s %s l S Q' % (
+                    _number(x), _number(self.y(line + item.lines)),
+                    _number(x), _number(self.y(line)),
+                )
+            )
+        else:
+            self.block(item, x, line)
+            paragraph = self.paragraphs[item.index]
+            if isinstance(paragraph, Slug) and paragraph.scene_number:
+                self.scene_number(
+                    str(paragraph.scene_number), self.y(line + item.lines)
+                )
+
+    def y(self, line):
+        """Get the y coordinate of a line of the frame."""
+        return self.frame_top - line * self.layout.line_height
+
+    def block(self, block, x, line):
+        """Draw a block with its top `line` lines from the top
+        of the frame, and its left edge at `x`."""
+        if block.rows is None:
+            return
+        layout = self.layout
+        style = block.style
+        character_width = layout.character_width
+        advance = self.advance
+        font_size = layout.font_size
+        baseline = self.y(line) - font_size
+        line_height = layout.line_height
+        for line_rows in block.rows:
+            if not line_rows:
+                baseline -= line_height
+                continue
+            for length, runs, underlines in line_rows:
+                left = x + style.indent * character_width
+                if style.alignment is CENTER:
+                    left += (
+                        style.width * character_width - length * advance
+                    ) / 2
+                elif style.alignment is RIGHT:
+                    left += style.width * character_width - length * advance
+                self.text(left, baseline, runs, font_size)
+                for start, end in underlines:
+                    self.underline(
+                        left + start * advance,
+                        left + end * advance,
+                        baseline, font_size,
+                    )
+                baseline -= line_height
+
+    def text(self, x, y, runs, font_size):
+        """Draw runs of (text, style mask) starting at (x, y)."""
+        size = _number(font_size)
+        ops = [b'BT']
+        current = None
+        for text, mask in runs:
+            for font, operand in self.fonts[mask & _BOLD_ITALIC].encode(text):
+                if font is not current:
+                    current = font
+                    ops.append(b'/%s %s Tf' % (font.resource_name, size))
+                    if len(ops) == 2:
+                        ops.append(b'%s %s Td' % (_number(x), _number(y)))
+                ops.append(operand + b' Tj')
+        ops.append(b'ET')
+        self.content.append(b' '.join(ops))
+
+    def underline(self, x1, x2, y, font_size):
+        """Draw an underline like ReportLab's Paragraph."""
+        y -= font_size / 8
+        self.content.append(b'%s %s m %s %s l S' % (
+            _number(x1), _number(y), _number(x2), _number(y)
+        ))
+
+    def scene_number(self, text, y):
+        """Draw a scene number in both margins, like
+        SlugWithSceneNumbers."""
+        layout = self.layout
+        runs = [(text, 0)]
+        self.text(layout.left_margin - 54, y, runs, layout.font_size)
+        self.text(
+            layout.left_margin + layout.characters_per_line *
+            layout.character_width - len(text) * self.advance,
+            y, runs, layout.font_size,
+        )
+
+    def title_page(self, screenplay):
+        """Draw the title page like pdf.get_title_page_story."""
+        self.has_title_page = True
+        layout = self.layout
+        font_size = layout.font_size
+        line_height = layout.line_height
+        frame_height = layout.lines_per_page * line_height
+        full_width = layout.characters_per_line * layout.character_width
+        title_width = layout.title_frame_characters * layout.character_width
+        # Font size, leading and whether it is centered
+        title = (font_size * 2, font_size * 3, True)
+        centered = (font_size, line_height, True)
+        left = (font_size, line_height, False)
+
+        def add_lines(items, attribute, style, space_before=0):
+            lines = screenplay.get_rich_attribute(attribute)
+            if not lines:
+                return 0
+            if space_before:
+                items.append((space_before, None, None))
+            size, leading, _ = style
+            # The height is found by wrapping the lines in the width
+            # of the frame of the other pages
+            height = 0
+            characters = int(
+                full_width / (size * self.fonts.glyph_width) + 1e-6
+            )
+            for line in lines:
+                items.append((None, line, style))
+                rows = wrap_line(line, characters)
+                height += paragraph_height((len(rows),)) * leading
+            return space_before + height
+
+        title_items = []
+        title_height = sum((
+            add_lines(title_items, 'Title', title),
+            add_lines(title_items, 'Credit', centered, line_height),
+            add_lines(title_items, 'Author', centered),
+            add_lines(title_items, 'Authors', centered),
+            add_lines(title_items, 'Source', centered),
+        ))
+        lower_items = []
+        lower_height = sum((
+            add_lines(lower_items, 'Draft date', left),
+            add_lines(lower_items, 'Contact', left, line_height),
+            add_lines(lower_items, 'Copyright', centered, line_height),
+        ))
+
+        items = []
+        top_space = min(
+            frame_height / 3.0, frame_height - lower_height - title_height
+        )
+        if top_space > 0:
+            items.append((top_space, None, None))
+        items += title_items
+        middle_space = frame_height - (
+            top_space + title_height + lower_height + font_size / 2
+        )
+        if middle_space > 0:
+            items.append((middle_space, None, None))
+        items += lower_items
+
+        super().begin_page()
+        self.content = []
+        used = 0
+        for space, line, style in items:
+            if line is None:
+                height = space
+            else:
+                size, leading, is_centered = style
+                character_width = size * self.fonts.glyph_width
+                rows = wrap_line(
+                    line, int(title_width / character_width + 1e-6)
+                )
+                height = paragraph_height((len(rows),)) * leading
+            if used and used + height > frame_height:
+                # Does not fit, so continue on the next title page
+                self.end_page()
+                self.content = []
+                self.page += 1
+                used = 0
+            if line is not None:
+                baseline = self.frame_top - used - size
+                for length, runs, underlines in rows:
+                    x = layout.left_margin
+                    if is_centered:
+                        x += (title_width - length * character_width) / 2
+                    self.text(x, baseline, runs, size)
+                    for start, end in underlines:
+                        self.underline(
+                            x + start * character_width,
+                            x + end * character_width,
+                            baseline, size,
+                        )
+                    baseline -= leading
+            used += height
+        self.end_page()
+        self.page_open = False
+
+
+def _standard_fonts():
+    fallback = _StandardFont('ZapfDingbats', b'F5')
+    return _Fonts([
+        _StandardFont(name, b'F%d' % (number + 1), fallback)
+        for number, name in enumerate(STANDARD_FONTS)
+    ] + [fallback])
+
+
+def _true_type_fonts(paths):
+    return _Fonts([
+        _TrueTypeFont(_load_font_file(path), b'F%d' % (number + 1))
+        for number, path in enumerate(paths)
+    ])
+
+
+class _Fonts:
+    """The regular, bold, italic and bold italic variants of a font,
+    indexed by the bold and italic bits of a style mask,
+    followed by any fallback fonts."""
+
+    def __init__(self, fonts):
+        self.fonts = fonts
+        # The width of the characters, in ems
+        self.glyph_width = fonts[0].glyph_width
+
+    def __getitem__(self, index):
+        return self.fonts[index]
+
+    def write(self, pdf):
+        """Write the fonts that have been drawn with to the PDF.
+
+        Returns the entries of the font resource dictionary.
+        Fonts that use the same font file share one PDF font.
+
+        """
+        used = [font for font in self.fonts if font.used]
+        written = []
+        for font in used:
+            for other in written:
+                if font.same_as(other):
+                    font.number = other.number
+                    break
+            else:
+                font.write(pdf, [
+                    other for other in used if other.same_as(font)
+                ])
+                written.append(font)
+        return b' '.join(
+            b'/%s %d 0 R' % (font.resource_name, font.number)
+            for font in used
+        )
+
+
+def _literal(data):
+    """Format bytes as a PDF literal string."""
+    return b'(%s)' % data.replace(b'\\', b'\\\\').replace(
+        b'(', b'\\('
+    ).replace(b')', b'\\)').replace(b'\r', b'\\r')
+
+
+class _StandardFont:
+    """A font that is built into PDF readers.
+
+    Characters that are not in WinAnsiEncoding are drawn with the
+    fallback font, like ReportLab does.
+
+    """
+
+    def __init__(self, base_font, resource_name, fallback=None):
+        self.base_font = base_font
+        self.resource_name = resource_name
+        self.fallback = fallback
+        self.used = False
+        self.number = None
+        self.glyph_width = 0.6
+
+    def same_as(self, other):
+        return self is other
+
+    def encode(self, text):
+        """Get the (font, string operand) pieces to draw text with."""
+        self.used = True
+        try:
+            return [(self, _literal(text.encode('cp1252')))]
+        except UnicodeEncodeError:
+            pass
+        self.fallback.used = True
+        pieces = []
+        for char in text:
+            try:
+                font, data = self, char.encode('cp1252')
+            except UnicodeEncodeError:
+                font, data = self.fallback, b'n'
+            if pieces and pieces[-1][0] is font:
+                pieces[-1][1] += data
+            else:
+                pieces.append([font, data])
+        return [(font, _literal(data)) for font, data in pieces]
+
+    def write(self, pdf, fonts):
+        self.number = pdf.reserve()
+        pdf.write_object(
+            self.number,
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /%s%s >>' % (
+                self.base_font.encode('ascii'),
+                b' /Encoding /WinAnsiEncoding' if self.fallback else b'',
+            )
+        )
+
+
+class _TrueTypeFont:
+    """An embedded TrueType font, of which only the glyphs that are
+    drawn are written to the PDF."""
+
+    def __init__(self, font_file, resource_name):
+        self.font_file = font_file
+        self.resource_name = resource_name
+        self.used = False
+        self.number = None
+        self.glyph_width = font_file.advance(
+            font_file.cmap.get(ord(' '), 0)
+        ) / font_file.units_per_em
+        # Character -> hex glyph id
+        self.glyphs = {}
+
+    def same_as(self, other):
+        return self.font_file is other.font_file
+
+    def encode(self, text):
+        """Get the (font, string operand) pieces to draw text with."""
+        self.used = True
+        glyphs = self.glyphs
+        try:
+            hex_ids = ''.join([glyphs[char] for char in text])
+        except KeyError:
+            cmap = self.font_file.cmap
+            for char in text:
+                if char not in glyphs:
+                    glyphs[char] = '%04X' % cmap.get(ord(char), 0)
+            hex_ids = ''.join([glyphs[char] for char in text])
+        return [(self, b'<%s>' % hex_ids.encode('ascii'))]
+
+    def write(self, pdf, fonts):
+        """Write the font, with the glyphs drawn with it and with
+        `fonts`, which use the same font file."""
+        font_file = self.font_file
+        self.number = pdf.reserve()
+        characters = {}
+        for font in fonts:
+            for char, hex_id in font.glyphs.items():
+                characters.setdefault(int(hex_id, 16), char)
+        glyph_ids = sorted(characters)
+        # A deterministic tag, which tells that the font is a subset
+        tag = zlib.crc32(struct.pack(f'>{len(glyph_ids)}H', *glyph_ids))
+        name = b'%s+%s' % (
+            bytes(65 + tag // 26 ** n % 26 for n in range(6)),
+            font_file.postscript_name,
+        )
+        scale = 1000 / font_file.units_per_em
+        widths = [
+            _number(font_file.advance(gid) * scale) for gid in glyph_ids
+        ]
+        default_width = max(set(widths), key=widths.count) if widths else b'0'
+        w = b' '.join(
+            b'%d [%s]' % (gid, width)
+            for gid, width in zip(glyph_ids, widths)
+            if width != default_width
+        )
+
+        cid_font = pdf.reserve()
+        descriptor = pdf.reserve()
+        file_object = pdf.reserve()
+        to_unicode = pdf.reserve()
+        pdf.write_object(
+            self.number,
+            b'<< /Type /Font /Subtype /Type0 /BaseFont /%s '
+            b'/Encoding /Identity-H /DescendantFonts [%d 0 R] '
+            b'/ToUnicode %d 0 R >>' % (name, cid_font, to_unicode)
+        )
+        pdf.write_object(
+            cid_font,
+            b'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /%s '
+            b'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) '
+            b'/Supplement 0 >> /FontDescriptor %d 0 R '
+            b'/CIDToGIDMap /Identity /DW %s /W [%s] >>' % (
+                name, descriptor, default_width, w
+            )
+        )
+        flags = 32
+        if font_file.fixed_pitch:
+            flags |= 1
+        if font_file.italic_angle:
+            flags |= 64
+        pdf.write_object(
+            descriptor,
+            b'<< /Type /FontDescriptor /FontName /%s /Flags %d '
+            b'/FontBBox [%s] /ItalicAngle %s /Ascent %d /Descent %d '
+            b'/CapHeight %d /StemV 80 /FontFile2 %d 0 R >>' % (
+                name, flags,
+                b' '.join(b'%d' % round(v * scale) for v in font_file.bbox),
+                _number(font_file.italic_angle),
+                round(font_file.ascent * scale),
+                round(font_file.descent * scale),
+                round(font_file.cap_height * scale),
+                file_object,
+            )
+        )
+        data = font_file.subset(glyph_ids)
+        pdf.write_stream(file_object, b' /Length1 %d' % len(data), data)
+        pdf.write_stream(to_unicode, b'', _to_unicode_cmap(characters))
+
+
+def _to_unicode_cmap(characters):
+    """Create a CMap that maps glyph ids to characters."""
+    lines = [
+        b'/CIDInit /ProcSet findresource begin',
+        b'12 dict begin',
+        b'begincmap',
+        b'/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) '
+        b'/Supplement 0 >> def',
+        b'/CMapName /Adobe-Identity-UCS def',
+        b'/CMapType 2 def',
+        b'1 begincodespacerange',
+        b'<0000> <FFFF>',
+        b'endcodespacerange',
+    ]
+    items = sorted(characters.items())
+    for start in range(0, len(items), 100):
+        chunk = items[start:start + 100]
+        lines.append(b'%d beginbfchar' % len(chunk))
+        lines.extend(
+            b'<%04X> <%s>' % (gid, char.encode('utf-16-be').hex().encode())
+            for gid, char in chunk
+        )
+        lines.append(b'endbfchar')
+    lines += [
+        b'endcmap',
+        b'CMapName currentdict /CMap defineresource pop',
+        b'end',
+        b'end',
+    ]
+    return b'\n'.join(lines)
+
+
+@lru_cache(maxsize=16)
+def _load_font_file(path):
+    """Load a TrueType font file. The files are cached by path."""
+    with open(path, 'rb') as f:
+        return _FontFile(f.read())
+
+
+class _FontFile:
+    """The parts of a TrueType font file that are needed to embed it."""
+
+    # The tables that are kept in a subset
+    subset_tables = (
+        b'head', b'hhea', b'maxp', b'hmtx', b'cvt ', b'fpgm', b'prep',
+        b'loca', b'glyf',
+    )
+
+    def __init__(self, data):
+        self.data = data
+        count, = struct.unpack_from('>H', data, 4)
+        self.tables = {}
+        for number in range(count):
+            tag, _, offset, length = struct.unpack_from(
+                '>4sIII', data, 12 + 16 * number
+            )
+            self.tables[tag] = (offset, length)
+
+        head = self.table(b'head')
+        self.units_per_em, = struct.unpack_from('>H', head, 18)
+        self.bbox = struct.unpack_from('>4h', head, 36)
+        long_loca = struct.unpack_from('>h', head, 50)[0] == 1
+        hhea = self.table(b'hhea')
+        self.ascent, self.descent = struct.unpack_from('>hh', hhea, 4)
+        metric_count, = struct.unpack_from('>H', hhea, 34)
+        self.glyph_count, = struct.unpack_from('>H', self.table(b'maxp'), 4)
+        # Pairs of advance width and left side bearing
+        self.advances = struct.unpack_from(
+            f'>{2 * metric_count}H', self.table(b'hmtx')
+        )[::2]
+        post = self.table(b'post')
+        self.italic_angle = struct.unpack_from('>i', post, 4)[0] / 65536
+        self.fixed_pitch = struct.unpack_from('>I', post, 12)[0] != 0
+        self.cap_height = self.ascent
+        if b'OS/2' in self.tables:
+            os2 = self.table(b'OS/2')
+            if struct.unpack_from('>H', os2, 0)[0] >= 2:
+                self.cap_height, = struct.unpack_from('>h', os2, 88)
+
+        loca = self.table(b'loca')
+        if long_loca:
+            self.loca = struct.unpack_from(
+                f'>{self.glyph_count + 1}I', loca
+            )
+        else:
+            self.loca = tuple(
+                2 * offset for offset in
+                struct.unpack_from(f'>{self.glyph_count + 1}H', loca)
+            )
+        self.postscript_name = self._postscript_name()
+        self.cmap = self._cmap()
+
+    def table(self, tag):
+        offset, length = self.tables[tag]
+        return self.data[offset:offset + length]
+
+    def advance(self, glyph_id):
+        """Get the advance width of a glyph, in font units."""
+        return self.advances[min(glyph_id, len(self.advances) - 1)]
+
+    def _postscript_name(self):
+        name = self.table(b'name')
+        count, strings = struct.unpack_from('>2H', name, 2)
+        for number in range(count):
+            platform, _, _, name_id, length, offset = struct.unpack_from(
+                '>6H', name, 6 + 12 * number
+            )
+            if name_id == 6:
+                value = name[strings + offset:strings + offset + length]
+                if platform in (0, 3):
+                    value = value.decode('utf-16-be').encode('latin-1')
+                return bytes(
+                    c for c in value
+                    if 33 <= c <= 126 and c not in b'[](){}<>/%'
+                )
+        return b'Font'
+
+    def _cmap(self):
+        """Get the mapping from character codes to glyph ids."""
+        cmap = self.table(b'cmap')
+        count, = struct.unpack_from('>H', cmap, 2)
+        subtables = {}
+        for number in range(count):
+            platform, encoding, offset = struct.unpack_from(
+                '>HHI', cmap, 4 + 8 * number
+            )
+            subtables[platform, encoding] = offset
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            if key in subtables:
+                offset = subtables[key]
+                break
+        else:
+            return {}
+        mapping = {}
+        format, = struct.unpack_from('>H', cmap, offset)
+        if format == 4:
+            segments = struct.unpack_from('>H', cmap, offset + 6)[0] // 2
+            ends = struct.unpack_from(f'>{segments}H', cmap, offset + 14)
+            starts_at = offset + 16 + 2 * segments
+            starts = struct.unpack_from(f'>{segments}H', cmap, starts_at)
+            deltas = struct.unpack_from(
+                f'>{segments}h', cmap, starts_at + 2 * segments
+            )
+            range_offsets_at = starts_at + 4 * segments
+            range_offsets = struct.unpack_from(
+                f'>{segments}H', cmap, range_offsets_at
+            )
+            for n in range(segments):
+                for code in range(starts[n], ends[n] + 1):
+                    if code == 0xffff:
+                        continue
+                    if range_offsets[n]:
+                        glyph_id, = struct.unpack_from(
+                            '>H', cmap, range_offsets_at + 2 * n +
+                            range_offsets[n] + 2 * (code - starts[n])
+                        )
+                        if glyph_id:
+                            glyph_id = (glyph_id + deltas[n]) & 0xffff
+                    else:
+                        glyph_id = (code + deltas[n]) & 0xffff
+                    if glyph_id:
+                        mapping[code] = glyph_id
+        elif format == 12:
+            groups, = struct.unpack_from('>I', cmap, offset + 12)
+            for n in range(groups):
+                start, end, glyph_id = struct.unpack_from(
+                    '>3I', cmap, offset + 16 + 12 * n
+                )
+                for code in range(start, end + 1):
+                    mapping[code] = glyph_id + code - start
+        return mapping
+
+    def subset(self, glyph_ids):
+        """Create a font file with only the given glyphs
+        and the glyphs they are composed of."""
+        glyf = self.table(b'glyf')
+        loca = self.loca
+        keep = set()
+        pending = [0] + list(glyph_ids)
+        while pending:
+            glyph_id = pending.pop()
+            if glyph_id in keep or glyph_id >= self.glyph_count:
+                continue
+            keep.add(glyph_id)
+            glyph = glyf[loca[glyph_id]:loca[glyph_id + 1]]
+            if len(glyph) < 10 or struct.unpack_from('>h', glyph)[0] >= 0:
+                continue
+            # A composite glyph
+            position = 10
+            while True:
+                flags, component = struct.unpack_from('>HH', glyph, position)
+                pending.append(component)
+                position += 8 if flags & 0x0001 else 6
+                if flags & 0x0008:
+                    position += 2
+                elif flags & 0x0040:
+                    position += 4
+                elif flags & 0x0080:
+                    position += 8
+                if not flags & 0x0020:
+                    break
+
+        glyphs = []
+        offsets = [0]
+        for glyph_id in range(self.glyph_count):
+            if glyph_id in keep:
+                glyph = glyf[loca[glyph_id]:loca[glyph_id + 1]]
+                glyphs.append(glyph + b'\0' * (-len(glyph) % 4))
+                offsets.append(offsets[-1] + len(glyphs[-1]))
+            else:
+                offsets.append(offsets[-1])
+        head = bytearray(self.table(b'head'))
+        # Clear checkSumAdjustment, and use long loca offsets
+        head[8:12] = b'\0\0\0\0'
+        head[50:52] = b'\0\1'
+        tables = {
+            b'head': bytes(head),
+            b'loca': struct.pack(f'>{len(offsets)}I', *offsets),
+            b'glyf': b''.join(glyphs),
+        }
+        for tag in self.subset_tables:
+            if tag not in tables and tag in self.tables:
+                tables[tag] = self.table(tag)
+        return _font_file_data(tables)
+
+
+def _font_file_data(tables):
+    """Assemble the tables of a TrueType font file."""
+    count = len(tables)
+    power = 1
+    while power * 2 <= count:
+        power *= 2
+    header = struct.pack(
+        '>IHHHH', 0x00010000, count, power * 16,
+        power.bit_length() - 1, count * 16 - power * 16,
+    )
+    records = []
+    body = []
+    offset = 12 + 16 * count
+    for tag in sorted(tables):
+        data = tables[tag]
+        padded = data + b'\0' * (-len(data) % 4)
+        checksum = sum(struct.unpack(f'>{len(padded) // 4}I', padded))
+        records.append(struct.pack(
+            '>4sIII', tag, checksum & 0xffffffff, offset, len(data)
+        ))
+        body.append(padded)
+        offset += len(padded)
+    return header + b''.join(records) + b''.join(body)
+
+
+def _number(value):
+    """Format a number for PDF."""
+    if value == int(value):
+        return b'%d' % value
+    return (b'%.3f' % value).rstrip(b'0').rstrip(b'.')
+
+
+class _PdfFile:
+    """Writes the objects of a PDF file to a stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.position = 0
+        # Offset of each object, by object number
+        self.offsets = [None]
+        self.catalog = self.reserve()
+        self.pages_object = self.reserve()
+        self.resources = self.reserve()
+        self.pages = []
+        self.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def write(self, data):
+        self.stream.write(data)
+        self.position += len(data)
+
+    def reserve(self):
+        """Get the number of a new object, to be written later."""
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def write_object(self, number, data):
+        self.offsets[number] = self.position
+        self.write(b'%d 0 obj\n%s\nendobj\n' % (number, data))
+
+    def write_stream(self, number, entries, data, compress=True):
+        if compress:
+            data = zlib.compress(data)
+            entries += b' /Filter /FlateDecode'
+        self.offsets[number] = self.position
+        self.write(b'%d 0 obj\n<< /Length %d%s >>\nstream\n' % (
+            number, len(data), entries
+        ))
+        self.write(data)
+        self.write(b'\nendstream\nendobj\n')
+
+    def add_page(self, layout, content):
+        contents = self.reserve()
+        self.write_stream(contents, b'', content)
+        page = self.reserve()
+        self.write_object(page, b'<< /Type /Page /Parent %d 0 R '
+                          b'/MediaBox [0 0 %s %s] /Resources %d 0 R '
+                          b'/Contents %d 0 R >>' % (
+                              self.pages_object,
+                              _number(layout.page_width),
+                              _number(layout.page_height),
+                              self.resources, contents,
+                          ))
+        self.pages.append(page)
+
+    def finish(self, fonts):
+        self.write_object(
+            self.resources, b'<< /Font << %s >> >>' % fonts.write(self)
+        )
+        self.write_object(
+            self.pages_object,
+            b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+                b' '.join(b'%d 0 R' % page for page in self.pages),
+                len(self.pages),
+            )
+        )
+        self.write_object(
+            self.catalog,
+            b'<< /Type /Catalog /Pages %d 0 R >>' % self.pages_object
+        )
+        info = self.reserve()
+        self.write_object(info, b'<< /Producer (Screenplain) >>')
+
+        xref = self.position
+        lines = [b'xref\n0 %d\n0000000000 65535 f \n' % len(self.offsets)]
+        lines.extend(
+            b'%010d 00000 n \n' % offset for offset in self.offsets[1:]
+        )
+        self.write(b''.join(lines))
+        self.write(
+            b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\n'
+            b'startxref\n%d\n%%%%EOF\n' % (
+                len(self.offsets), self.catalog, info, xref
+            )
+        )
@@ -0,0 +1,959 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Finds the pages of a screenplay as laid out by the PDF export,
+without ReportLab.
+
+The PDF export uses a fixed-pitch font, so the text of each paragraph
+can be wrapped by counting characters. This module wraps the text the
+same way as ReportLab's Paragraph, and follows the same rules as
+ReportLab's page layout for spacing, keeping a paragraph with the next
+one, splitting paragraphs and dual dialog between pages, and page
+breaks. All heights are counted in lines.
+
+The PDF exports wrap and split their text with `wrap_line`,
+`paragraph_height` and `split_lines`, so their lines are the same as
+the ones counted here.
+
+>>> from screenplain.richstring import plain
+>>> from screenplain.types import Action, Screenplay, Slug
+>>> screenplay = Screenplay(paragraphs=[
+...     Slug(plain('INT. HOUSE - DAY')),
+...     Action([plain('Text. ' * 600)]),
+...     Slug(plain('EXT. HOUSE - DAY')),
+... ])
+>>> result = paginate(screenplay)
+>>> result.page_count, list(result.pages), result.scene_pages
+(2, [1, 1, 2], [1, 2])
+
+"""
+
+import re
+from array import array
+from copy import copy
+
+from screenplain.richstring import Bold, RichString, Segment, Underline
+from screenplain.types import (
+    Action,
+    Dialog,
+    DualDialog,
+    PageBreak,
+    Slug,
+    Transition,
+)
+
+# Title page attributes that the PDF export puts on the title page
+TITLE_PAGE_KEYS = (
+    'Title', 'Credit', 'Author', 'Authors', 'Source',
+    'Draft date', 'Contact', 'Copyright',
+)
+
+# Width of a character in Courier and Courier Prime, in ems
+_GLYPH_WIDTH = 0.6
+
+# Runs of two or more spaces
+_spaces_re = re.compile('  +')
+
+# Whitespace that a line may be broken at, and the words between it
+_break_re = re.compile(r'[^\S\xa0]+')
+_word_re = re.compile(r'[\S\xa0]+')
+
+
+LEFT = 'left'
+CENTER = 'center'
+RIGHT = 'right'
+
+
+class ElementStyle:
+    """How a kind of paragraph is laid out.
+
+    `width` is the number of characters that fit on a line, and
+    `indent` the number of characters from the left edge of the text
+    to the paragraph.
+    `space_before` and `space_after` are the space in lines
+    before and after the paragraph.
+    `keep_with_next` is true if the paragraph must be on the same page
+    as the next one.
+    `alignment` is LEFT, CENTER or RIGHT.
+
+    """
+
+    __slots__ = (
+        'width', 'space_before', 'space_after', 'keep_with_next', 'indent',
+        'alignment',
+    )
+
+    def __init__(
+        self, width, space_before=0, space_after=0, keep_with_next=False,
+        indent=0, alignment=LEFT,
+    ):
+        self.width = width
+        self.space_before = space_before
+        self.space_after = space_after
+        self.keep_with_next = keep_with_next
+        self.indent = indent
+        self.alignment = alignment
+
+    def _key(self):
+        return (
+            self.width, self.space_before, self.space_after,
+            self.keep_with_next, self.indent, self.alignment,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ElementStyle):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self):
+        return (
+            f'ElementStyle({self.width}, {self.space_before}, '
+            f'{self.space_after}, {self.keep_with_next}, {self.indent}, '
+            f'{self.alignment!r})'
+        )
+
+
+# The kinds of paragraph that are laid out in the full width,
+# and the ones that are also used in dual dialog
+_STYLE_NAMES = (
+    'action', 'centered_action', 'slug', 'transition',
+    'character', 'dialog', 'parenthetical',
+)
+_DUAL_STYLE_NAMES = ('character', 'dialog', 'parenthetical')
+
+_alignments = {0: LEFT, 1: CENTER, 2: RIGHT}
+
+
+class Layout:
+    """The page layout used by the PDF export.
+
+    The default layout is the same as the default pdf.Settings.
+    Use `from_settings` to get the layout for other Settings.
+
+    Widths and indents are counted in characters, and vertical space
+    in lines. The size of the page, the margins, and the size of the
+    font and the lines are in points.
+
+    """
+
+    def __init__(
+        self, lines_per_page=55, characters_per_line=61,
+        title_frame_characters=55, strong_slugs=False,
+    ):
+        self.lines_per_page = lines_per_page
+        self.characters_per_line = characters_per_line
+        # The width of the frame of the title page
+        self.title_frame_characters = title_frame_characters
+        # The width of the frame the paragraphs are laid out in
+        self.frame_characters = characters_per_line
+        self.strong_slugs = strong_slugs
+
+        self.font_size = 12
+        self.line_height = 12
+        self.character_width = self.font_size * _GLYPH_WIDTH
+        self.page_width = 612
+        self.page_height = 792
+        self.left_margin = 108
+        self.top_margin = 72
+
+        # Indents, space in lines, keep with next and alignment
+        # of each kind of paragraph
+        self._specs = {
+            'action': (0, 0, 1, 0, False, LEFT),
+            'centered_action': (0, 0, 1, 0, False, CENTER),
+            'slug': (0, 0, 1, 1, True, LEFT),
+            'transition': (0, 0, 1, 1, False, RIGHT),
+            'character': (19, 0, 1, 0, True, LEFT),
+            'dialog': (9, characters_per_line - 45, 0, 0, False, LEFT),
+            'parenthetical': (13, 0, 0, 0, True, LEFT),
+        }
+        self._set_styles()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Get the layout of a pdf.Settings object."""
+        layout = cls.__new__(cls)
+        character_width = settings.font_size * _GLYPH_WIDTH
+
+        def characters(points):
+            return round(points / character_width, 6)
+
+        layout.lines_per_page = settings.lines_per_page
+        layout.characters_per_line = characters(settings.frame_width)
+        layout.title_frame_characters = characters(
+            settings.title_frame_width
+        )
+        layout.frame_characters = layout.characters_per_line
+        layout.strong_slugs = settings.strong_slugs
+
+        layout.font_size = settings.font_size
+        layout.line_height = settings.line_height
+        layout.character_width = character_width
+        layout.page_width = settings.page_width
+        layout.page_height = settings.page_height
+        layout.left_margin = settings.left_margin
+        layout.top_margin = settings.top_margin
+
+        def spec(style):
+            return (
+                characters(style.leftIndent),
+                characters(style.rightIndent),
+                style.spaceBefore / settings.line_height,
+                style.spaceAfter / settings.line_height,
+                bool(getattr(style, 'keepWithNext', 0)),
+                _alignments.get(style.alignment, LEFT),
+            )
+
+        layout._specs = {
+            'action': spec(settings.action_style),
+            'centered_action': spec(settings.centered_action_style),
+            'slug': spec(settings.slug_style),
+            'transition': spec(settings.transition_style),
+            'character': spec(settings.character_style),
+            'dialog': spec(settings.dialog_style),
+            'parenthetical': spec(settings.parenthentical_style),
+        }
+        layout._set_styles()
+        return layout
+
+    def without_title_page(self):
+        """Get the layout of a screenplay without a title page.
+
+        The PDF export lays out such a screenplay in the frame of the
+        title page, so the paragraphs outside dual dialog are narrower,
+        but indented the same.
+
+        """
+        layout = copy(self)
+        layout.frame_characters = self.title_frame_characters
+        layout._set_styles()
+        return layout
+
+    def _set_styles(self):
+        width = self.frame_characters
+        for name in _STYLE_NAMES:
+            left, right, before, after, keep, alignment = self._specs[name]
+            setattr(self, name, ElementStyle(
+                int(width - left - right + 1e-6), before, after, keep,
+                left, alignment,
+            ))
+
+        # Dual dialog columns are half as wide, with half the indents
+        column = self.characters_per_line / 2
+        for name in _DUAL_STYLE_NAMES:
+            left, right, before, after, keep, alignment = self._specs[name]
+            setattr(self, 'dual_' + name, ElementStyle(
+                int(column - (left + right) / 2 + 1e-6), before, after,
+                keep, left / 2, alignment,
+            ))
+        self.dual_space_before = 1
+
+
+class Pagination:
+    """The result of `paginate`.
+
+    `pages` has the number of the page each paragraph starts on,
+    and `scene_pages` the page of each scene, in the order of
+    ScreenplayIndex.scene_starts.
+    Page numbers are the ones printed on the pages, so the first page
+    after the title page is page 1. A paragraph that is not printed,
+    like a section heading, gets the number of the page where the next
+    printed paragraph starts.
+
+    `page_count` is the total number of pages, including the title page.
+
+    """
+
+    def __init__(self, pages, scene_pages, page_count, has_title_page):
+        self.pages = pages
+        self.scene_pages = scene_pages
+        self.page_count = page_count
+        self.has_title_page = has_title_page
+
+
+def paginate(screenplay, layout=None):
+    """Find the pages of a screenplay as laid out by pdf.to_pdf
+    with `layout`, by default the layout of the default pdf.Settings.
+
+    Returns a Pagination.
+
+    """
+    has_title_page = any(
+        screenplay.title_page.get(key) for key in TITLE_PAGE_KEYS
+    )
+    layout = layout or Layout()
+    if not has_title_page:
+        layout = layout.without_title_page()
+    paragraphs = list(screenplay)
+    pages = array('l', [0] * len(paragraphs))
+    paginator = Paginator(layout.lines_per_page, pages)
+    if has_title_page:
+        paginator.page = 1
+    paginator.run(paragraphs, layout)
+
+    if has_title_page:
+        page_count = paginator.page
+        offset = 1
+    else:
+        page_count = max(paginator.page, 1)
+        offset = 0
+    # Paragraphs that were not printed get the page of the next one
+    next_page = paginator.page
+    for index in range(len(pages) - 1, -1, -1):
+        if pages[index]:
+            next_page = pages[index]
+        else:
+            pages[index] = next_page
+        pages[index] -= offset
+
+    scene_pages = [
+        pages[index] for index in screenplay.index.scene_starts
+    ]
+    return Pagination(pages, scene_pages, page_count, has_title_page)
+
+
+def count_lines(lines, width):
+    """Count the number of lines a paragraph takes, when its lines
+    (RichStrings) are wrapped at `width` characters.
+
+    >>> from screenplain.richstring import plain
+    >>> count_lines([plain('One two three'), plain('four')], 8)
+    3
+
+    """
+    return paragraph_height(_line_counts(lines, width))
+
+
+def _line_counts(lines, width):
+    """Get the number of lines each line of a paragraph is wrapped into,
+    or 0 for an empty line.
+
+    """
+    return tuple(_wrap(str(line), width) for line in lines)
+
+
+def paragraph_height(counts):
+    """Get the height in lines of a paragraph, from the number of lines
+    each of its lines is wrapped into, where 0 is an empty line.
+
+    >>> paragraph_height((2, 0, 1))
+    4
+
+    """
+    if len(counts) > 1 and not counts[-1]:
+        # A line break at the end does not add an empty line
+        counts = counts[:-1]
+    if len(counts) == 1 and not counts[0]:
+        return 0
+    return sum(counts) + counts.count(0)
+
+
+def split_words(text):
+    """Split a line into the words it may be broken between.
+
+    Spaces are converted as RichString.to_html converts them,
+    so runs of spaces become non-breaking spaces except the last one.
+
+    >>> split_words('One  two three')
+    ['One\xa0', 'two', 'three']
+
+    """
+    return [word for word in _break_re.split(_nbsp(text)) if word]
+
+
+def _nbsp(text):
+    """Convert spaces to non-breaking spaces like RichString.to_html."""
+    text = _spaces_re.sub(
+        lambda match: '\xa0' * (len(match.group(0)) - 1) + ' ', text
+    )
+    if text.startswith(' '):
+        text = '\xa0' + text[1:]
+    return text
+
+
+def _wrap(text, width):
+    """Count the lines a single line of text is wrapped into."""
+    lines = 0
+    # Length of the current line, or -1 if there is none yet
+    length = -1
+    for word in split_words(text):
+        size = len(word)
+        if length >= 0 and length + 1 + size <= width:
+            length += 1 + size
+            continue
+        if size > width:
+            # A long word fills up the current line and continues
+            # on the following ones
+            if length >= 0:
+                room = width - length - 1
+                if room > 0:
+                    size -= room
+            else:
+                lines += 1
+            while size > width:
+                size -= width
+                lines += 1
+            if length >= 0:
+                lines += 1
+            length = size
+            continue
+        lines += 1
+        length = size
+    return lines
+
+
+def _break_lines(text, width):
+    """Wrap a single line of text the same way as `_wrap`.
+
+    Returns the lines, where each line is a list of (start, end) ranges
+    of the text, which are separated by a space on the line.
+
+    """
+    lines = []
+    line = None
+    # Length of the current line, or -1 if there is none yet
+    length = -1
+    for match in _word_re.finditer(_nbsp(text)):
+        start, end = match.span()
+        size = end - start
+        if length >= 0 and length + 1 + size <= width:
+            line.append((start, end))
+            length += 1 + size
+            continue
+        if size > width:
+            # A long word fills up the current line and continues
+            # on the following ones
+            if length >= 0:
+                room = width - length - 1
+                if room > 0:
+                    line.append((start, start + room))
+                    start += room
+                    size -= room
+            while size > width:
+                lines.append([(start, start + width)])
+                start += width
+                size -= width
+        line = [(start, end)]
+        lines.append(line)
+        length = size
+    return lines
+
+
+def wrap_line(line, width):
+    """Wrap a line (a RichString) in lines of `width` characters,
+    like ReportLab's Paragraph wraps it in a fixed-pitch font.
+
+    Returns a list of the wrapped lines, where each line is a tuple of
+    its length, its runs of (text, style mask), and the (start, end)
+    columns of its underlined parts.
+
+    >>> from screenplain.richstring import plain
+    >>> wrap_line(plain('One two three'), 8)
+    [(7, [('One two', 0)], []), (5, [('three', 0)], [])]
+
+    """
+    text = str(line)
+    segments = line.segments
+    rows = []
+    if len(segments) == 1:
+        mask = segments[0].style_mask
+        for spans in _break_lines(text, width):
+            row_text = ' '.join(text[start:end] for start, end in spans)
+            length = len(row_text)
+            rows.append((
+                length, [(row_text, mask)],
+                [(0, length)] if mask & Underline.mask else [],
+            ))
+        return rows
+
+    masks = bytearray()
+    for segment in segments:
+        masks += bytes((segment.style_mask,)) * len(segment.text)
+    for spans in _break_lines(text, width):
+        chars = []
+        char_masks = []
+        previous_end = None
+        for start, end in spans:
+            if previous_end is not None:
+                # The space between words has the style of the
+                # whitespace it replaces
+                chars.append(' ')
+                char_masks.append(masks[previous_end])
+            chars.append(text[start:end])
+            char_masks.extend(masks[start:end])
+            previous_end = end
+        row_text = ''.join(chars)
+        runs = []
+        underlines = []
+        start = 0
+        length = len(row_text)
+        for position in range(1, length + 1):
+            if position == length or (
+                char_masks[position] != char_masks[start]
+            ):
+                mask = char_masks[start]
+                run = row_text[start:position]
+                runs.append((run, mask))
+                # Like in ReportLab, each run is underlined separately,
+                # without its trailing spaces
+                end = start + len(run.rstrip(' '))
+                if mask & Underline.mask and end > start:
+                    underlines.append((start, end))
+                start = position
+        rows.append((length, runs, underlines))
+    return rows
+
+
+class Block:
+    """A paragraph, or part of one, as laid out on the page.
+
+    `index` is the index of the paragraph in the screenplay, `lines`
+    the height of the block and `style` its ElementStyle.
+    `counts` are the number of lines each line of the paragraph is
+    wrapped into, if it can be split, and `rows` the lines from
+    `wrap_line` of each line of the paragraph, if they are needed.
+
+    """
+
+    __slots__ = (
+        'index', 'lines', 'counts', 'rows', 'style', 'keep_with_next',
+        'postponed',
+    )
+
+    def __init__(self, index, lines, style, counts=None, rows=None):
+        self.index = index
+        self.lines = lines
+        self.counts = counts
+        self.rows = rows
+        self.style = style
+        self.keep_with_next = style.keep_with_next
+        self.postponed = False
+
+    @property
+    def space_before(self):
+        return self.style.space_before
+
+    @property
+    def space_after(self):
+        return self.style.space_after
+
+    def split(self, height):
+        """Split the block so the first part fits in `height` lines.
+
+        Returns the two parts, or None if the block can not be split.
+        Like ReportLab, a single line is not left at the bottom,
+        and if the split is at a line break, the second part starts
+        with an empty line.
+
+        """
+        lines = int(height)
+        counts = self.counts
+        if counts is None or lines <= 1 or self.lines <= lines:
+            return None
+        first, rest, first_rows, rest_rows = split_lines(
+            counts, self.rows, lines
+        )
+        return (
+            Block(
+                self.index, paragraph_height(first), self.style,
+                first, first_rows,
+            ),
+            Block(
+                self.index, paragraph_height(rest), self.style,
+                rest, rest_rows,
+            ),
+        )
+
+
+def split_lines(counts, rows, lines):
+    """Split a paragraph after `lines` lines, like ReportLab's
+    Paragraph.split.
+
+    `counts` are the number of lines each line of the paragraph is
+    wrapped into, like for `paragraph_height`, and `rows` the lines
+    from `wrap_line` for each line, or None.
+    Returns the counts of the two parts and their rows, if there are
+    rows. If the split is at a line break, the second part starts with
+    an empty line.
+
+    """
+    total = 0
+    for index, count in enumerate(counts):
+        count = count or 1
+        if total + count >= lines:
+            break
+        total += count
+    used = lines - total
+    if used == count:
+        first = counts[:index + 1]
+        rest = (0,) + counts[index + 1:]
+        if rows is not None:
+            first_rows = rows[:index + 1]
+            rest_rows = ((),) + rows[index + 1:]
+    else:
+        first = counts[:index] + (used,)
+        rest = (count - used,) + counts[index + 1:]
+        if rows is not None:
+            first_rows = rows[:index] + (rows[index][:used],)
+            rest_rows = (rows[index][used:],) + rows[index + 1:]
+    if rows is None:
+        first_rows = rest_rows = None
+    return first, rest, first_rows, rest_rows
+
+
+class DualBlock:
+    """Dual dialog, laid out like the ReportLab Table that is used for it.
+
+    `index` is the index of the paragraph in the screenplay,
+    `columns` are the lists of blocks in each column, and
+    `lines` is the height of the table.
+
+    """
+
+    __slots__ = ('index', 'columns', 'lines', 'space_before', 'postponed')
+
+    keep_with_next = False
+    space_after = 0
+
+    def __init__(self, index, columns, space_before, lines=None):
+        self.index = index
+        self.columns = columns
+        self.space_before = space_before
+        if lines is None:
+            lines = max(_column_height(column) for column in columns)
+        self.lines = lines
+        self.postponed = False
+
+    def split(self, height):
+        split_point = min(
+            height, max(_column_height(column) for column in self.columns)
+        )
+        if split_point < 0 or self.lines - split_point <= 0:
+            return None
+        first = []
+        rest = []
+        for column in self.columns:
+            parts = _split_column(column, split_point)
+            if parts is None:
+                return None
+            first.append(parts[0])
+            rest.append(parts[1])
+        first_height = min(
+            split_point, max(_column_height(column) for column in first)
+        )
+        rest_height = max(
+            max(_column_height(column) for column in rest),
+            self.lines - first_height,
+        )
+        return (
+            DualBlock(self.index, first, self.space_before, first_height),
+            # Like a split Table, the rest has no space before it
+            DualBlock(self.index, rest, 0, rest_height),
+        )
+
+
+def _column_height(blocks):
+    """Height of a dual dialog column, as in a ReportLab Table cell."""
+    if not blocks:
+        return 0
+    height = sum(
+        block.lines + block.space_before + block.space_after
+        for block in blocks
+    )
+    return height - blocks[0].space_before - blocks[-1].space_after
+
+
+def _split_column(blocks, height):
+    """Split a dual dialog column as ReportLab splits a Table cell."""
+    first = []
+    rest = []
+    used = 0
+    for block in blocks:
+        if rest:
+            rest.append(block)
+        elif used + block.lines + block.space_before <= height:
+            first.append(block)
+            used += block.lines + block.space_before + block.space_after
+        else:
+            parts = block.split(height - used - block.space_before)
+            if parts:
+                first.append(parts[0])
+                rest.append(parts[1])
+            elif not first:
+                return None
+            else:
+                rest.append(block)
+    return first, rest
+
+
+class _Group:
+    """Blocks that must be kept on the same page, if possible."""
+
+    __slots__ = ('blocks', 'postponed')
+
+    keep_with_next = False
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.postponed = False
+
+    @property
+    def space_before(self):
+        return self.blocks[0].space_before
+
+    def heights(self):
+        """Get the total height of the blocks, and that of the first."""
+        total = 0
+        at_top = True
+        previous_after = 0
+        for block in self.blocks:
+            if block.lines <= 0:
+                continue
+            total += block.lines
+            if at_top:
+                at_top = False
+            else:
+                total += max(block.space_before - previous_after, 0)
+            previous_after = block.space_after
+            total += previous_after
+        return total - previous_after, self.blocks[0].lines
+
+
+# Markers in the list of blocks: end of page because of a page break,
+# end of page to keep a group together, and nothing
+_PAGE_BREAK = object()
+_FRAME_BREAK = object()
+_NOTHING = object()
+
+
+def _flowables(paragraphs, layout, text_block):
+    """Generate the blocks and page breaks that pdf.to_pdf would create
+    for the paragraphs.
+
+    The blocks of text are created by `text_block`, which is called like
+    Paginator.text_block.
+
+    """
+    for index, para in enumerate(paragraphs):
+        kind = type(para)
+        if kind is Dialog:
+            yield from _dialog_blocks(
+                index, para, layout.character, layout.dialog,
+                layout.parenthetical, text_block,
+            )
+        elif kind is DualDialog:
+            yield DualBlock(
+                index,
+                [
+                    list(_dialog_blocks(
+                        index, dialog, layout.dual_character,
+                        layout.dual_dialog, layout.dual_parenthetical,
+                        text_block,
+                    ))
+                    for dialog in (para.left, para.right)
+                ],
+                layout.dual_space_before,
+            )
+        elif kind is Action:
+            style = layout.centered_action if para.centered else layout.action
+            yield text_block(index, para.lines, style)
+        elif kind is Slug:
+            style = layout.slug
+            for line in para.lines:
+                if layout.strong_slugs:
+                    line = strong_line(line)
+                # A scene heading with scene numbers is not split
+                yield text_block(
+                    index, [line], style, splittable=not para.scene_number
+                )
+        elif kind is Transition:
+            yield text_block(index, para.lines, layout.transition)
+        elif kind is PageBreak:
+            yield _PAGE_BREAK
+
+
+_spacer_style = ElementStyle(0)
+
+
+def _dialog_blocks(
+    index, dialog, character, dialog_style, parenthetical, text_block
+):
+    yield text_block(index, [dialog.character], character)
+    for is_parenthetical, line in dialog.blocks:
+        style = parenthetical if is_parenthetical else dialog_style
+        if not str(line):
+            # An empty line is a Spacer
+            yield Block(index, 1, _spacer_style)
+        else:
+            yield text_block(index, [line], style)
+
+
+def strong_line(line):
+    """Make a line bold and underlined, like a strong scene heading."""
+    return RichString(*(
+        Segment.from_mask(
+            segment.text,
+            segment.style_mask | Bold.mask | Underline.mask,
+        )
+        for segment in line.segments
+    ))
+
+
+class Paginator:
+    """Lays out the paragraphs of a screenplay on pages like ReportLab's
+    BaseDocTemplate with a single frame per page.
+
+    `pages` is a sequence with an item for each paragraph, where the
+    number of the page the paragraph starts on is stored.
+
+    Subclasses may override these methods to do more with the layout:
+
+    - `text_block`, which creates the Block of a paragraph of text,
+      for instance with the wrapped lines in its `rows`,
+    - `begin_page`, which is called when a new page is started,
+    - `placed`, which is called for each Block or DualBlock when it is
+      laid out on the current page.
+
+    """
+
+    def __init__(self, lines_per_page, pages):
+        self.lines_per_page = lines_per_page
+        # Page number of each paragraph
+        self.pages = pages
+        self.page = 0
+        self.page_open = False
+        self.used = 0
+        self.at_top = True
+        self.previous_after = 0
+
+    def run(self, paragraphs, layout):
+        """Lay out the paragraphs with a Layout."""
+        # Items to lay out before the rest of the flowables, last first
+        self.queue = []
+        self.flowables = iter(
+            _flowables(paragraphs, layout, self.text_block)
+        )
+        queue = self.queue
+        while True:
+            item = self.next_item()
+            if item is None:
+                break
+            if not self.page_open:
+                self.begin_page()
+
+            if item is _PAGE_BREAK or item is _FRAME_BREAK:
+                self.page_open = False
+                continue
+            if item is _NOTHING:
+                continue
+
+            if item.keep_with_next:
+                item = self.keep_with_next(item)
+            if type(item) is not _Group and self.add(item):
+                continue
+
+            parts = self.split(item)
+            if parts:
+                if parts[0] is _NOTHING or parts[0] is _FRAME_BREAK:
+                    queue.extend(reversed(parts))
+                else:
+                    if not self.add(parts[0]):
+                        raise AssertionError('Split part does not fit')
+                    queue.extend(reversed(parts[1:]))
+            else:
+                if item.postponed:
+                    raise ValueError('Paragraph is too large for a page')
+                item.postponed = True
+                queue.append(item)
+                self.page_open = False
+
+    def text_block(self, index, lines, style, splittable=True):
+        """Get the Block of a ReportLab Paragraph with the lines of text
+        of the paragraph at `index`, in an ElementStyle.
+
+        """
+        counts = _line_counts(lines, style.width)
+        return Block(
+            index, paragraph_height(counts), style,
+            counts if splittable else None,
+        )
+
+    def next_item(self):
+        """Get the next item to lay out, or None at the end."""
+        if self.queue:
+            return self.queue.pop()
+        return next(self.flowables, None)
+
+    def begin_page(self):
+        """Start a new page."""
+        self.page += 1
+        self.page_open = True
+        self.used = 0
+        self.at_top = True
+        self.previous_after = 0
+
+    def space_before(self, item):
+        if self.at_top:
+            return 0
+        return max(item.space_before - self.previous_after, 0)
+
+    def add(self, item):
+        space = self.space_before(item)
+        available = self.lines_per_page - self.used - space
+        if available <= 0 or item.lines > available:
+            return False
+        self.placed(item, self.used + space)
+        self.used += space + item.lines + item.space_after
+        self.previous_after = item.space_after
+        if item.lines or space or item.space_after:
+            self.at_top = False
+        return True
+
+    def placed(self, item, line):
+        """Called when a Block or DualBlock is laid out on the current
+        page, `line` lines from the top.
+
+        """
+        if not self.pages[item.index]:
+            self.pages[item.index] = self.page
+
+    def keep_with_next(self, item):
+        """Collect the item and the items after it that must be kept
+        together into a _Group.
+
+        """
+        blocks = [item]
+        while True:
+            following = self.next_item()
+            if following is None:
+                break
+            if following is _PAGE_BREAK or following is _FRAME_BREAK:
+                self.queue.append(following)
+                break
+            blocks.append(following)
+            if not following.keep_with_next:
+                break
+        for block in blocks[:-1]:
+            block.keep_with_next = False
+        return _Group(blocks)
+
+    def split(self, item):
+        """Split an item that does not fit on the current page.
+
+        Returns a list of items to lay out instead, or None.
+
+        """
+        height = self.lines_per_page - self.used - self.space_before(item)
+        if height <= 0:
+            return None
+        if type(item) is not _Group:
+            return item.split(height)
+
+        total, first = item.heights()
+        too_high = total > height
+        if too_high or first > height:
+            if too_high and not self.at_top:
+                return [_FRAME_BREAK] + item.blocks
+            return [_NOTHING] + item.blocks
+        return item.blocks
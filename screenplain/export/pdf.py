@@ -4,10 +4,16 @@
 
 import sys
 import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from hashlib import sha1
 
 from reportlab import platypus
 from reportlab.lib import colors, pagesizes
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib import fonts as reportlab_fonts
+from reportlab.lib.fonts import ps2tt, tt2ps
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
@@ -21,6 +27,13 @@ from reportlab.platypus import (
 )
 
 from screenplain import types
+from screenplain.export.pagination import (
+    paragraph_height,
+    split_lines,
+    split_words,
+    strong_line,
+    wrap_line,
+)
 from screenplain.types import Action, Dialog, DualDialog, Slug, Transition
 from reportlab.lib import pagesizes
 from reportlab.pdfbase import pdfmetrics
@@ -48,10 +61,35 @@ class FontSettings:
         self.file_italic = None
         self.file_bold_italic = None
 
+    def key(self):
+        """Get the family name and font files, which identify the fonts."""
+        return (
+            self.family_name,
+            self.file_normal, self.file_bold,
+            self.file_italic, self.file_bold_italic,
+        )
+
     def register(self):
+        """Register the fonts with ReportLab, unless they already are.
+
+        Returns the family name the fonts are registered as.
+        They are also registered as the family name of the settings,
+        unless other fonts already are.
+
+        """
+        return font_registry.register(self)
+
+    def _register_fonts(self, family_name=None):
+        """Load the font files and register them with ReportLab
+        as `family_name`, by default the family name of the settings.
+
+        Returns the names of the registered fonts.
+
+        """
         if not self.file_normal:
             raise RuntimeError('No font file set for normal typeface')
 
+        family_name = family_name or self.family_name
         kwargs = {}
         for (suffix, file, arg) in [
             ('', self.file_normal, 'normal'),
@@ -60,11 +98,195 @@ class FontSettings:
             (' Bold Italic', self.file_bold_italic, 'boldItalic')
         ]:
             if file:
-                n = self.family_name + suffix
+                n = family_name + suffix
                 pdfmetrics.registerFont(TTFont(n, file))
                 kwargs[arg] = n
 
-        pdfmetrics.registerFontFamily(self.family_name, **kwargs)
+        pdfmetrics.registerFontFamily(family_name, **kwargs)
+        return list(kwargs.values())
+
+
+class FontRegistry:
+    """Keeps track of the fonts registered with ReportLab,
+    so the font files of a FontSettings object are only loaded once
+    per process.
+
+    Each set of font files is registered under its own family name:
+    the family name of the settings followed by a hash of the files.
+    FontSettings with the same family name but other files get fonts
+    of their own, and do not replace each other. The first set of files
+    is also registered under the plain family name, as long as no other
+    fonts have that name, so code that uses the family name of the
+    settings keeps working.
+
+    At most `max_entries` sets of fonts are kept registered. When there
+    are more, the least recently used ones that are not in use are
+    unregistered. Fonts are in use inside `use`, which to_pdf enters
+    while it writes a PDF with them.
+
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # FontSettings key -> _RegisteredFonts
+        self._families = OrderedDict()
+        # Plain family name -> key of the FontSettings registered as it
+        self._plain_names = {}
+
+    def register(self, font_settings):
+        """Register the fonts of a FontSettings object,
+        unless they already are.
+
+        Returns the family name the fonts are registered as.
+
+        """
+        with self._lock:
+            return self._register(font_settings).family_name
+
+    @contextmanager
+    def use(self, font_settings):
+        """Context manager that registers the fonts of a FontSettings
+        object and keeps them registered until it exits.
+
+        Gives the family name the fonts are registered as.
+
+        """
+        with self._lock:
+            fonts = self._register(font_settings)
+            fonts.users += 1
+        try:
+            yield fonts.family_name
+        finally:
+            with self._lock:
+                fonts.users -= 1
+                self._evict()
+
+    def clear(self):
+        """Unregister all the fonts registered through the registry
+        that are not in use."""
+        with self._lock:
+            for key, fonts in list(self._families.items()):
+                if not fonts.users:
+                    self._unregister(key)
+
+    def __len__(self):
+        return len(self._families)
+
+    def __contains__(self, font_settings):
+        return font_settings.key() in self._families
+
+    def _register(self, font_settings):
+        key = font_settings.key()
+        fonts = self._families.get(key)
+        if fonts is not None:
+            self._families.move_to_end(key)
+            return fonts
+        digest = sha1('\0'.join(map(str, key)).encode()).hexdigest()
+        family_name = f'{font_settings.family_name} {digest[:8]}'
+        fonts = self._families[key] = _RegisteredFonts(
+            family_name, font_settings._register_fonts(family_name)
+        )
+        plain_name = font_settings.family_name
+        if (
+            plain_name not in self._plain_names and
+            plain_name not in pdfmetrics.standardFonts and
+            plain_name not in pdfmetrics.getRegisteredFontNames()
+        ):
+            self._plain_names[plain_name] = key
+            fonts.plain_name = plain_name
+            fonts.names += font_settings._register_fonts(plain_name)
+        self._evict(keep=key)
+        return fonts
+
+    def _evict(self, keep=None):
+        """Unregister the least recently used fonts that are not in use,
+        until there are at most max_entries."""
+        excess = len(self._families) - self.max_entries
+        for key, fonts in list(self._families.items()):
+            if excess <= 0:
+                break
+            if key != keep and not fonts.users:
+                self._unregister(key)
+                excess -= 1
+
+    def _unregister(self, key):
+        fonts = self._families.pop(key)
+        for name in fonts.names:
+            _unregister_font(name)
+        _unregister_font_family(fonts.family_name)
+        if fonts.plain_name is not None:
+            _unregister_font_family(fonts.plain_name)
+            del self._plain_names[fonts.plain_name]
+
+
+class _RegisteredFonts:
+    """The fonts of a FontSettings object in a FontRegistry."""
+
+    __slots__ = ('family_name', 'plain_name', 'names', 'users')
+
+    def __init__(self, family_name, names):
+        self.family_name = family_name
+        # The family name of the settings, if the fonts are registered
+        # as it too
+        self.plain_name = None
+        self.names = names
+        # Number of PDFs being written with the fonts
+        self.users = 0
+
+
+def _unregister_font(name):
+    """Remove a font from ReportLab's registry of fonts.
+
+    ReportLab has no public API for this, so this changes its internal
+    dictionaries of fonts. Raises RuntimeError if they are not there.
+
+    """
+    fonts = getattr(pdfmetrics, '_fonts', None)
+    face_names = getattr(pdfmetrics, '_dynFaceNames', None)
+    if not isinstance(fonts, dict) or not isinstance(face_names, dict):
+        raise RuntimeError(
+            'Fonts can not be unregistered from this version of ReportLab'
+        )
+    font = fonts.pop(name, None)
+    if font is not None and getattr(font, '_dynamicFont', False):
+        face_name = font.face.name
+        if face_names.get(face_name) is font:
+            del face_names[face_name]
+    if font is not None and getattr(font, '_multiByte', False):
+        # registerFont made it a family of its own too
+        _unregister_font_family(name)
+
+
+def _unregister_font_family(family_name):
+    """Remove the mapping of a family to its fonts that
+    pdfmetrics.registerFontFamily added.
+
+    Like _unregister_font, this changes ReportLab's internal
+    dictionaries, and raises RuntimeError if they are not there.
+
+    """
+    tt2ps_map = getattr(reportlab_fonts, '_tt2ps_map', None)
+    ps2tt_map = getattr(reportlab_fonts, '_ps2tt_map', None)
+    if not isinstance(tt2ps_map, dict) or not isinstance(ps2tt_map, dict):
+        raise RuntimeError(
+            'Font families can not be unregistered '
+            'from this version of ReportLab'
+        )
+    family = family_name.lower()
+    for bold in (0, 1):
+        for italic in (0, 1):
+            name = tt2ps_map.pop((family, bold, italic), None)
+            if name is None:
+                continue
+            # The font may be mapped to another family too
+            mapped = ps2tt_map.get(name.lower())
+            if mapped is not None and mapped[0] == family:
+                del ps2tt_map[name.lower()]
+
+
+# The registry used by FontSettings.register
+font_registry = FontRegistry()
 
 
 def get_standard_font_settings() -> FontSettings:
@@ -103,7 +325,9 @@ class Settings:
     slug_style: ParagraphStyle
     transition_style: ParagraphStyle
 
-    # Dual dialog table style
+    # Style of a Table with dual dialog. The PDF export lays out dual
+    # dialog with DualDialogColumns, but this is kept for templates
+    # that use a Table.
     dual_dialog_table_style: platypus.TableStyle
 
     # Title page styles
@@ -125,6 +349,8 @@ class Settings:
     page_height: float
 
     font_settings: FontSettings
+    # The family name the fonts are registered with ReportLab as
+    font_name: str
 
     def __init__(
         self,
@@ -136,7 +362,14 @@ class Settings:
         strong_slugs=False,
         font_settings=None
     ):
-        self.font_settings = font_settings or get_courier_prime_settings()
+        if font_settings is None:
+            font_settings = get_courier_prime_settings()
+        self.font_settings = font_settings
+        if font_settings.file_normal:
+            self.font_name = font_settings.register()
+        else:
+            # A font that is built into PDF
+            self.font_name = font_settings.family_name
 
         line_height = line_height or font_size
 
@@ -164,7 +397,7 @@ class Settings:
 
         default_style = ParagraphStyle(
             'default',
-            fontName=self.font_settings.family_name,
+            fontName=self.font_name,
             fontSize=font_size,
             leading=line_height,
             spaceBefore=0,
@@ -233,6 +466,329 @@ class Settings:
             ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
             ('LINEBEFORE', (1, 0), (1, 0), 0, colors.white),
         ])
+        # Column width -> styles of dialog in columns of that width
+        self._column_styles = {}
+
+    def column_styles(self, column_width):
+        """Get the character, dialog and parenthetical styles
+        for dialog in a column, such as in dual dialog.
+
+        The indents are scaled to the width of the column.
+        The styles are created once per column width.
+
+        """
+        styles = self._column_styles.get(column_width)
+        if styles is None:
+            proportion = column_width / self.frame_width
+            styles = self._column_styles[column_width] = (
+                ParagraphStyle(
+                    'character-dual', self.character_style,
+                    leftIndent=self.character_style.leftIndent * proportion,
+                ),
+                ParagraphStyle(
+                    'dialog-dual', self.dialog_style,
+                    leftIndent=self.dialog_style.leftIndent * proportion,
+                    rightIndent=self.dialog_style.rightIndent * proportion,
+                ),
+                ParagraphStyle(
+                    'parenth-dual', self.parenthentical_style,
+                    leftIndent=(
+                        self.parenthentical_style.leftIndent * proportion
+                    ),
+                ),
+            )
+        return styles
+
+
+class RichParagraph(Flowable):
+    """Flowable that draws lines of RichString in a fixed-pitch font.
+
+    Lays out and draws the text like a Paragraph of the lines joined
+    with `<br/>`, with the same style, but takes the segments of the
+    lines directly instead of parsing markup. Spacing and keepWithNext
+    come from the style, like for a Paragraph.
+
+    Text that may not be wrapped the same way by counting characters
+    is laid out by a Paragraph instead: words that fill a whole line,
+    and characters that are wider than the others.
+
+    """
+
+    def __init__(self, lines, style):
+        Flowable.__init__(self)
+        self.lines = lines
+        self.style = style
+        self.width = None
+        self.height = 0
+        self._paragraph = None
+        self._counts = None
+        self._rows = None
+
+    def _layout(self, availWidth):
+        style = self.style
+        self.width = availWidth
+        self._advance = advance = pdfmetrics.stringWidth(
+            ' ', style.fontName, style.fontSize
+        )
+        characters = int(
+            (availWidth - style.leftIndent - style.rightIndent) / advance +
+            1e-6
+        )
+        for line in self.lines:
+            if not self._fixed_pitch(str(line), characters):
+                self._paragraph = Paragraph(
+                    '<br/>'.join(line.to_html() for line in self.lines),
+                    style
+                )
+                return
+        self._rows = tuple(wrap_line(line, characters) for line in self.lines)
+        self._counts = tuple(len(line_rows) for line_rows in self._rows)
+        self.height = paragraph_height(self._counts) * style.leading
+
+    def _fixed_pitch(self, text, characters):
+        """Check if text is wrapped by counting characters like
+        ReportLab wraps it, in lines of `characters` characters."""
+        if len(text) >= characters and max(
+            (len(word) for word in split_words(text)), default=0
+        ) >= characters:
+            # ReportLab may split words that fill a whole line
+            # in other places
+            return False
+        style = self.style
+        width = pdfmetrics.stringWidth(text, style.fontName, style.fontSize)
+        return abs(width - len(text) * self._advance) < 1e-6
+
+    def wrap(self, availWidth, availHeight):
+        # The parts of a split paragraph keep the width they were split in
+        if (
+            self.width != availWidth and self.lines is not None and
+            self._paragraph is None
+        ):
+            self._layout(availWidth)
+        if self._paragraph is not None:
+            # Table reads the size of the cell contents from the attributes
+            self.width, self.height = self._paragraph.wrap(
+                availWidth, availHeight
+            )
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        if self._paragraph is not None:
+            return self._paragraph.split(availWidth, availHeight)
+        lines = int(availHeight / self.style.leading)
+        if lines <= 1:
+            return []
+        if self.height <= lines * self.style.leading:
+            return [self]
+        first, rest, first_rows, rest_rows = split_lines(
+            self._counts, self._rows, lines
+        )
+        return [
+            self._part(first, first_rows), self._part(rest, rest_rows)
+        ]
+
+    def _part(self, counts, rows):
+        """Get a part of the paragraph, as laid out in the same width."""
+        part = RichParagraph(None, self.style)
+        part.width = self.width
+        part._advance = self._advance
+        part._counts = counts
+        part._rows = rows
+        part.height = paragraph_height(counts) * self.style.leading
+        return part
+
+    def draw(self):
+        if self._paragraph is not None:
+            self._paragraph.drawOn(self.canv, 0, 0)
+            return
+        canvas = self.canv
+        style = self.style
+        font_size = style.fontSize
+        leading = style.leading
+        advance = self._advance
+        family, _, _ = ps2tt(style.fontName)
+        fonts = [
+            tt2ps(family, mask & 1, mask >> 1) for mask in range(4)
+        ]
+        # Room for the text on each line
+        room = self.width - style.leftIndent - style.rightIndent
+        text = canvas.beginText()
+        underlines = []
+        current = None
+        y = self.height - font_size
+        for line_rows in self._rows:
+            if not line_rows:
+                y -= leading
+                continue
+            for length, runs, line_underlines in line_rows:
+                x = style.leftIndent
+                if style.alignment == TA_CENTER:
+                    x += (room - length * advance) / 2
+                elif style.alignment == TA_RIGHT:
+                    x += room - length * advance
+                text.setTextOrigin(x, y)
+                for run, mask in runs:
+                    font = fonts[mask & 3]
+                    if font != current:
+                        text.setFont(font, font_size, leading)
+                        current = font
+                    text.textOut(run)
+                for start, end in line_underlines:
+                    underlines.append((
+                        x + start * advance, y - font_size / 8,
+                        x + end * advance, y - font_size / 8,
+                    ))
+                y -= leading
+        canvas.drawText(text)
+        if underlines:
+            canvas.saveState()
+            canvas.setStrokeColor(colors.black)
+            canvas.lines(underlines)
+            canvas.restoreState()
+
+
+class DualDialogColumns(Flowable):
+    """Flowable that lays out the two dialogs of a dual dialog side by side.
+
+    `columns` are the lists of flowables in the two columns, which are
+    `column_width` wide. The columns are laid out, split between pages
+    and drawn like the cells of a one-row platypus Table with
+    `splitInRow=1`, zero padding and a white line between the columns.
+    `height` is the height of the row, if it is not the height of
+    the highest column.
+
+    """
+
+    def __init__(self, columns, column_width, spaceBefore=0, height=None):
+        Flowable.__init__(self)
+        self.columns = columns
+        self.column_width = column_width
+        self.spaceBefore = spaceBefore
+        self.hAlign = 'CENTER'
+        self.width = column_width * len(columns)
+        self.height = height
+        self._row_height = height
+
+    def wrap(self, availWidth, availHeight):
+        content_height = max(
+            _column_height(column, self.column_width, self._canvas())
+            for column in self.columns
+        )
+        if self._row_height is None:
+            self.height = content_height
+        self._content_height = content_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        if self.height <= availHeight:
+            return [self]
+        split_point = min(availHeight, self._content_height)
+        if split_point < 0 or self.height - split_point < 1:
+            return []
+        first = []
+        rest = []
+        for column in self.columns:
+            parts = _split_column(column, split_point, self.column_width)
+            if parts is None:
+                return []
+            first.append(parts[0])
+            rest.append(parts[1])
+        canvas = self._canvas()
+        first_height = min(split_point, max(
+            _column_height(column, self.column_width, canvas)
+            for column in first
+        ))
+        rest_height = max(
+            max(
+                _column_height(column, self.column_width, canvas)
+                for column in rest
+            ),
+            self.height - first_height,
+        )
+        return [
+            DualDialogColumns(
+                first, self.column_width, self.spaceBefore, first_height
+            ),
+            # Like a split Table, the rest has no space before it
+            DualDialogColumns(rest, self.column_width, 0, rest_height),
+        ]
+
+    def _canvas(self):
+        # Like a Table, the contents are laid out without a canvas
+        # if there is none yet
+        return getattr(self, 'canv', None)
+
+    def draw(self):
+        canvas = self.canv
+        for number, column in enumerate(self.columns):
+            x = number * self.column_width
+            y = self.height
+            if column:
+                y += column[0].getSpaceBefore()
+            for flowable in column:
+                # Table wraps the cells again in the row height
+                height = flowable.wrapOn(
+                    canvas, self.column_width, self.height
+                )[1]
+                y -= flowable.getSpaceBefore() + height
+                flowable.drawOn(canvas, x, y)
+                y -= flowable.getSpaceAfter()
+        # The line that the Table style drew before the second column
+        canvas.saveState()
+        canvas.setLineCap(1)
+        canvas.setLineJoin(1)
+        canvas.setStrokeColor(colors.white)
+        canvas.line(self.column_width, 0, self.column_width, self.height)
+        canvas.restoreState()
+
+
+def _column_height(flowables, width, canvas):
+    """Get the height of a column of flowables, like the height
+    of a Table cell."""
+    if not flowables:
+        return 0
+    height = 0
+    for flowable in flowables:
+        height += (
+            flowable.wrapOn(canvas, width, 72000)[1] +
+            flowable.getSpaceBefore() + flowable.getSpaceAfter()
+        )
+    return (
+        height - flowables[0].getSpaceBefore() -
+        flowables[-1].getSpaceAfter()
+    )
+
+
+def _split_column(flowables, height, width):
+    """Split a column of flowables like a Table cell is split,
+    so the first part fits in `height`.
+
+    Returns the flowables of the two parts, or None if the column
+    can not be split.
+
+    """
+    first = []
+    rest = []
+    used = 0
+    for flowable in flowables:
+        space_before = flowable.getSpaceBefore()
+        if rest:
+            rest.append(flowable)
+        elif used + flowable.height + space_before <= height:
+            first.append(flowable)
+            used += flowable.height + space_before + flowable.getSpaceAfter()
+        else:
+            parts = flowable.split(width, height - used - space_before)
+            if parts:
+                first.append(parts[0])
+                rest.append(parts[1])
+            elif not first:
+                return None
+            else:
+                rest.append(flowable)
+    return first, rest
 
 
 class SlugWithSceneNumbers(Flowable):
@@ -261,7 +817,7 @@ class SlugWithSceneNumbers(Flowable):
 
         # Use same font as slug, but always plain (not bold/underline)
         canvas.setFont(
-            self.settings.font_settings.family_name,
+            self.settings.font_name,
             self.settings.font_size
         )
 
@@ -308,7 +864,7 @@ class DocTemplate(BaseDocTemplate):
 
     def handle_pageBegin(self):
         self.canv.setFont(
-            self.settings.font_settings.family_name,
+            self.settings.font_name,
             self.settings.font_size,
             leading=self.settings.line_height
         )
@@ -326,20 +882,15 @@ class DocTemplate(BaseDocTemplate):
 
 
 def add_paragraph(story, para, style):
-    story.append(Paragraph(
-        '<br/>'.join(line.to_html() for line in para.lines),
-        style
-    ))
+    story.append(RichParagraph(para.lines, style))
 
 
 def add_slug(story, para, settings):
     for line in para.lines:
         if settings.strong_slugs:
-            html = '<b><u>' + line.to_html() + '</u></b>'
-        else:
-            html = line.to_html()
+            line = strong_line(line)
 
-        paragraph = Paragraph(html, settings.slug_style)
+        paragraph = RichParagraph([line], settings.slug_style)
 
         # Wrap in custom flowable if scene number exists
         if para.scene_number:
@@ -354,45 +905,27 @@ def add_slug(story, para, settings):
 def _dialog_to_flowables(
     dialog, settings: Settings, column_width=None
 ) -> list[Flowable]:
-    # If column_width is set, adjust indents proportionally
     if column_width is not None:
-        proportion = column_width / settings.frame_width
-        character_left = settings.character_style.leftIndent * proportion
-        dialog_left = settings.dialog_style.leftIndent * proportion
-        parenthentical_left = (settings.parenthentical_style.leftIndent *
-                               proportion)
-        dialog_right = settings.dialog_style.rightIndent * proportion
-        character_style = ParagraphStyle(
-            'character-dual', settings.character_style,
-            leftIndent=character_left
-        )
-        dialog_style = ParagraphStyle(
-            'dialog-dual', settings.dialog_style,
-            leftIndent=dialog_left,
-            rightIndent=dialog_right
-        )
-        parenthentical_style = ParagraphStyle(
-            'parenth-dual', settings.parenthentical_style,
-            leftIndent=parenthentical_left
+        character_style, dialog_style, parenthentical_style = (
+            settings.column_styles(column_width)
         )
     else:
         character_style = settings.character_style
         dialog_style = settings.dialog_style
         parenthentical_style = settings.parenthentical_style
     flowables: list[Flowable] = [
-        Paragraph(dialog.character.to_html(), character_style)
+        RichParagraph([dialog.character], character_style)
     ]
     for is_parenthetical, line in dialog.blocks:
         if is_parenthetical:
             style = parenthentical_style
         else:
             style = dialog_style
-        line_html = line.to_html()
-        if not line_html:
+        if not line.to_html():
             # Force an empty line to use vertical space
             flowables.append(Spacer(1, settings.line_height))
         else:
-            flowables.append(Paragraph(line_html, style))
+            flowables.append(RichParagraph([line], style))
     return flowables
 
 
@@ -403,25 +936,16 @@ def add_dialog(story, dialog, settings: Settings):
 
 
 def add_dual_dialog(story, dual, settings: Settings):
-    # Format dual dialog side-by-side using a Table
+    # Format dual dialog side-by-side
     col_width = settings.frame_width / 2
-    left_flowables = _dialog_to_flowables(dual.left,
-                                          settings, column_width=col_width)
-    right_flowables = _dialog_to_flowables(dual.right,
-                                           settings, column_width=col_width)
-    table_data = [
-        [left_flowables, right_flowables]
-    ]
-    # Create a table with one row and two columns.
-    # Set splitInRow=1 to allow splitting the table across pages.
-    table = platypus.Table(
-        table_data,
-        splitInRow=1,
+    story.append(DualDialogColumns(
+        [
+            _dialog_to_flowables(dialog, settings, column_width=col_width)
+            for dialog in (dual.left, dual.right)
+        ],
+        col_width,
         spaceBefore=settings.line_height,
-        colWidths=[col_width, col_width],
-        style=settings.dual_dialog_table_style,
-    )
-    story.append(table)
+    ))
 
 
 def get_title_page_story(screenplay, settings):
@@ -512,38 +1036,64 @@ def get_title_page_story(screenplay, settings):
 def to_pdf(
     screenplay, output_filename,
     template_constructor=DocTemplate,
-    settings=None
+    settings=None,
+    backend='reportlab',
 ):
+    """Write a screenplay as PDF.
+
+    With `backend='native'`, the PDF is written by
+    screenplain.export.native_pdf instead of ReportLab, using the page
+    layout and fonts of the settings. `template_constructor` is then
+    not used.
+
+    """
     settings = settings or create_default_settings()
-    story = get_title_page_story(screenplay, settings)
-    has_title_page = bool(story)
-
-    for para in screenplay:
-        if isinstance(para, Dialog):
-            add_dialog(story, para, settings)
-        elif isinstance(para, DualDialog):
-            add_dual_dialog(story, para, settings)
-        elif isinstance(para, Action):
-            add_paragraph(
-                story, para,
-                settings.centered_action_style
-                if para.centered
-                else settings.action_style
-            )
-        elif isinstance(para, Slug):
-            add_slug(story, para, settings)
-        elif isinstance(para, Transition):
-            add_paragraph(story, para, settings.transition_style)
-        elif isinstance(para, types.PageBreak):
-            story.append(platypus.PageBreak())
-        else:
-            # Ignore unknown types
-            pass
-
-    doc = template_constructor(
-        output_filename,
-        pagesize=(settings.page_width, settings.page_height),
-        settings=settings,
-        has_title_page=has_title_page
-    )
-    doc.build(story)
+    if backend == 'native':
+        from screenplain.export import native_pdf
+        from screenplain.export.pagination import Layout
+        native_pdf.to_pdf(
+            screenplay, output_filename,
+            layout=Layout.from_settings(settings),
+            font_settings=settings.font_settings,
+        )
+        return
+    if backend != 'reportlab':
+        raise ValueError(f'Unknown PDF backend: {backend}')
+    if settings.font_settings.file_normal:
+        # Keep the fonts registered while the PDF is written
+        fonts = font_registry.use(settings.font_settings)
+    else:
+        fonts = nullcontext()
+    with fonts:
+        story = get_title_page_story(screenplay, settings)
+        has_title_page = bool(story)
+
+        for para in screenplay:
+            if isinstance(para, Dialog):
+                add_dialog(story, para, settings)
+            elif isinstance(para, DualDialog):
+                add_dual_dialog(story, para, settings)
+            elif isinstance(para, Action):
+                add_paragraph(
+                    story, para,
+                    settings.centered_action_style
+                    if para.centered
+                    else settings.action_style
+                )
+            elif isinstance(para, Slug):
+                add_slug(story, para, settings)
+            elif isinstance(para, Transition):
+                add_paragraph(story, para, settings.transition_style)
+            elif isinstance(para, types.PageBreak):
+                story.append(platypus.PageBreak())
+            else:
+                # Ignore unknown types
+                pass
+
+        doc = template_constructor(
+            output_filename,
+            pagesize=(settings.page_width, settings.page_height),
+            settings=settings,
+            has_title_page=has_title_page
+        )
+        doc.build(story)
@@ -14,6 +14,10 @@ output_formats = (
     'fdx', 'html', 'pdf'
 )
 
+pdf_backends = (
+    'reportlab', 'native'
+)
+
 description = """Convert text file to viewable screenplay.
 
 If a file name parameter is missing or a dash (-), input will be read
@@ -64,6 +68,15 @@ def main(argv):
         )
     )
     parser.add_argument(
+        '--split-scenes',
+        action='store_true',
+        help=(
+            'For HTML output, write each scene to a separate file in the '
+            'directory output_file, with a JSON manifest of the scenes.'
+        )
+    )
+    css_group = parser.add_mutually_exclusive_group()
+    css_group.add_argument(
         '--css',
         metavar='FILE',
         help=(
@@ -71,6 +84,24 @@ def main(argv):
             'instead of the default.'
         )
     )
+    css_group.add_argument(
+        '--css-url',
+        metavar='URL',
+        help=(
+            'For HTML output, link to the stylesheet at URL '
+            'instead of inlining the CSS in the HTML document.'
+        )
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help=(
+            'For HTML output, convert the screenplay in N processes. '
+            'Only faster for very long screenplays. 0 means one per CPU.'
+        )
+    )
     parser.add_argument(
         '--strong',
         action='store_true',
@@ -87,6 +118,16 @@ def main(argv):
             "use the standard Courier font instead of Courier Prime."
         )
     )
+    parser.add_argument(
+        '--pdf-backend',
+        default='reportlab',
+        choices=pdf_backends,
+        help=(
+            'For PDF output, how to write the PDF: with ReportLab '
+            '(the default), or with the faster built-in writer, '
+            'which does not need ReportLab.'
+        )
+    )
     parser.add_argument(
         '--encoding',
         default='utf-8-sig',
@@ -100,6 +141,12 @@ def main(argv):
                  'backslashreplace', 'surrogateescape'],
         help='How to handle invalid character codes in the input file'
     )
+    parser.add_argument(
+        '--cache',
+        metavar='DIR',
+        help='Keep parsed input files in the directory DIR, so an input '
+        'file that has not changed does not have to be parsed again.'
+    )
     args = parser.parse_args(argv)
 
     # Handle dash as stdin/stdout
@@ -118,8 +165,22 @@ def main(argv):
     except LookupError:
         parser.error(f'Unknown encoding: {args.encoding}')
 
+    if args.workers < 0:
+        parser.error('--workers must not be negative')
+
     format = args.output_format
-    if format is None and output_file:
+    if args.split_scenes:
+        if not output_file:
+            parser.error('--split-scenes requires an output directory')
+        if args.css_url or args.bare:
+            parser.error(
+                '--split-scenes can not be used with --css-url or --bare'
+            )
+        if format is None:
+            format = 'html'
+        elif format != 'html':
+            parser.error('--split-scenes is only supported for HTML output')
+    elif format is None and output_file:
         if output_file.endswith('.fdx'):
             format = 'fdx'
         elif output_file.endswith('.html'):
@@ -137,15 +198,36 @@ def main(argv):
             parser, f'Unsupported output format: "{format}".'
         )
 
-    if input_file:
-        input = codecs.open(
-            input_file, 'r',
-            encoding=args.encoding,
-            errors=args.encoding_errors)
+    if args.cache:
+        from screenplain.cache import ParseCache
+        cache = ParseCache(directory=args.cache)
+        if input_file:
+            screenplay = cache.parse_file(
+                input_file, args.encoding, args.encoding_errors
+            )
+        else:
+            screenplay = cache.parse(
+                sys.stdin.buffer.read(), args.encoding, args.encoding_errors
+            )
     else:
-        input = codecs.getreader(args.encoding)(sys.stdin.buffer)
-        input.errors = args.encoding_errors
-    screenplay = fountain.parse(input)
+        if input_file:
+            input = codecs.open(
+                input_file, 'r',
+                encoding=args.encoding,
+                errors=args.encoding_errors)
+        else:
+            input = codecs.getreader(args.encoding)(sys.stdin.buffer)
+            input.errors = args.encoding_errors
+        screenplay = fountain.parse(input)
+
+    if args.split_scenes:
+        from screenplain.export.html import convert_scenes
+        try:
+            convert_scenes(screenplay, output_file, css_file=args.css)
+        finally:
+            if input_file and not args.cache:
+                input.close()
+        return
 
     if format == 'pdf':
         output_encoding = None
@@ -171,7 +253,16 @@ def main(argv):
             from screenplain.export.html import convert
             convert(
                 screenplay, output,
-                css_file=args.css, bare=args.bare
+                css_file=args.css, bare=args.bare, css_url=args.css_url,
+                workers=args.workers or None,
+            )
+        elif format == 'pdf' and args.pdf_backend == 'native':
+            from screenplain.export import native_pdf
+            from screenplain.export.pagination import Layout
+            native_pdf.to_pdf(
+                screenplay, output,
+                layout=Layout(strong_slugs=args.strong),
+                standard_font=args.standard_font,
             )
         elif format == 'pdf':
             from screenplain.export import pdf
@@ -185,7 +276,7 @@ def main(argv):
     finally:
         if output_file:
             output.close()
-        if input_file:
+        if input_file and not args.cache:
             input.close()
 
 
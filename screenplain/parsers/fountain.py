@@ -2,8 +2,12 @@
 # Licensed under the MIT license:
 # http://www.opensource.org/licenses/mit-license.php
 
+import bisect
 import itertools
+import random
 import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from itertools import takewhile
 
 from screenplain.richstring import parse_emphasis, plain
@@ -15,14 +19,22 @@ from screenplain.types import (
     Screenplay,
     Section,
     Slug,
+    SourceSpans,
     Transition,
 )
 
+# Increase this when a change of the parser means it creates
+# different output for the same input, or when the classes of the
+# output change.
+PARSER_VERSION = 2
+
 slug_regexes = (
     re.compile(r'^(INT|EXT|EST)[ .]'),
     re.compile(r'^(INT\.?/EXT\.?)[ .]'),
     re.compile(r'^I/E[ .]'),
 )
+# First letters of the (uppercased) text matched by slug_regexes
+_slug_initials = ('I', 'E')
 
 boneyard_re = re.compile(r'/\*.*?\*/', flags=re.DOTALL)
 
@@ -42,6 +54,12 @@ transition_re = re.compile(r'(>?)\s*(.+?)(TO:)?$')
 page_break_re = re.compile(r'^={3,}$')
 note_re = re.compile(r'\[\[.*?\]\]', re.DOTALL)
 
+# Number of characters to read at a time when parsing incrementally
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Minimum number of lines in each chunk when parsing in parallel
+DEFAULT_PARALLEL_CHUNK_LINES = 5000
+
 
 def _sequence_to_rich(lines):
     """Converts a sequence of strings into a list of RichString."""
@@ -61,19 +79,44 @@ class InputParagraph:
     def update_list(self, previous_paragraphs):
         """Inserts this paragraph into a list.
         Modifies the `previous_paragraphs` list.
+
+        The first character and the number of lines rule out most kinds
+        of paragraph, so only the kinds that are still possible are
+        tried, in order of precedence. Action is the fallback.
         """
+        paragraphs = previous_paragraphs
+        first_line = self.lines[0]
+        lead = first_line[:1]
+        single = len(self.lines) == 1
         (
-            self.append_forced_action(previous_paragraphs) or
-            self.append_page_break(previous_paragraphs) or
-            self.append_synopsis(previous_paragraphs) or
-            self.append_sections_and_synopsises(previous_paragraphs) or
-            self.append_slug(previous_paragraphs) or
-            self.append_centered_action(previous_paragraphs) or
-            self.append_dialog(previous_paragraphs) or
-            self.append_transition(previous_paragraphs) or
-            self.append_action(previous_paragraphs)
+            lead == '!' and self.append_action(paragraphs) or
+            single and lead == '=' and (
+                self.append_page_break(paragraphs) or
+                self.append_synopsis(paragraphs)
+            ) or
+            lead == '#' and self.append_sections_and_synopsises(paragraphs) or
+            single and (
+                lead == '.' or lead.upper()[:1] in _slug_initials
+            ) and self.append_slug(paragraphs) or
+            '>' in first_line and self.append_centered_action(paragraphs) or
+            not single and self.append_dialog(paragraphs) or
+            single and (
+                lead == '>' or first_line.endswith('TO:')
+            ) and self.append_transition(paragraphs) or
+            self.append_action(paragraphs)
         )
 
+    def depends_on_previous(self):
+        """Checks if this paragraph may modify the last paragraph in the
+        list instead of just adding to it, like a synopsis or the second
+        part of a dual dialog does.
+
+        """
+        if len(self.lines) == 1:
+            return self.lines[0].startswith('=')
+        else:
+            return self.lines[0].endswith('^')
+
     def append_slug(self, paragraphs):
         if len(self.lines) != 1:
             return False
@@ -179,12 +222,6 @@ class InputParagraph:
 
         return False
 
-    def append_forced_action(self, paragraphs):
-        if self.lines[0].startswith('!'):
-            return self.append_action(paragraphs)
-        else:
-            return False
-
     def append_action(self, paragraphs):
         paragraphs.append(
             Action(_sequence_to_rich(
@@ -235,10 +272,99 @@ def parse(stream):
 
     """
     content = stream.read()
-    content = boneyard_re.sub('', content)
-    lines = linebreak_re.split(content)
+    positions = _SourcePositions()
+    content = positions.remove_boneyard(content)
+    lines = positions.split_lines(content)
     del content
-    return parse_lines(lines)
+    return _parse_lines(lines, positions)
+
+
+def iter_paragraphs(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parses Fountain source incrementally.
+
+    Reads `stream` in chunks of `chunk_size` characters and generates
+    paragraph objects as soon as they are complete, so memory use does
+    not grow with the length of the input.
+    The title page, if any, is skipped.
+
+    The only part of the input that has to be held in memory in full is
+    a boneyard (/* ... */) section, as an unterminated boneyard is
+    not a boneyard at all but literal text.
+
+    """
+    lines = _split_lines(_strip_boneyard(_read_chunks(stream, chunk_size)))
+    _, body, _ = _split_title_page(lines)
+    return _iter_body(body)
+
+
+def _read_chunks(stream, chunk_size):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _strip_boneyard(chunks):
+    """Removes boneyard sections from a sequence of strings.
+
+    Gives the same result as `boneyard_re.sub('', ''.join(chunks))`,
+    but generates the text in pieces.
+
+    >>> ''.join(_strip_boneyard(['a/', '* b *', '/c /* d']))
+    'ac /* d'
+
+    """
+    buffer = ''
+    # Where to continue looking for the end of a boneyard that starts
+    # at the beginning of the buffer, or None if outside a boneyard.
+    search_end_from = None
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if search_end_from is None:
+                start = buffer.find('/*')
+                if start == -1:
+                    # A trailing slash may start a boneyard in the next chunk
+                    end = len(buffer) - buffer.endswith('/')
+                    if end:
+                        yield buffer[:end]
+                    buffer = buffer[end:]
+                    break
+                if start:
+                    yield buffer[:start]
+                    buffer = buffer[start:]
+                search_end_from = 2
+            end = buffer.find('*/', search_end_from)
+            if end == -1:
+                # The end marker may be split between this and the next chunk
+                search_end_from = max(2, len(buffer) - 1)
+                break
+            buffer = buffer[end + 2:]
+            search_end_from = None
+    # Either plain text or an unterminated boneyard, which is kept as is.
+    if buffer:
+        yield buffer
+
+
+def _split_lines(chunks):
+    r"""Splits a sequence of strings into lines.
+
+    Gives the same result as `linebreak_re.split(''.join(chunks))`.
+
+    >>> list(_split_lines(['a\r', '\nb\n', 'c']))
+    ['a', 'b', 'c']
+
+    """
+    pending = ''
+    for chunk in chunks:
+        text = pending + chunk
+        # A trailing CR may be the first half of a CRLF
+        hold = '\r' if text.endswith('\r') else ''
+        *lines, pending = linebreak_re.split(text[:len(text) - len(hold)])
+        yield from lines
+        pending += hold
+    yield from linebreak_re.split(pending)
 
 
 def parse_lines(source):
@@ -246,6 +372,33 @@ def parse_lines(source):
 
     Returns a Screenplay object.
 
+    The source offsets in the result's `spans` are calculated from the
+    lengths of the lines, assuming that a line without a line break at
+    the end was followed by a single newline character.
+
+    """
+    positions = _SourcePositions()
+    return _parse_lines(positions.record_lines(source), positions)
+
+
+def _parse_lines(source, positions):
+    title_page, body, body_start = _split_title_page(source)
+    body_parser = _BodyParser()
+    body_parser.parse(body)
+    return Screenplay(
+        title_page,
+        body_parser.paragraphs,
+        positions.get_spans(body_parser, body_start)
+    )
+
+
+def _split_title_page(source):
+    """Separates the title page from the body of the screenplay.
+
+    Returns a tuple of the title page dictionary, an iterator over
+    the lines of the body, and the line number of the first line
+    of the body.
+
     """
     source = (_preprocess_line(line) for line in source)
 
@@ -260,29 +413,345 @@ def parse_lines(source):
     if title_page:
         # The first lines were a title page.
         # Parse the rest of the source as screenplay body.
-        return Screenplay(title_page, parse_body(source))
+        return title_page, source, len(title_page_lines) + 1
     else:
         # The first lines were not a title page.
         # Parse them as part of the screenplay body.
-        return Screenplay(
-            {},
-            parse_body(itertools.chain(title_page_lines, [''], source))
-        )
+        return {}, itertools.chain(title_page_lines, [''], source), 0
 
 
 def parse_body(source):
     """Reads lines of the main screenplay and generates paragraph objects."""
 
+    body_parser = _BodyParser()
+    body_parser.parse(source)
+    return body_parser.paragraphs
+
+
+class _BodyParser:
+    """Creates paragraph objects from input paragraphs and keeps track
+    of the range of line numbers each paragraph object came from.
+
+    """
+
+    def __init__(self):
+        self.paragraphs = []
+        self.start_lines = array('q')
+        self.end_lines = array('q')
+
+    def parse(self, source, line_number=0):
+        """Parses lines of the screenplay body.
+        `line_number` is the line number of the first line.
+
+        """
+        for blank, input_lines in itertools.groupby(source, _is_blank):
+            input_lines = list(input_lines)
+            if not blank:
+                self.add(input_lines, line_number)
+            line_number += len(input_lines)
+
+    def add(self, input_lines, line_number):
+        """Parses one input paragraph, which starts at `line_number`.
+
+        Returns the InputParagraph, or None if there was nothing but notes.
+
+        """
+        paragraphs = self.paragraphs
+        count = len(paragraphs)
+        paragraph = _add_paragraph(input_lines, paragraphs)
+        if not paragraph:
+            return None
+
+        end_line = line_number + len(input_lines)
+        added = len(paragraphs) - count
+        if added == 0:
+            # Merged into the previous paragraph (synopsis or dual dialog)
+            self.end_lines[-1] = end_line
+            return paragraph
+
+        starts = [line_number]
+        if added > 1 and len(paragraph.lines) == len(input_lines):
+            # Several sections. Each one starts at a section heading.
+            starts = [
+                number
+                for number, line in enumerate(paragraph.lines, line_number)
+                if section_re.match(line)
+            ]
+        if len(starts) == added:
+            ends = starts[1:] + [end_line]
+        else:
+            starts = [line_number] * added
+            ends = [end_line] * added
+        self.start_lines.extend(starts)
+        self.end_lines.extend(ends)
+        return paragraph
+
+    def extend(self, other, line_offset):
+        """Appends the paragraphs parsed by another _BodyParser, whose line
+        numbers are offset by `line_offset`.
+
+        """
+        self.paragraphs += other.paragraphs
+        self.start_lines.extend(n + line_offset for n in other.start_lines)
+        self.end_lines.extend(n + line_offset for n in other.end_lines)
+
+
+class _SourcePositions:
+    """Keeps track of where in the original source the parsed lines are."""
+
+    def __init__(self):
+        # Offsets of the first character of each line,
+        # and of the character after the last one (excluding line break).
+        self.line_starts = array('q')
+        self.line_ends = array('q')
+        # Offsets where boneyard sections were removed, and the total
+        # number of characters removed up to and including each one.
+        self.removed_at = array('q')
+        self.removed_total = array('q')
+        # If line breaks were removed with a boneyard, the offsets of the
+        # lines in the original source. Otherwise line numbers are the
+        # same as in the original source, and this is None.
+        self.original_line_starts = None
+
+    def remove_boneyard(self, content):
+        """Returns `content` with boneyard sections removed."""
+        parts = []
+        position = 0
+        removed = 0
+        for match in boneyard_re.finditer(content):
+            start, end = match.span()
+            parts.append(content[position:start])
+            self.removed_at.append(start - removed)
+            removed += end - start
+            self.removed_total.append(removed)
+            position = end
+        if not parts:
+            return content
+
+        self.original_line_starts = array('q', [0])
+        for match in linebreak_re.finditer(content):
+            self.original_line_starts.append(match.end())
+        parts.append(content[position:])
+        return ''.join(parts)
+
+    def split_lines(self, content):
+        """Splits `content` into lines and records their positions."""
+        lines = []
+        start = 0
+        for match in linebreak_re.finditer(content):
+            end = match.start()
+            lines.append(content[start:end])
+            self.line_starts.append(start)
+            self.line_ends.append(end)
+            start = match.end()
+        lines.append(content[start:])
+        self.line_starts.append(start)
+        self.line_ends.append(len(content))
+        return lines
+
+    def record_lines(self, source):
+        """Generates the lines in `source` and records their positions."""
+        start = 0
+        for line in source:
+            length = len(line.rstrip('\r\n'))
+            self.line_starts.append(start)
+            self.line_ends.append(start + length)
+            start += len(line) if len(line) != length else length + 1
+            yield line
+
+    def get_spans(self, body_parser, body_start):
+        """Creates a SourceSpans object for the paragraphs parsed by
+        `body_parser`. `body_start` is the line number of the start
+        of the body.
+
+        """
+        spans = SourceSpans()
+        for start_line, end_line in zip(
+            body_parser.start_lines, body_parser.end_lines
+        ):
+            start_offset = self._original_offset(
+                self.line_starts[start_line + body_start], bisect.bisect_right
+            )
+            end_offset = self._original_offset(
+                self.line_ends[end_line + body_start - 1], bisect.bisect_left
+            )
+            if self.original_line_starts is None:
+                spans.append(
+                    start_line + body_start, end_line + body_start,
+                    start_offset, end_offset
+                )
+            else:
+                spans.append(
+                    bisect.bisect_right(
+                        self.original_line_starts, start_offset
+                    ) - 1,
+                    bisect.bisect_right(
+                        self.original_line_starts, end_offset - 1
+                    ),
+                    start_offset, end_offset
+                )
+        return spans
+
+    def _original_offset(self, offset, bisect_function):
+        """Converts an offset in the text with boneyard removed to an
+        offset in the original source.
+        A boneyard section exactly at `offset` is counted as before it
+        if `bisect_function` is bisect_right, otherwise as after it.
+
+        """
+        index = bisect_function(self.removed_at, offset)
+        if index:
+            return offset + self.removed_total[index - 1]
+        else:
+            return offset
+
+
+def _iter_body(source):
+    """Like parse_body, but generates the paragraph objects one by one.
+
+    A paragraph is not generated until the next one has been read,
+    as a dual dialog or synopsis may still modify it until then.
+
+    """
     paragraphs = []
     for blank, input_lines in itertools.groupby(source, _is_blank):
         if not blank:
-            as_string = note_re.sub('', '\n'.join(input_lines))
-            if _is_blank(as_string):
-                continue
-            paragraph = InputParagraph(as_string.split('\n'))
-            paragraph.update_list(paragraphs)
+            _add_paragraph(input_lines, paragraphs)
+            while len(paragraphs) > 1:
+                yield paragraphs.pop(0)
+    yield from paragraphs
+
+
+def _add_paragraph(input_lines, paragraphs):
+    """Parses the lines of one input paragraph and updates the list
+    of paragraph objects accordingly.
+
+    Returns the InputParagraph, or None if there was nothing but notes.
+
+    """
+    paragraph = _input_paragraph(input_lines)
+    if paragraph:
+        paragraph.update_list(paragraphs)
+    return paragraph
+
+
+def _input_paragraph(input_lines):
+    """Creates an InputParagraph from lines with notes removed,
+    or returns None if there was nothing but notes.
+
+    """
+    as_string = note_re.sub('', '\n'.join(input_lines))
+    if _is_blank(as_string):
+        return None
+    return InputParagraph(as_string.split('\n'))
+
+
+def parse_parallel(
+    stream, max_workers=None, chunk_lines=DEFAULT_PARALLEL_CHUNK_LINES
+):
+    """Parses Fountain source using a pool of processes.
+
+    Returns a Screenplay object, the same as `parse` would.
+    `max_workers` is passed to ProcessPoolExecutor.
+
+    """
+    content = stream.read()
+    positions = _SourcePositions()
+    content = positions.remove_boneyard(content)
+    lines = positions.split_lines(content)
+    del content
+    return _parse_lines_parallel(lines, positions, max_workers, chunk_lines)
+
+
+def parse_lines_parallel(
+    source, max_workers=None, chunk_lines=DEFAULT_PARALLEL_CHUNK_LINES
+):
+    """Reads raw text input and parses it using a pool of processes.
+
+    The body of the screenplay is split into chunks of at least
+    `chunk_lines` lines at blank lines, and the chunks are parsed
+    in separate processes.
+
+    Returns a Screenplay object, the same as `parse_lines` would.
+
+    """
+    positions = _SourcePositions()
+    return _parse_lines_parallel(
+        positions.record_lines(source), positions, max_workers, chunk_lines
+    )
+
+
+def _parse_lines_parallel(source, positions, max_workers, chunk_lines):
+    title_page, body, body_start = _split_title_page(source)
+    chunks = _split_chunks(list(body), chunk_lines)
+    body_parser = _BodyParser()
+    if len(chunks) < 2:
+        body_parser.parse(itertools.chain(*chunks))
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            chunk_start = 0
+            for chunk, (head, chunk_parser) in zip(
+                chunks, executor.map(_parse_chunk, chunks)
+            ):
+                # The first input paragraphs of a chunk may modify the
+                # last paragraph of the previous chunk, so they are
+                # parsed here instead.
+                for line_number, input_lines in head:
+                    body_parser.add(input_lines, chunk_start + line_number)
+                body_parser.extend(chunk_parser, chunk_start)
+                chunk_start += len(chunk)
+    return Screenplay(
+        title_page,
+        body_parser.paragraphs,
+        positions.get_spans(body_parser, body_start)
+    )
+
+
+def _split_chunks(lines, chunk_lines):
+    """Splits a list of lines into chunks at blank lines.
+
+    >>> _split_chunks(['a', 'b', '', 'c', '', 'd'], 1)
+    [['a', 'b'], ['', 'c'], ['', 'd']]
+
+    """
+    chunks = []
+    start = 0
+    while start < len(lines):
+        end = start + chunk_lines
+        while end < len(lines) and not _is_blank(lines[end]):
+            end += 1
+        chunks.append(lines[start:end])
+        start = end
+    return chunks
+
+
+def _parse_chunk(lines):
+    """Parses a chunk of the screenplay body for parse_lines_parallel.
+
+    Returns a tuple of (head, body_parser). `head` is a list of the input
+    paragraphs at the start of the chunk that depend on the paragraph
+    before them, which is in another chunk. They are left unparsed, as
+    tuples of line number and lines.
+    `body_parser` is a _BodyParser that has parsed the rest.
 
-    return paragraphs
+    """
+    head = []
+    body_parser = _BodyParser()
+    line_number = 0
+    for blank, input_lines in itertools.groupby(lines, _is_blank):
+        input_lines = list(input_lines)
+        if blank:
+            pass
+        elif body_parser.paragraphs:
+            body_parser.add(input_lines, line_number)
+        else:
+            paragraph = _input_paragraph(input_lines)
+            if paragraph and paragraph.depends_on_previous():
+                head.append((line_number, input_lines))
+            elif paragraph:
+                body_parser.add(input_lines, line_number)
+        line_number += len(input_lines)
+    return head, body_parser
 
 
 def parse_title_page(lines) -> dict[str, list[str]] | None:
@@ -324,3 +793,354 @@ def parse_title_page(lines) -> dict[str, list[str]] | None:
     except StopIteration:
         pass
     return result
+
+
+class _Block:
+    """A blank-line delimited group of lines in the source
+    that IncrementalParser has parsed.
+
+    The blocks are nodes of a treap, a binary tree that is kept
+    balanced by giving each node a random priority that is lower than
+    its parent's. The tree has the blocks in source order, and each node
+    has the number of lines and paragraphs of its subtree, so the
+    position of a block is the sum of those of the blocks before it.
+    Nothing has to be updated in the blocks after an edit.
+
+    """
+    __slots__ = (
+        'span', 'length', 'paragraphs', 'independent',
+        'priority', 'left', 'right', 'count', 'total_span',
+        'total_paragraphs',
+    )
+
+    def __init__(self, span, length, paragraphs, independent):
+        # Number of lines from the end of the previous block, or the
+        # start of the body, to the end of this block
+        self.span = span
+        # Number of lines in this block
+        self.length = length
+        # Number of paragraph objects this block added
+        self.paragraphs = paragraphs
+        # True if the block created new paragraph objects without
+        # looking at or modifying the ones before it
+        self.independent = independent
+        self.priority = _random()
+        self.left = None
+        self.right = None
+        # Number of blocks, span and paragraphs of the subtree
+        self.count = 1
+        self.total_span = span
+        self.total_paragraphs = paragraphs
+
+
+_random = random.Random().random
+
+
+def _update(block):
+    """Recalculate the totals of a block's subtree from its children."""
+    count = 1
+    span = block.span
+    paragraphs = block.paragraphs
+    left = block.left
+    if left is not None:
+        count += left.count
+        span += left.total_span
+        paragraphs += left.total_paragraphs
+    right = block.right
+    if right is not None:
+        count += right.count
+        span += right.total_span
+        paragraphs += right.total_paragraphs
+    block.count = count
+    block.total_span = span
+    block.total_paragraphs = paragraphs
+
+
+def _split(block, count):
+    """Split a tree into one with the first `count` blocks
+    and one with the rest."""
+    if block is None:
+        return None, None
+    left_count = block.left.count if block.left is not None else 0
+    if count <= left_count:
+        first, block.left = _split(block.left, count)
+        _update(block)
+        return first, block
+    block.right, rest = _split(block.right, count - left_count - 1)
+    _update(block)
+    return block, rest
+
+
+def _merge(first, second):
+    """Join two trees, with the blocks of `first` before those of
+    `second`."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if first.priority > second.priority:
+        first.right = _merge(first.right, second)
+        _update(first)
+        return first
+    second.left = _merge(first, second.left)
+    _update(second)
+    return second
+
+
+def _build(blocks):
+    """Build a tree of a list of blocks in O(n) time."""
+    # The blocks on the right edge of the tree so far
+    edge = []
+    for block in blocks:
+        last = None
+        while edge and edge[-1].priority < block.priority:
+            last = edge.pop()
+        block.left = last
+        if edge:
+            edge[-1].right = block
+        edge.append(block)
+    if not edge:
+        return None
+    _update_all(edge[0])
+    return edge[0]
+
+
+def _update_all(block):
+    if block.left is not None:
+        _update_all(block.left)
+    if block.right is not None:
+        _update_all(block.right)
+    _update(block)
+
+
+def _count_ending_before(block, line):
+    """Count the blocks that end before `line`, counted from the start
+    of the body."""
+    count = 0
+    # Lines before the subtree of `block`
+    offset = 0
+    while block is not None:
+        left = block.left
+        end = offset + block.span
+        if left is not None:
+            end += left.total_span
+        if end < line:
+            count += block.count - (
+                block.right.count if block.right is not None else 0
+            )
+            offset = end
+            block = block.right
+        else:
+            block = left
+    return count
+
+
+def _count_starting_before(block, line):
+    """Count the blocks that start at or before `line`, counted from the
+    start of the body."""
+    count = 0
+    offset = 0
+    while block is not None:
+        left = block.left
+        end = offset + block.span
+        if left is not None:
+            end += left.total_span
+        if end - block.length <= line:
+            count += block.count - (
+                block.right.count if block.right is not None else 0
+            )
+            offset = end
+            block = block.right
+        else:
+            block = left
+    return count
+
+
+def _find(block, index):
+    """Get the block at `index`, the line after it, counted from the
+    start of the body, and the index of its first paragraph."""
+    span = 0
+    paragraphs = 0
+    while True:
+        left = block.left
+        left_count = left.count if left is not None else 0
+        if index < left_count:
+            block = left
+            continue
+        if left is not None:
+            span += left.total_span
+            paragraphs += left.total_paragraphs
+        if index == left_count:
+            return block, span + block.span, paragraphs
+        span += block.span
+        paragraphs += block.paragraphs
+        index -= left_count + 1
+        block = block.right
+
+
+def _add_to_first_span(block, delta):
+    """Add `delta` to the span of the first block of a tree."""
+    while block is not None:
+        block.total_span += delta
+        if block.left is None:
+            block.span += delta
+            return
+        block = block.left
+
+
+class IncrementalParser:
+    """Keeps a parsed screenplay up to date while its source is edited.
+
+    E.g.
+
+    >>> parser = IncrementalParser([
+    ...     'INT. HOUSE - DAY', '', 'Hello.', '', 'Goodbye.'
+    ... ])
+    >>> parser.edit(4, 5, ['Goodbye, then.'])
+    range(1, 3)
+    >>> parser.screenplay.paragraphs[2].lines
+    [(plain)('Goodbye, then.')]
+
+    """
+
+    def __init__(self, source):
+        """Parses the lines in `source`, like parse_lines does.
+
+        The result is available in the `screenplay` attribute.
+
+        """
+        self.lines = [_preprocess_line(line) for line in source]
+        self.screenplay = Screenplay()
+        self._parse_all()
+
+    def edit(self, start, end, lines):
+        """Replaces source lines `start` to `end` (exclusive) with `lines`.
+
+        Only the blocks of lines around the edit are parsed again.
+        The blocks are kept in a balanced tree, so finding them and
+        moving the ones after the edit takes O(log n) time for n blocks,
+        and the rest of the time depends on the size of the edit.
+        The lists of lines and paragraphs are updated with slice
+        assignment, which moves the references after the edit, but
+        that is a fast memory move. An edit of the title page means
+        it has to be parsed from the beginning, though.
+
+        The paragraph objects in `screenplay.paragraphs` are updated.
+        Returns the range of indices of the paragraphs that were
+        created. Paragraphs before the range are unchanged, and the ones
+        after it are unchanged but may have been shifted.
+
+        """
+        lines = [_preprocess_line(line) for line in lines]
+        if start <= self._title_end:
+            self.lines[start:end] = lines
+            self._parse_all()
+            return range(len(self.screenplay.paragraphs))
+
+        root = self._blocks
+        body_start = self._body_start
+        block_count = root.count if root is not None else 0
+        # First and last+1 blocks touched by the edit.
+        # A block just next to the edit can be joined with the new lines.
+        first = _count_ending_before(root, start - body_start)
+        last = _count_starting_before(root, end - body_start)
+
+        # Expand the range of blocks so it starts with a block before the
+        # edit that does not depend on the one before it, or the start of
+        # the body, and ends before such a block.
+        first -= 1
+        while first >= 0 and not _find(root, first)[0].independent:
+            first -= 1
+        while last < block_count and not _find(root, last)[0].independent:
+            last += 1
+
+        if first >= 0:
+            block, block_end, paragraph_start = _find(root, first)
+            line_start = body_start + block_end - block.length
+            # The end of the block before it
+            previous_end = body_start + block_end - block.span
+        else:
+            first = 0
+            line_start = previous_end = body_start
+            paragraph_start = 0
+        if last < block_count:
+            following, block_end, paragraph_end = _find(root, last)
+            line_end = body_start + block_end - following.length
+        else:
+            following = None
+            line_end = len(self.lines)
+            paragraph_end = len(self.screenplay.paragraphs)
+
+        self.lines[start:end] = lines
+        line_delta = len(lines) - (end - start)
+        new_paragraphs = []
+        new_blocks, new_end = self._parse_blocks(
+            line_start, line_end + line_delta, new_paragraphs, previous_end
+        )
+
+        self.screenplay.paragraphs[paragraph_start:paragraph_end] = (
+            new_paragraphs
+        )
+        self.screenplay.invalidate_index()
+
+        before, rest = _split(root, first)
+        _, after = _split(rest, last - first)
+        if following is not None:
+            # The block after the new ones now follows another block
+            _add_to_first_span(
+                after,
+                line_end + line_delta + following.length - new_end -
+                following.span
+            )
+        self._blocks = _merge(_merge(before, _build(new_blocks)), after)
+
+        return range(paragraph_start, paragraph_start + len(new_paragraphs))
+
+    def _parse_all(self):
+        try:
+            self._title_end = self.lines.index('')
+        except ValueError:
+            self._title_end = len(self.lines)
+        title_page = parse_title_page(self.lines[:self._title_end])
+        if title_page:
+            self._body_start = self._title_end + 1
+        else:
+            title_page = {}
+            self._body_start = 0
+
+        paragraphs = []
+        blocks, _ = self._parse_blocks(
+            self._body_start, len(self.lines), paragraphs, self._body_start
+        )
+        self._blocks = _build(blocks)
+        self.screenplay.title_page = title_page
+        self.screenplay.paragraphs = paragraphs
+
+    def _parse_blocks(self, start, end, paragraphs, previous_end):
+        """Parses the source lines from `start` to `end` (exclusive)
+        and appends the paragraph objects to `paragraphs`.
+        `previous_end` is the line where the block before them ends,
+        or the start of the body.
+
+        Returns a list of _Block objects, and the line where the last
+        of them ends.
+
+        """
+        blocks = []
+        line_number = start
+        for blank, input_lines in itertools.groupby(
+            self.lines[start:end], _is_blank
+        ):
+            input_lines = list(input_lines)
+            length = len(input_lines)
+            if not blank:
+                count = len(paragraphs)
+                paragraph = _add_paragraph(input_lines, paragraphs)
+                blocks.append(_Block(
+                    line_number + length - previous_end, length,
+                    len(paragraphs) - count,
+                    bool(paragraph) and not paragraph.depends_on_previous()
+                ))
+                previous_end = line_number + length
+            line_number += length
+        return blocks, previous_end
@@ -3,9 +3,12 @@
 # http://www.opensource.org/licenses/mit-license.php
 
 import re
+from functools import lru_cache
 from html import escape as html_escape
 
-_magic_re = re.compile('[\ue700-\ue705]')
+# The number of different source strings whose result parse_emphasis
+# remembers.
+EMPHASIS_CACHE_SIZE = 4096
 
 
 def _escape(s):
@@ -18,11 +21,53 @@ def _escape(s):
     return encoded.decode('ascii')
 
 
+_spaces_re = re.compile('  +')  # at least two spaces
+
+
+def _is_plain_html(text):
+    """Checks if a string is written the same way in HTML.
+
+    >>> _is_plain_html('INT. HOUSE - DAY')
+    True
+    >>> _is_plain_html('Tom & Jerry')
+    False
+    >>> _is_plain_html('double  space')
+    False
+    """
+    return (
+        text.isascii() and '&' not in text and '<' not in text and
+        '>' not in text and '  ' not in text
+    )
+
+
+def _replace_spaces(match):
+    return '&nbsp;' * (len(match.group(0)) - 1) + ' '
+
+
+def _immutable(self, *args):
+    raise AttributeError(f'{type(self).__name__} objects are immutable')
+
+
 class RichString:
-    """A sequence of segments where each segment can have its own style."""
+    """A sequence of segments where each segment can have its own style.
+
+    RichString objects are immutable and hashable, so the same object
+    can be shared by all paragraphs that have the same text.
+    The HTML and the hash are created the first time they are needed
+    and then kept.
+    """
+
+    __slots__ = ('segments', '_html', '_hash')
 
     def __init__(self, *segments):
-        self.segments = segments
+        _set_segments(self, segments)
+        _set_html(self, None)
+        _set_hash(self, None)
+
+    __setattr__ = __delattr__ = _immutable
+
+    def __reduce__(self):
+        return RichString, self.segments
 
     def __repr__(self):
         if not self.segments:
@@ -55,14 +100,16 @@ class RichString:
         return self.segments[-1].text.endswith(string)
 
     def to_html(self):
-        html = ''.join(seg.to_html() for seg in self.segments)
-        if html.startswith(' '):
-            return '&nbsp;' + html[1:]
-        else:
-            return html
+        html = self._html
+        if html is None:
+            html = ''.join(seg.to_html() for seg in self.segments)
+            if html.startswith(' '):
+                html = '&nbsp;' + html[1:]
+            _set_html(self, html)
+        return html
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             isinstance(other, RichString) and
             self.segments == other.segments
         )
@@ -73,6 +120,13 @@ class RichString:
             self.segments != other.segments
         )
 
+    def __hash__(self):
+        value = self._hash
+        if value is None:
+            value = hash(self.segments)
+            _set_hash(self, value)
+        return value
+
     def __add__(self, other):
         if hasattr(other, 'segments'):
             return RichString(*(self.segments + other.segments))
@@ -81,7 +135,14 @@ class RichString:
 
 
 class Segment:
-    """A piece of a rich string. Has a set of styles."""
+    """A piece of a rich string. Has a set of styles.
+
+    The styles are stored as a bit mask, where each style
+    has its own bit, Style.mask.
+    Segments are immutable and hashable.
+    """
+
+    __slots__ = ('text', 'style_mask')
 
     def __init__(self, text, styles):
         """
@@ -89,8 +150,26 @@ class Segment:
         text is the raw text string, and
         styles is a set of Style subclasses.
         """
-        self.styles = set(styles)
-        self.text = text
+        _set_text(self, text)
+        _set_style_mask(self, _get_style_mask(styles))
+
+    @classmethod
+    def from_mask(cls, text, style_mask):
+        """Creates a segment with the styles in a bit mask."""
+        segment = cls.__new__(cls)
+        _set_text(segment, text)
+        _set_style_mask(segment, style_mask)
+        return segment
+
+    __setattr__ = __delattr__ = _immutable
+
+    def __reduce__(self):
+        return Segment.from_mask, (self.text, self.style_mask)
+
+    @property
+    def styles(self):
+        """The set of Style subclasses of this segment."""
+        return _style_sets[self.style_mask]
 
     def __repr__(self):
         styles = '+'.join(
@@ -104,35 +183,52 @@ class Segment:
     def __eq__(self, other):
         return (
             isinstance(other, Segment) and
-            self.text == other.text and self.styles == other.styles
+            self.text == other.text and self.style_mask == other.style_mask
         )
 
     def __ne__(self, other):
         return (
             not isinstance(other, Segment) or
-            self.text != other.text or self.styles != other.styles
+            self.text != other.text or self.style_mask != other.style_mask
         )
 
+    def __hash__(self):
+        return hash((self.text, self.style_mask))
+
     def get_ordered_styles(self):
         """Get the styles in this segment in a deterministic order."""
-        return [style for style in all_styles if style in self.styles]
+        return _ordered_styles[self.style_mask]
 
     def to_html(self):
+        text = self.text
+        if _is_plain_html(text):
+            html = text
+        else:
+            html = _spaces_re.sub(_replace_spaces, _escape(text))
+        if not self.style_mask:
+            return html
         ordered_styles = self.get_ordered_styles()
         return (
             ''.join(style.start_html for style in ordered_styles) +
-            re.sub(
-                '  +',  # at least two spaces
-                lambda m: '&nbsp;' * (len(m.group(0)) - 1) + ' ',
-                _escape(self.text),
-            ) +
+            html +
             ''.join(style.end_html for style in reversed(ordered_styles))
         )
 
 
+# Setters for slots, which bypass the immutability
+_set_segments = RichString.segments.__set__
+_set_html = RichString._html.__set__
+_set_hash = RichString._hash.__set__
+_set_text = Segment.text.__set__
+_set_style_mask = Segment.style_mask.__set__
+
+
 class Style:
     """Abstract base class for styles"""
 
+    # The bit of this style in Segment.style_mask
+    mask = 0
+
     start_magic = ''
     end_magic = ''
     start_html = ''
@@ -156,6 +252,8 @@ class Italic(Style):
         r'(?!\*)'
     )
 
+    mask = 2
+
     start_magic = '\ue700'
     end_magic = '\ue701'
 
@@ -176,6 +274,8 @@ class Bold(Style):
         r'(?<=\S)\*\*'
     )
 
+    mask = 1
+
     start_magic = '\ue702'
     end_magic = '\ue703'
 
@@ -196,6 +296,8 @@ class Underline(Style):
         r'(?<=\S)_'
     )
 
+    mask = 4
+
     start_magic = '\ue704'
     end_magic = '\ue705'
 
@@ -203,15 +305,28 @@ class Underline(Style):
     end_html = '</u>'
 
 
+def _get_style_mask(styles):
+    """Get the bit mask for a collection of Style subclasses.
+
+    >>> _get_style_mask((Italic, Underline))
+    6
+    """
+    mask = 0
+    for style in styles:
+        mask |= style.mask
+    return mask
+
+
 class _CreateStyledString:
     """Function object that creates a RichString object
     with a single segment with a specified style.
     """
     def __init__(self, styles):
         self.styles = set(styles)
+        self.style_mask = _get_style_mask(styles)
 
     def __call__(self, text):
-        return RichString(Segment(text, self.styles))
+        return RichString(Segment.from_mask(text, self.style_mask))
 
     def __add__(self, other):
         return _CreateStyledString(self.styles.union(other.styles))
@@ -230,6 +345,13 @@ literal_star = '\ue706'
 # All styles. Note: order matters! This is the order they are parsed.
 all_styles = (Bold, Italic, Underline)
 
+# The styles of each possible style mask, in the order of all_styles
+_ordered_styles = tuple(
+    tuple(style for style in all_styles if mask & style.mask)
+    for mask in range(1 << len(all_styles))
+)
+_style_sets = tuple(frozenset(styles) for styles in _ordered_styles)
+
 
 def _unescape(source):
     r"""Converts backslash-escaped stars in a string to the magic
@@ -251,6 +373,7 @@ def _demagic_literals(text):
     return text.replace(literal_star, '*')
 
 
+@lru_cache(maxsize=EMPHASIS_CACHE_SIZE)
 def parse_emphasis(source):
     """Parses emphasis markers like * and ** in a string
     and returns a RichString object.
@@ -261,40 +384,101 @@ def parse_emphasis(source):
     (plain)('plain')
     >>> parse_emphasis('**hello** there')
     (bold)('hello') + (plain)(' there')
+
+    A string without any markers gives a single plain segment.
+    If it is written the same way in HTML, that is stored right away.
+
+    The results of the most recently used source strings are
+    remembered, and the same RichString object is returned for them.
+    parse_emphasis.cache_info() gets the hit rate,
+    and parse_emphasis.__wrapped__ is the function without the cache.
     """
+    if '*' not in source and '_' not in source:
+        # Without stars, escaped stars don't matter either
+        return _plain_string(source)
+    return _parse_markup(source)
+
+
+def _plain_string(source):
+    """Creates a RichString with a single plain segment."""
+    if not source:
+        return RichString()
+    string = RichString(Segment.from_mask(source, 0))
+    if not source.startswith(' ') and _is_plain_html(source):
+        _set_html(string, source)
+    return string
+
+
+def _parse_markup(source):
+    """Parses a string that may contain emphasis markers."""
 
     # Convert escaped characters to magic characters so they aren't parsed
     # as emphasis.
     source = _unescape(source)
 
-    for style in all_styles:
-        source = style.parse_re.sub(
-            style.start_magic + r'\1' + style.end_magic, source
-        )
+    # Find the markers of each style in the order they are parsed.
+    # Each marker is a tuple of (position, length, style, is_start).
+    markers = []
+    for match in Bold.parse_re.finditer(source):
+        start, end = match.span()
+        markers.append((start, 2, Bold, True))
+        markers.append((end - 2, 2, Bold, False))
+
+    # The stars that mark bold text can not be parsed as italic.
+    italic_source = _mask_markers(source, markers) if markers else source
+    for match in Italic.parse_re.finditer(italic_source):
+        start, end = match.span()
+        markers.append((start, 1, Italic, True))
+        markers.append((end - 1, 1, Italic, False))
+
+    # For underlines, stars are just non-space characters whether they
+    # are markers or not, so the source can be used as it is.
+    for match in Underline.parse_re.finditer(source):
+        start, end = match.span()
+        markers.append((start, 1, Underline, True))
+        markers.append((end - 1, 1, Underline, False))
 
     # Convert magic characters back, so they are printable again.
+    # This keeps the positions of the markers.
     source = _demagic_literals(source)
 
-    styles = set()
+    # No two markers have the same position, so the sort order is
+    # the order in the string.
+    markers.sort(key=_marker_position)
+
+    style_mask = 0
     segments = []
     pos = 0
-
-    def append(pos, end):
-        if pos == end:
-            return
-        text = source[pos:end]
-        segments.append(Segment(text, styles))
-
-    for match in _magic_re.finditer(source):
-        end = match.start()
-        append(pos, end)
-        pos = end + 1
-        magic = match.group(0)
-        for style in all_styles:
-            if magic == style.start_magic:
-                styles.add(style)
-            elif magic == style.end_magic:
-                styles.remove(style)
-    append(pos, len(source))
+    for position, length, style, is_start in markers:
+        if pos != position:
+            segments.append(
+                Segment.from_mask(source[pos:position], style_mask)
+            )
+        style_mask ^= style.mask
+        pos = position + length
+    if pos != len(source):
+        segments.append(Segment.from_mask(source[pos:], style_mask))
 
     return RichString(*segments)
+
+
+def _marker_position(marker):
+    return marker[0]
+
+
+def _mask_markers(source, markers):
+    r"""Replaces the characters of style markers in a string with
+    magic characters.
+
+    >>> _mask_markers('**a**', [(0, 2, Bold, True), (3, 2, Bold, False)])
+    '\ue702\ue702a\ue703\ue703'
+    """
+    parts = []
+    pos = 0
+    for position, length, style, is_start in markers:
+        parts.append(source[pos:position])
+        magic = style.start_magic if is_start else style.end_magic
+        parts.append(magic * length)
+        pos = position + length
+    parts.append(source[pos:])
+    return ''.join(parts)
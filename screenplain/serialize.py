@@ -0,0 +1,193 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+"""Compact binary format for Screenplay objects.
+
+The paragraphs are stored the same way as in ColumnarParagraphs:
+a type code per paragraph, and their contents as integers that refer
+to a table of all distinct texts. Style masks are stored as they are.
+
+The file starts with a header (see `_header`), followed by these
+sections, all little-endian:
+
+- the length in characters of each text in the table
+- all the texts, encoded as UTF-8
+- the title page, as integers: number of keys, and for each key the
+  text index of the key, number of values and the index of each value
+- the type code of each paragraph
+- the offset of each paragraph in the paragraph data
+- the paragraph data
+- if the header says so, the four arrays of SourceSpans
+
+"""
+
+import struct
+import sys
+from array import array
+from io import BytesIO
+
+from screenplain.types import ColumnarParagraphs, Screenplay, SourceSpans
+
+# Increase this when the format changes
+FORMAT_VERSION = 1
+
+MAGIC = b'SCRPLN'
+
+# Magic, format version, number of texts, size of the texts in bytes,
+# size of the title page, number of paragraphs, size of the paragraph
+# data, and whether there are source spans.
+_header = struct.Struct('<6sHQQQQQ?')
+
+
+def dump(screenplay, stream):
+    """Writes a Screenplay to a binary stream.
+
+    Raises TypeError if the screenplay contains paragraphs
+    of a type that isn't in screenplain.types.
+
+    """
+    paragraphs = screenplay.paragraphs
+    if not isinstance(paragraphs, ColumnarParagraphs):
+        paragraphs = ColumnarParagraphs(paragraphs)
+    if paragraphs.objects:
+        raise TypeError(
+            'Can not serialize paragraph of type ' +
+            type(paragraphs.objects[0]).__name__
+        )
+
+    # Add the title page to a copy of the text table
+    texts = list(paragraphs.texts)
+    text_indices = {}
+
+    def text_index(text):
+        index = text_indices.get(text)
+        if index is None:
+            index = text_indices[text] = len(texts)
+            texts.append(text)
+        return index
+
+    title_page = array('i', [len(screenplay.title_page)])
+    for key, values in screenplay.title_page.items():
+        title_page.append(text_index(key))
+        title_page.append(len(values))
+        title_page.extend(text_index(value) for value in values)
+
+    text_lengths = array('I', (len(text) for text in texts))
+    text_bytes = ''.join(texts).encode('utf-8', 'surrogatepass')
+    spans = screenplay.spans
+
+    stream.write(_header.pack(
+        MAGIC, FORMAT_VERSION,
+        len(texts), len(text_bytes), len(title_page),
+        len(paragraphs.types), len(paragraphs.data),
+        spans is not None,
+    ))
+    _write_array(stream, text_lengths)
+    stream.write(text_bytes)
+    _write_array(stream, title_page)
+    _write_array(stream, paragraphs.types)
+    _write_array(stream, paragraphs.offsets)
+    _write_array(stream, paragraphs.data)
+    if spans is not None:
+        _write_array(stream, spans.start_lines)
+        _write_array(stream, spans.end_lines)
+        _write_array(stream, spans.start_offsets)
+        _write_array(stream, spans.end_offsets)
+
+
+def load(stream, columnar=False):
+    """Reads a Screenplay written by `dump` from a binary stream.
+
+    If `columnar` is true, the paragraphs of the screenplay are
+    a ColumnarParagraphs object, otherwise they are a list.
+
+    Raises ValueError if the data is not in the right format.
+
+    """
+    header = stream.read(_header.size)
+    if len(header) != _header.size:
+        raise ValueError('Data is truncated')
+    (
+        magic, version,
+        text_count, text_size, title_size,
+        paragraph_count, data_size,
+        has_spans,
+    ) = _header.unpack(header)
+    if magic != MAGIC:
+        raise ValueError('Not a serialized screenplay')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported format version: {version}')
+
+    text_lengths = _read_array(stream, 'I', text_count)
+    text_data = _read(stream, text_size).decode('utf-8', 'surrogatepass')
+    texts = []
+    pos = 0
+    for length in text_lengths:
+        end = pos + length
+        texts.append(text_data[pos:end])
+        pos = end
+
+    title_page = {}
+    title = _read_array(stream, 'i', title_size)
+    pos = 1
+    for _ in range(title[0] if title else 0):
+        key, count = title[pos], title[pos + 1]
+        pos += 2
+        title_page[texts[key]] = [
+            texts[index] for index in title[pos:pos + count]
+        ]
+        pos += count
+
+    paragraphs = ColumnarParagraphs.from_arrays(
+        _read_array(stream, 'B', paragraph_count),
+        _read_array(stream, 'q', paragraph_count),
+        _read_array(stream, 'i', data_size),
+        texts,
+    )
+    if has_spans:
+        spans = SourceSpans()
+        spans.start_lines = _read_array(stream, 'q', paragraph_count)
+        spans.end_lines = _read_array(stream, 'q', paragraph_count)
+        spans.start_offsets = _read_array(stream, 'q', paragraph_count)
+        spans.end_offsets = _read_array(stream, 'q', paragraph_count)
+    else:
+        spans = None
+
+    if not columnar:
+        paragraphs = list(paragraphs)
+    return Screenplay(title_page, paragraphs, spans)
+
+
+def dumps(screenplay):
+    """Serializes a Screenplay to bytes."""
+    stream = BytesIO()
+    dump(screenplay, stream)
+    return stream.getvalue()
+
+
+def loads(data, columnar=False):
+    """Reads a Screenplay from bytes created by `dumps`."""
+    return load(BytesIO(data), columnar)
+
+
+def _write_array(stream, values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    stream.write(values.tobytes())
+
+
+def _read(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError('Data is truncated')
+    return data
+
+
+def _read_array(stream, typecode, count):
+    values = array(typecode)
+    values.frombytes(_read(stream, count * values.itemsize))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
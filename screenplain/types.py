@@ -2,16 +2,65 @@
 # Licensed under the MIT license:
 # http://www.opensource.org/licenses/mit-license.php
 
-from screenplain.richstring import parse_emphasis
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from hashlib import sha1
+
+from screenplain.richstring import RichString, Segment, parse_emphasis
+
+Span = namedtuple('Span', 'start_line end_line start_offset end_offset')
+
+
+class SourceSpans:
+    """Where in the source each paragraph of a screenplay came from.
+
+    The spans are stored as parallel arrays of integers,
+    with one item per paragraph.
+    Line numbers are zero-based, and offsets are character offsets from
+    the start of the source. The ends are exclusive, so `end_line` is the
+    number of the line after the paragraph, and `end_offset` is the offset
+    of the line break after the paragraph.
+    A value of -1 means the position is unknown.
+
+    """
+
+    def __init__(self):
+        self.start_lines = array('q')
+        self.end_lines = array('q')
+        self.start_offsets = array('q')
+        self.end_offsets = array('q')
+
+    def append(self, start_line, end_line, start_offset, end_offset):
+        self.start_lines.append(start_line)
+        self.end_lines.append(end_line)
+        self.start_offsets.append(start_offset)
+        self.end_offsets.append(end_offset)
+
+    def __len__(self):
+        return len(self.start_lines)
+
+    def __getitem__(self, index):
+        """Get the Span of a paragraph, or None if it is unknown."""
+        if self.start_lines[index] < 0:
+            return None
+        return Span(
+            self.start_lines[index],
+            self.end_lines[index],
+            self.start_offsets[index],
+            self.end_offsets[index],
+        )
 
 
 class Screenplay:
-    def __init__(self, title_page=None, paragraphs=None):
+    def __init__(self, title_page=None, paragraphs=None, spans=None):
         """
         Create a Screenplay object.
 
         `title_page` is a dictionary mapping string keys to strings.
         `paragraphs` is a sequence of paragraph objects.
+        `spans` is an optional SourceSpans object with the position in
+        the source of each paragraph.
         """
 
         # Key/value pairs for title page
@@ -26,6 +75,28 @@ class Screenplay:
         else:
             self.paragraphs = paragraphs
 
+        # Source positions of the paragraphs, if known
+        self.spans = spans
+
+        self._index = None
+
+    @property
+    def index(self):
+        """A ScreenplayIndex of the paragraphs.
+
+        It is created the first time it is used. If the paragraphs are
+        changed other than through `append`, `invalidate_index` must be
+        called.
+
+        """
+        if self._index is None:
+            self._index = ScreenplayIndex(self.paragraphs)
+        return self._index
+
+    def invalidate_index(self):
+        """Make `index` be created again the next time it is used."""
+        self._index = None
+
     def get_rich_attribute(self, name, default=[]):
         """Get an attribute from the title page parsed into a RichString.
         Returns a list of RichString objects.
@@ -38,17 +109,197 @@ class Screenplay:
         else:
             return default
 
+    def compact(self):
+        """Store the paragraphs in a ColumnarParagraphs object,
+        which uses much less memory than a list of paragraph objects.
+
+        Paragraph objects are then created each time they are accessed,
+        so changing them has no effect on the screenplay.
+        Paragraphs can still be appended.
+
+        """
+        if not isinstance(self.paragraphs, ColumnarParagraphs):
+            self.paragraphs = ColumnarParagraphs(self.paragraphs)
+
     def append(self, paragraph):
         """Append a paragraph to this screenplay."""
         self.paragraphs.append(paragraph)
+        self._index = None
+        if self.spans is not None:
+            self.spans.append(-1, -1, -1, -1)
 
     def __iter__(self):
         """Get an iterator over the paragraphs of this screenplay."""
         return iter(self.paragraphs)
 
 
+class ScreenplayIndex:
+    """Index of the scenes, sections and characters of a screenplay.
+
+    Scenes and sections are numbered from zero in the order they
+    appear. A paragraph belongs to the last scene heading (Slug)
+    and the last Section before it.
+
+    >>> rich = parse_emphasis
+    >>> index = ScreenplayIndex([
+    ...     Section(rich('Act 1'), 1),
+    ...     Slug(rich('INT. HOUSE')),
+    ...     Dialog(rich('JOHN (V.O.)'), [rich('Hello')]),
+    ...     Section(rich('Act 2'), 1),
+    ...     Slug(rich('EXT. HOUSE')),
+    ... ])
+    >>> index.scene_of(2), index.scene_range(0)
+    (0, (1, 4))
+    >>> index.section_of(4), index.section_range(1)
+    (1, (3, 5))
+    >>> index.lines_of('JOHN')
+    [(plain)('Hello')]
+
+    """
+
+    def __init__(self, paragraphs):
+        self.length = 0
+        # Paragraph index of each scene heading
+        self.scene_starts = array('q')
+        # Paragraph index, level and parent section of each section,
+        # and the index of the paragraph after the section's contents.
+        # The parent of a top level section is -1.
+        self.section_starts = array('q')
+        self.section_levels = array('q')
+        self.section_parents = array('q')
+        self.section_ends = array('q')
+        # Character name -> list of (paragraph index, Dialog),
+        # including both sides of dual dialog
+        self.characters = {}
+
+        open_sections = []
+        for index, paragraph in enumerate(paragraphs):
+            if isinstance(paragraph, Slug):
+                self.scene_starts.append(index)
+            elif isinstance(paragraph, Section):
+                while (
+                    open_sections and
+                    self.section_levels[open_sections[-1]] >= paragraph.level
+                ):
+                    self.section_ends[open_sections.pop()] = index
+                self.section_starts.append(index)
+                self.section_levels.append(paragraph.level)
+                self.section_parents.append(
+                    open_sections[-1] if open_sections else -1
+                )
+                self.section_ends.append(-1)
+                open_sections.append(len(self.section_starts) - 1)
+            elif isinstance(paragraph, Dialog):
+                self._add_dialog(index, paragraph)
+            elif isinstance(paragraph, DualDialog):
+                self._add_dialog(index, paragraph.left)
+                self._add_dialog(index, paragraph.right)
+            self.length = index + 1
+        for section in open_sections:
+            self.section_ends[section] = self.length
+
+    def _add_dialog(self, index, dialog):
+        name = character_name(dialog.character)
+        self.characters.setdefault(name, []).append((index, dialog))
+
+    def scene_of(self, index):
+        """Get the number of the scene of a paragraph,
+        or None if it is before the first scene."""
+        scene = bisect_right(self.scene_starts, index) - 1
+        return scene if scene >= 0 else None
+
+    def scene_range(self, scene):
+        """Get the paragraph indices (start, end) of a scene,
+        including its heading. The end is exclusive."""
+        end = (
+            self.scene_starts[scene + 1]
+            if scene + 1 < len(self.scene_starts) else self.length
+        )
+        return self.scene_starts[scene], end
+
+    def section_of(self, index):
+        """Get the number of the innermost section of a paragraph,
+        or None if it is before the first section."""
+        section = bisect_right(self.section_starts, index) - 1
+        return section if section >= 0 else None
+
+    def section_range(self, section):
+        """Get the paragraph indices (start, end) of a section,
+        including its heading and subsections. The end is exclusive."""
+        return self.section_starts[section], self.section_ends[section]
+
+    def subsections(self, section):
+        """Get the numbers of the sections directly inside a section."""
+        start, end = self.section_range(section)
+        first = bisect_right(self.section_starts, start)
+        last = bisect_right(self.section_starts, end - 1)
+        return [
+            number for number in range(first, last)
+            if self.section_parents[number] == section
+        ]
+
+    def dialogs_of(self, name):
+        """Get a list of (paragraph index, Dialog) for a character."""
+        return self.characters.get(name, [])
+
+    def lines_of(self, name):
+        """Get all lines a character speaks, without parentheticals."""
+        return [
+            line
+            for _, dialog in self.dialogs_of(name)
+            for parenthetical, line in dialog.blocks
+            if not parenthetical
+        ]
+
+
+def character_name(character):
+    """Get the name of a character from a dialog's character line,
+    without extensions like (V.O.).
+
+    >>> character_name(parse_emphasis("JOHN (CONT'D)"))
+    'JOHN'
+    """
+    return str(character).split('(', 1)[0].strip()
+
+
+def _content_hash(kind, *fields):
+    """Get a hexadecimal SHA-1 digest of the type name of a paragraph
+    and its fields, which is the same in every process.
+
+    A field is None, a bool, an int, a str, a RichString, or a tuple or
+    list of fields.
+
+    """
+    parts = [kind]
+    _encode_fields(parts, fields)
+    return sha1('\0'.join(parts).encode()).hexdigest()
+
+
+def _encode_fields(parts, fields):
+    # Each value starts with its kind and, where it varies, its length,
+    # so different values never give the same parts
+    for value in fields:
+        if value is None:
+            parts.append('N')
+        elif isinstance(value, RichString):
+            parts.append(f'R{len(value.segments)}')
+            for segment in value.segments:
+                parts.append(f'{segment.style_mask},{len(segment.text)}')
+                parts.append(segment.text)
+        elif isinstance(value, str):
+            parts.append(f'S{len(value)}')
+            parts.append(value)
+        elif isinstance(value, (bool, int)):
+            parts.append(f'I{value:d}')
+        else:
+            parts.append(f'L{len(value)}')
+            _encode_fields(parts, value)
+
+
 class Slug:
 
+    __slots__ = ('line', 'scene_number', 'synopsis')
+
     def __init__(self, line, scene_number=None):
         """Creates a scene heading (slug).
         The line parameter is a RichString with the slugline.
@@ -64,32 +315,76 @@ class Slug:
         return [self.line]
 
     def set_synopsis(self, text):
+        """Set the synopsis. Only meant for the parser: the hash and
+        content_hash of the slug include the synopsis, so it must not be
+        changed after the slug has been hashed, such as when it has been
+        used as a key in a FragmentCache.
+
+        """
         self.synopsis = text
 
+    def content_hash(self):
+        """Get a SHA-1 digest of the type and contents of the paragraph,
+        as a hexadecimal string. Unlike the hash, it is the same in every
+        process, so it can be stored and compared with later revisions.
+
+        """
+        return _content_hash(
+            'Slug', self.line, self.scene_number, self.synopsis
+        )
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Slug) and
+            self.line == other.line and
+            self.scene_number == other.scene_number and
+            self.synopsis == other.synopsis
+        )
+
+    def __hash__(self):
+        return hash((self.line, self.scene_number, self.synopsis))
+
 
 class Section:
     """A section heading."""
 
+    __slots__ = ('text', 'level', 'synopsis')
+
     def __init__(self, text, level, synopsis=None):
         self.text = text
         self.level = level
         self.synopsis = synopsis
 
     def set_synopsis(self, text):
+        """Set the synopsis. Like Slug.set_synopsis, only meant for
+        the parser."""
         self.synopsis = text
 
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash(
+            'Section', self.text, self.level, self.synopsis
+        )
+
     def __repr__(self):
         return f'Section({self.text!r}, {self.level!r}, {self.synopsis!r})'
 
     def __eq__(self, other):
         return (
+            isinstance(other, Section) and
             self.text == other.text and
             self.level == other.level and
             self.synopsis == other.synopsis
         )
 
+    def __hash__(self):
+        return hash((self.text, self.level, self.synopsis))
+
 
 class Dialog:
+
+    __slots__ = ('character', 'blocks')
+
     def __init__(self, character, lines=None):
         self.character = character
         self.blocks = []  # list of tuples of (is_parenthetical, text)
@@ -109,20 +404,75 @@ class Dialog:
         parenthetical = line.startswith('(')
         self.blocks.append((parenthetical, line))
 
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash('Dialog', self.character, self.blocks)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Dialog) and
+            self.character == other.character and
+            self.blocks == other.blocks
+        )
+
+    def __hash__(self):
+        return hash((self.character, tuple(self.blocks)))
+
 
 class DualDialog:
+
+    __slots__ = ('left', 'right')
+
     def __init__(self, left_dialog, right_dialog):
         self.left = left_dialog
         self.right = right_dialog
 
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash(
+            'DualDialog',
+            (self.left.character, self.left.blocks),
+            (self.right.character, self.right.blocks),
+        )
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, DualDialog) and
+            self.left == other.left and
+            self.right == other.right
+        )
+
+    def __hash__(self):
+        return hash((self.left, self.right))
+
 
 class Action:
+
+    __slots__ = ('lines', 'centered')
+
     def __init__(self, lines, centered=False):
         self.lines = lines
         self.centered = centered
 
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash('Action', self.lines, self.centered)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Action) and
+            self.lines == other.lines and
+            self.centered == other.centered
+        )
+
+    def __hash__(self):
+        return hash((tuple(self.lines), self.centered))
+
 
 class Transition:
+
+    __slots__ = ('line',)
+
     def __init__(self, line):
         self.line = line
 
@@ -130,6 +480,270 @@ class Transition:
     def lines(self):
         return [self.line]
 
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash('Transition', self.line)
+
+    def __eq__(self, other):
+        return isinstance(other, Transition) and self.line == other.line
+
+    def __hash__(self):
+        return hash(self.line)
+
 
 class PageBreak:
-    pass
+
+    __slots__ = ()
+
+    def content_hash(self):
+        """Get a digest of the contents, like Slug.content_hash."""
+        return _content_hash('PageBreak')
+
+    def __eq__(self, other):
+        return isinstance(other, PageBreak)
+
+    def __hash__(self):
+        return hash(PageBreak)
+
+
+class ColumnarParagraphs:
+    """A compact sequence of paragraphs.
+
+    Instead of keeping paragraph objects, each paragraph is stored as a
+    type code and a run of integers in an array. The texts are stored
+    only once each in a pool and referred to by their index in the pool.
+    The paragraph objects are created when they are accessed.
+
+    Paragraphs of types that are not known are kept as they are.
+
+    >>> fade_in = Transition(parse_emphasis('FADE IN:'))
+    >>> paragraphs = ColumnarParagraphs([fade_in])
+    >>> paragraphs.append(Action([parse_emphasis('**Bang**')]))
+    >>> len(paragraphs)
+    2
+    >>> paragraphs[1].lines
+    [(bold)('Bang')]
+
+    """
+
+    def __init__(self, paragraphs=()):
+        # Type code of each paragraph, an index in _encoders and _decoders
+        self.types = array('B')
+        # Index in data where each paragraph starts
+        self.offsets = array('q')
+        self.data = array('i')
+        self.texts = []
+        self._text_indices = {}
+        # Paragraphs of unknown types
+        self.objects = []
+        for paragraph in paragraphs:
+            self.append(paragraph)
+
+    @classmethod
+    def from_arrays(cls, types, offsets, data, texts):
+        """Creates an object from the arrays of another one,
+        e.g. one that has been serialized."""
+        paragraphs = cls()
+        paragraphs.types = types
+        paragraphs.offsets = offsets
+        paragraphs.data = data
+        paragraphs.texts = texts
+        # Created when needed
+        paragraphs._text_indices = None
+        return paragraphs
+
+    def append(self, paragraph):
+        code = _type_codes.get(type(paragraph), _object_code)
+        self.types.append(code)
+        self.offsets.append(len(self.data))
+        _encoders[code](self, paragraph)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        code = self.types[index]
+        return _decoders[code](self, self.offsets[index])[0]
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield _decoders[self.types[index]](self, self.offsets[index])[0]
+
+    def _add_text(self, text):
+        if self._text_indices is None:
+            self._text_indices = {
+                text: index for index, text in enumerate(self.texts)
+            }
+        index = self._text_indices.get(text)
+        if index is None:
+            index = self._text_indices[text] = len(self.texts)
+            self.texts.append(text)
+        self.data.append(index)
+
+    def _add_optional_text(self, text):
+        if text is None:
+            self.data.append(-1)
+        else:
+            self._add_text(text)
+
+    def _add_rich(self, rich):
+        self.data.append(len(rich.segments))
+        for segment in rich.segments:
+            self._add_text(segment.text)
+            self.data.append(segment.style_mask)
+
+    def _add_optional_rich(self, rich):
+        if rich is None:
+            self.data.append(-1)
+        else:
+            self._add_rich(rich)
+
+    def _add_slug(self, slug):
+        self._add_rich(slug.line)
+        self._add_optional_rich(slug.scene_number)
+        self._add_optional_text(slug.synopsis)
+
+    def _add_section(self, section):
+        self._add_rich(section.text)
+        self.data.append(section.level)
+        self._add_optional_text(section.synopsis)
+
+    def _add_dialog(self, dialog):
+        self._add_rich(dialog.character)
+        self.data.append(len(dialog.blocks))
+        for parenthetical, line in dialog.blocks:
+            self.data.append(parenthetical)
+            self._add_rich(line)
+
+    def _add_dual_dialog(self, dual):
+        self._add_dialog(dual.left)
+        self._add_dialog(dual.right)
+
+    def _add_action(self, action):
+        self.data.append(action.centered)
+        self.data.append(len(action.lines))
+        for line in action.lines:
+            self._add_rich(line)
+
+    def _add_transition(self, transition):
+        self._add_rich(transition.line)
+
+    def _add_page_break(self, page_break):
+        pass
+
+    def _add_object(self, paragraph):
+        self.data.append(len(self.objects))
+        self.objects.append(paragraph)
+
+    # The _get methods decode what the corresponding _add method encoded
+    # and return a tuple of (value, offset after the value).
+
+    def _get_optional_text(self, offset):
+        index = self.data[offset]
+        return (None if index < 0 else self.texts[index]), offset + 1
+
+    def _get_rich(self, offset):
+        data = self.data
+        texts = self.texts
+        count = data[offset]
+        if count == 1:
+            # The most common case, without the loop
+            segment = Segment.from_mask(
+                texts[data[offset + 1]], data[offset + 2]
+            )
+            return RichString(segment), offset + 3
+        end = offset + 1 + 2 * count
+        return RichString(*[
+            Segment.from_mask(texts[data[i]], data[i + 1])
+            for i in range(offset + 1, end, 2)
+        ]), end
+
+    def _get_optional_rich(self, offset):
+        if self.data[offset] < 0:
+            return None, offset + 1
+        return self._get_rich(offset)
+
+    def _get_slug(self, offset):
+        line, offset = self._get_rich(offset)
+        scene_number, offset = self._get_optional_rich(offset)
+        slug = Slug(line, scene_number)
+        slug.synopsis, offset = self._get_optional_text(offset)
+        return slug, offset
+
+    def _get_section(self, offset):
+        text, offset = self._get_rich(offset)
+        level = self.data[offset]
+        synopsis, offset = self._get_optional_text(offset + 1)
+        return Section(text, level, synopsis), offset
+
+    def _get_dialog(self, offset):
+        character, offset = self._get_rich(offset)
+        dialog = Dialog(character)
+        count = self.data[offset]
+        offset += 1
+        for _ in range(count):
+            parenthetical = bool(self.data[offset])
+            line, offset = self._get_rich(offset + 1)
+            dialog.blocks.append((parenthetical, line))
+        return dialog, offset
+
+    def _get_dual_dialog(self, offset):
+        left, offset = self._get_dialog(offset)
+        right, offset = self._get_dialog(offset)
+        return DualDialog(left, right), offset
+
+    def _get_action(self, offset):
+        centered = bool(self.data[offset])
+        count = self.data[offset + 1]
+        offset += 2
+        lines = []
+        for _ in range(count):
+            line, offset = self._get_rich(offset)
+            lines.append(line)
+        return Action(lines, centered), offset
+
+    def _get_transition(self, offset):
+        line, offset = self._get_rich(offset)
+        return Transition(line), offset
+
+    def _get_page_break(self, offset):
+        return PageBreak(), offset
+
+    def _get_object(self, offset):
+        return self.objects[self.data[offset]], offset + 1
+
+
+_paragraph_types = (
+    (Slug, ColumnarParagraphs._add_slug, ColumnarParagraphs._get_slug),
+    (
+        Section,
+        ColumnarParagraphs._add_section, ColumnarParagraphs._get_section
+    ),
+    (Dialog, ColumnarParagraphs._add_dialog, ColumnarParagraphs._get_dialog),
+    (
+        DualDialog,
+        ColumnarParagraphs._add_dual_dialog,
+        ColumnarParagraphs._get_dual_dialog,
+    ),
+    (Action, ColumnarParagraphs._add_action, ColumnarParagraphs._get_action),
+    (
+        Transition,
+        ColumnarParagraphs._add_transition,
+        ColumnarParagraphs._get_transition,
+    ),
+    (
+        PageBreak,
+        ColumnarParagraphs._add_page_break,
+        ColumnarParagraphs._get_page_break,
+    ),
+    (None, ColumnarParagraphs._add_object, ColumnarParagraphs._get_object),
+)
+_type_codes = {
+    paragraph_type: code
+    for code, (paragraph_type, _, _) in enumerate(_paragraph_types)
+}
+_object_code = len(_paragraph_types) - 1
+_encoders = tuple(encoder for _, encoder, _ in _paragraph_types)
+_decoders = tuple(decoder for _, _, decoder in _paragraph_types)
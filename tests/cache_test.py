@@ -0,0 +1,99 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from screenplain.cache import CACHE_FILE_EXTENSION, ParseCache, get_key
+from screenplain.richstring import plain
+from screenplain.types import Action, Slug
+
+source = (
+    'INT. HOUSE - DAY\n'
+    '\n'
+    'Some action.\n'
+).encode('utf-8')
+
+
+class ParseCacheTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def cache_files(self):
+        return [
+            name for name in os.listdir(self.dir)
+            if name.endswith(CACHE_FILE_EXTENSION)
+        ]
+
+    def test_parse(self):
+        cache = ParseCache()
+        screenplay = cache.parse(source)
+        self.assertEqual(
+            [Slug, Action], [type(p) for p in screenplay.paragraphs]
+        )
+        self.assertEqual(1, cache.misses)
+
+    def test_memory_hit(self):
+        cache = ParseCache()
+        first = cache.parse(source)
+        second = cache.parse(source)
+        self.assertIs(first, second)
+        self.assertEqual((1, 0, 1), (
+            cache.memory_hits, cache.disk_hits, cache.misses
+        ))
+
+    def test_memory_is_bounded(self):
+        cache = ParseCache(max_entries=2)
+        cache.parse(b'One')
+        cache.parse(b'Two')
+        cache.parse(b'Three')
+        cache.parse(b'One')
+        self.assertEqual(4, cache.misses)
+        cache.parse(b'Three')
+        self.assertEqual(1, cache.memory_hits)
+
+    def test_disk_hit_in_other_cache(self):
+        ParseCache(directory=self.dir).parse(source)
+        cache = ParseCache(directory=self.dir)
+        screenplay = cache.parse(source)
+        self.assertEqual((0, 1, 0), (
+            cache.memory_hits, cache.disk_hits, cache.misses
+        ))
+        self.assertEqual(
+            [plain('Some action.')], screenplay.paragraphs[1].lines
+        )
+
+    def test_encoding_is_part_of_key(self):
+        self.assertNotEqual(
+            get_key(source, 'utf-8', 'strict'),
+            get_key(source, 'latin-1', 'strict')
+        )
+
+    def test_corrupt_file_is_a_miss(self):
+        ParseCache(directory=self.dir).parse(source)
+        [name] = self.cache_files()
+        with open(os.path.join(self.dir, name), 'wb') as stream:
+            stream.write(b'garbage')
+        cache = ParseCache(directory=self.dir)
+        cache.parse(source)
+        self.assertEqual(1, cache.misses)
+
+    def test_least_recently_used_files_are_evicted(self):
+        cache = ParseCache(directory=self.dir)
+        cache.parse(b'One')
+        [name] = self.cache_files()
+        size = os.path.getsize(os.path.join(self.dir, name))
+        os.utime(os.path.join(self.dir, name), (0, 0))
+
+        cache = ParseCache(directory=self.dir, max_disk_size=size * 2 + 20)
+        cache.parse(b'Two')
+        cache.parse(b'Three')
+        self.assertEqual(2, len(self.cache_files()))
+        self.assertNotIn(name, self.cache_files())
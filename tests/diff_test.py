@@ -0,0 +1,194 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+import json
+import os
+import random
+import subprocess
+import sys
+from io import StringIO
+from unittest import TestCase
+
+from screenplain.diff import content_hashes, diff, diff_sequences
+from screenplain.parsers import fountain
+from screenplain.richstring import bold, plain
+from screenplain.types import (
+    Action,
+    Dialog,
+    DualDialog,
+    PageBreak,
+    Screenplay,
+    Section,
+    Slug,
+    Transition,
+)
+from tests.fountain_test import fountain_files, read_file
+
+
+def lcs_length(a, b):
+    """Length of the longest common subsequence, the slow way."""
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(
+                previous[j] + 1 if x == y else max(previous[j + 1], current[j])
+            )
+        previous = current
+    return previous[-1]
+
+
+def apply_opcodes(a, b, opcodes):
+    result = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i, j) == (i1, j1)
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+            result += a[i1:i2]
+        else:
+            result += b[j1:j2]
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return result
+
+
+class DiffSequencesTests(TestCase):
+
+    def test_random_sequences(self):
+        rng = random.Random(99)
+        for _ in range(2000):
+            a = [rng.choice('abc') for _ in range(rng.randint(0, 12))]
+            b = [rng.choice('abc') for _ in range(rng.randint(0, 12))]
+            opcodes = diff_sequences(a, b)
+            self.assertEqual(b, apply_opcodes(a, b, opcodes))
+            equal = sum(
+                i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == 'equal'
+            )
+            self.assertEqual(lcs_length(a, b), equal, (a, b))
+
+    def test_equal(self):
+        self.assertEqual([('equal', 0, 3, 0, 3)], diff_sequences('abc', 'abc'))
+
+    def test_empty(self):
+        self.assertEqual([], diff_sequences('', ''))
+        self.assertEqual([('insert', 0, 0, 0, 2)], diff_sequences('', 'ab'))
+
+
+class ParagraphEqualityTests(TestCase):
+
+    def test_equal_paragraphs_have_equal_hashes(self):
+        def paragraphs():
+            slug = Slug(plain('INT. HOUSE'), plain('1'))
+            slug.set_synopsis('Synopsis')
+            dialog = Dialog(plain('JOHN'), [plain('(sad)'), plain('Hi')])
+            return [
+                slug,
+                Section(plain('Act'), 1, 'Synopsis'),
+                dialog,
+                DualDialog(dialog, Dialog(plain('MARY'), [plain('Ho')])),
+                Action([plain('Line')], centered=True),
+                Transition(plain('CUT TO:')),
+                PageBreak(),
+            ]
+
+        for first, second in zip(paragraphs(), paragraphs()):
+            self.assertEqual(first, second)
+            self.assertEqual(hash(first), hash(second))
+            self.assertEqual(first.content_hash(), second.content_hash())
+        self.assertEqual(7, len(set(paragraphs())))
+        self.assertEqual(7, len(set(content_hashes(paragraphs()))))
+
+    def test_different_paragraphs(self):
+        self.assertNotEqual(
+            Action([plain('Line')]), Action([plain('Line')], centered=True)
+        )
+        self.assertNotEqual(
+            Slug(plain('CUT TO:')), Transition(plain('CUT TO:'))
+        )
+        self.assertNotEqual(Section(plain('A'), 1), Section(plain('A'), 2))
+
+    def test_different_content_hashes(self):
+        for first, second in (
+            (Action([plain('Line')]), Action([plain('Line')], centered=True)),
+            (Slug(plain('CUT TO:')), Transition(plain('CUT TO:'))),
+            (Section(plain('A'), 1), Section(plain('A'), 2)),
+            (Action([plain('ab')]), Action([plain('a'), plain('b')])),
+            (Action([plain('Line')]), Action([bold('Line')])),
+            (Slug(plain('INT. HOUSE')), Slug(plain('INT. HOUSE'), plain(''))),
+        ):
+            self.assertNotEqual(first.content_hash(), second.content_hash())
+
+    def test_content_hashes_are_same_in_other_processes(self):
+        path = fountain_files()[0]
+        expected = content_hashes(fountain.parse(StringIO(read_file(path))))
+        for seed in ('1', '2'):
+            output = subprocess.run(
+                [
+                    sys.executable, '-c',
+                    'import json, sys\n'
+                    'from screenplain.diff import content_hashes\n'
+                    'from screenplain.parsers import fountain\n'
+                    'with open(sys.argv[1], encoding="utf-8-sig") as f:\n'
+                    '    print(json.dumps(content_hashes(fountain.parse(f))))',
+                    path,
+                ],
+                cwd=os.path.dirname(os.path.dirname(__file__)),
+                env=dict(os.environ, PYTHONHASHSEED=seed),
+                capture_output=True, check=True, text=True,
+            ).stdout
+            self.assertEqual(expected, json.loads(output))
+
+
+class ScreenplayDiffTests(TestCase):
+
+    def parse(self, lines):
+        return fountain.parse(StringIO('\n'.join(lines)))
+
+    def test_same_screenplay(self):
+        for path in fountain_files():
+            source = read_file(path)
+            result = diff(
+                fountain.parse(StringIO(source)),
+                fountain.parse(StringIO(source)),
+            )
+            self.assertFalse(result)
+            self.assertEqual([], result.changed)
+
+    def test_changes(self):
+        old = self.parse([
+            'INT. HOUSE - DAY', '',
+            'Some action.', '',
+            'JOHN', 'Hello.', '',
+            'EXT. STREET - NIGHT', '',
+            'More action.', '',
+            'INT. CAR - DAY', '',
+            'Driving.',
+        ])
+        new = self.parse([
+            'INT. HOUSE - DAY', '',
+            'Some action.', '',
+            'JOHN', 'Hello there.', '',
+            'CUT TO:', '',
+            'INT. CAR - DAY', '',
+            'Driving.', '',
+            'INT. BAR - NIGHT', '',
+            'Drinking.',
+        ])
+        result = diff(old, new)
+        self.assertTrue(result)
+        self.assertEqual([(2, 2)], result.changed)
+        self.assertEqual([3, 6, 7], result.inserted)
+        self.assertEqual([3, 4], result.deleted)
+
+        self.assertEqual([(0, 0)], result.changed_scenes)
+        self.assertEqual([2], result.inserted_scenes)
+        self.assertEqual([1], result.deleted_scenes)
+
+    def test_changed_synopsis(self):
+        old = Screenplay(paragraphs=[Slug(plain('INT. HOUSE'))])
+        slug = Slug(plain('INT. HOUSE'))
+        slug.set_synopsis('New synopsis')
+        new = Screenplay(paragraphs=[slug])
+        self.assertEqual([(0, 0)], diff(old, new).changed)
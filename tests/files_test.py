@@ -64,6 +64,33 @@ class FileTests(TestCase):
         expected = read_file(self.source(expected_results_file))
         return clean_string(actual), clean_string(expected)
 
+    def test_cache(self):
+        cache_dir = self.target('cache')
+        for _ in range(2):
+            actual, expected = self.convert(
+                'simple.fountain', 'simple.html', 'simple.html',
+                '--bare', '--cache', cache_dir
+            )
+            self.assertMultiLineEqual(expected, actual)
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+
+    def test_css_url(self):
+        main([
+            '--css-url', 'screenplay.css',
+            self.source('simple.fountain'), self.target('simple.html'),
+        ])
+        html = read_file(self.target('simple.html'))
+        self.assertIn('href="screenplay.css"', html)
+        self.assertNotIn('<style', html)
+
+    def test_split_scenes(self):
+        main([
+            '--split-scenes',
+            self.source('simple.fountain'), self.target('scenes'),
+        ])
+        manifest = os.path.join(self.target('scenes'), 'manifest.json')
+        self.assertTrue(os.path.exists(manifest))
+
     @classmethod
     def add_file_case(cls, source_file, expected_results_file):
         """Add a test case that compares the content
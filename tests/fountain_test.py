@@ -2,9 +2,13 @@
 # Licensed under the MIT license:
 # http://www.opensource.org/licenses/mit-license.php
 
+import glob
+import os.path
+import random
 from io import StringIO
 from unittest import TestCase
 
+from screenplain.export.html import convert_bare
 from screenplain.parsers import fountain
 from screenplain.richstring import empty_string, italic, plain
 from screenplain.types import (
@@ -18,11 +22,33 @@ from screenplain.types import (
 )
 
 
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 def parse(lines):
     content = '\n'.join(lines)
     return list(fountain.parse(StringIO(content)))
 
 
+def fountain_files():
+    """Paths of all the Fountain files in the test files and examples."""
+    return sorted(
+        glob.glob(os.path.join(root_dir, 'tests', 'files', '*.fountain')) +
+        glob.glob(os.path.join(root_dir, 'examples', '*.fountain'))
+    )
+
+
+def read_file(path):
+    with open(path, encoding='utf-8-sig') as stream:
+        return stream.read()
+
+
+def to_html(paragraphs):
+    out = StringIO()
+    convert_bare(paragraphs, out)
+    return out.getvalue()
+
+
 class SlugTests(TestCase):
     def test_slug_with_prefix(self):
         paras = parse([
@@ -80,6 +106,13 @@ class SlugTests(TestCase):
         self.assertEqual(Action, type(paras[0]))
         self.assertEqual(plain('..AND THEN...'), paras[0].lines[0])
 
+    def test_lower_case_slug(self):
+        paras = parse([
+            'int. somewhere - day',
+        ])
+        self.assertEqual([Slug], [type(p) for p in paras])
+        self.assertEqual(plain('INT. SOMEWHERE - DAY'), paras[0].line)
+
     def test_scene_number_is_parsed(self):
         paras = parse(['EXT SOMEWHERE - DAY #42#'])
         self.assertEqual(plain('EXT SOMEWHERE - DAY'), paras[0].line)
@@ -415,6 +448,14 @@ class ActionTests(TestCase):
         self.assertFalse(paras[0].centered)
         self.assertEqual([plain(line) for line in lines], paras[0].lines)
 
+    def test_centered_line_with_leading_whitespace(self):
+        paras = parse([
+            '  > THE END <',
+        ])
+        self.assertEqual([Action], [type(p) for p in paras])
+        self.assertTrue(paras[0].centered)
+        self.assertEqual([plain('THE END')], paras[0].lines)
+
 
 class SynopsisTests(TestCase):
     def test_synopsis_after_slug_adds_synopsis_to_scene(self):
@@ -454,6 +495,15 @@ class SynopsisTests(TestCase):
             paras[1].lines
         )
 
+    def test_synopsis_syntax_without_target_may_be_transition(self):
+        paras = parse([
+            'Some action',
+            '',
+            '=CUT TO:'
+        ])
+        self.assertEqual([Action, Transition], [type(p) for p in paras])
+        self.assertEqual(plain('=CUT TO:'), paras[1].line)
+
 
 class TitlePageTests(TestCase):
 
@@ -545,3 +595,328 @@ class PageBreakTests(TestCase):
             'So here we go'
         ])
         self.assertEqual([PageBreak, Action], [type(p) for p in paras])
+
+
+class StreamingTests(TestCase):
+
+    def test_same_result_as_parse(self):
+        for path in fountain_files():
+            content = read_file(path)
+            expected = to_html(fountain.parse(StringIO(content)))
+            for chunk_size in (1, 7, fountain.DEFAULT_CHUNK_SIZE):
+                actual = to_html(fountain.iter_paragraphs(
+                    StringIO(content), chunk_size=chunk_size
+                ))
+                self.assertEqual(expected, actual, (path, chunk_size))
+
+    def test_title_page_is_skipped(self):
+        paras = list(fountain.iter_paragraphs(StringIO(
+            'Title: Big Fish\n'
+            '\n'
+            'Some action'
+        )))
+        self.assertEqual([Action], [type(p) for p in paras])
+
+    def test_boneyard_spanning_chunks(self):
+        paras = list(fountain.iter_paragraphs(StringIO(
+            'One/* boneyard\n'
+            '\n'
+            'text */ two'
+        ), chunk_size=3))
+        self.assertEqual([Action], [type(p) for p in paras])
+        self.assertEqual([plain('One two')], paras[0].lines)
+
+    def test_unterminated_boneyard_is_literal(self):
+        paras = list(fountain.iter_paragraphs(StringIO(
+            'One /* two'
+        ), chunk_size=2))
+        self.assertEqual([plain('One /* two')], paras[0].lines)
+
+    def test_paragraphs_generated_before_end_of_input(self):
+        stream = StringIO(
+            'INT. SOMEWHERE - DAY\n'
+            '\n'
+            'Action\n'
+            '\n' +
+            'More action\n\n' * 1000
+        )
+        paras = fountain.iter_paragraphs(stream, chunk_size=16)
+        self.assertEqual(Slug, type(next(paras)))
+        self.assertEqual(Action, type(next(paras)))
+        self.assertLess(stream.tell(), 100)
+
+    def test_dual_dialog_and_synopsis(self):
+        paras = list(fountain.iter_paragraphs(StringIO(
+            'INT. SOMEWHERE - DAY\n'
+            '\n'
+            '= The synopsis\n'
+            '\n'
+            'BRICK\n'
+            'Fuck retirement.\n'
+            '\n'
+            'STEEL ^\n'
+            'Fuck retirement!\n'
+        ), chunk_size=5))
+        self.assertEqual([Slug, DualDialog], [type(p) for p in paras])
+        self.assertEqual('The synopsis', paras[0].synopsis)
+
+
+class ParallelTests(TestCase):
+
+    def test_same_result_as_parse(self):
+        for path in fountain_files():
+            content = read_file(path)
+            expected = fountain.parse(StringIO(content))
+            actual = fountain.parse_parallel(
+                StringIO(content), max_workers=2, chunk_lines=20
+            )
+            self.assertEqual(expected.title_page, actual.title_page)
+            self.assertEqual(
+                to_html(expected.paragraphs), to_html(actual.paragraphs), path
+            )
+
+    def test_paragraphs_depending_on_previous_chunk(self):
+        lines = [
+            'INT. HOUSE - DAY',
+            '',
+            '= The synopsis',
+            '',
+            'BRICK',
+            'Fuck retirement.',
+            '',
+            'STEEL ^',
+            'Fuck retirement!',
+        ]
+        paras = fountain.parse_lines_parallel(
+            lines, max_workers=2, chunk_lines=1
+        ).paragraphs
+        self.assertEqual([Slug, DualDialog], [type(p) for p in paras])
+        self.assertEqual('The synopsis', paras[0].synopsis)
+
+    def test_boneyard_across_chunks(self):
+        paras = fountain.parse_parallel(StringIO(
+            'One\n'
+            '/*\n'
+            '\n'
+            'Two\n'
+            '\n'
+            '*/\n'
+            '\n'
+            'Three'
+        ), max_workers=2, chunk_lines=1).paragraphs
+        self.assertEqual(
+            [[plain('One')], [plain('Three')]],
+            [p.lines for p in paras]
+        )
+
+
+class SourceSpanTests(TestCase):
+
+    def source_texts(self, content):
+        screenplay = fountain.parse(StringIO(content))
+        return [
+            content[span.start_offset:span.end_offset]
+            for span in (
+                screenplay.spans[i] for i in range(len(screenplay.spans))
+            )
+        ]
+
+    def test_spans(self):
+        screenplay = fountain.parse(StringIO(
+            'INT. HOUSE - DAY\n'
+            '\n'
+            'Some action.\n'
+            'More.\n'
+        ))
+        self.assertEqual(
+            [(0, 1, 0, 16), (2, 4, 18, 36)],
+            [screenplay.spans[0], screenplay.spans[1]]
+        )
+
+    def test_spans_after_title_page(self):
+        screenplay = fountain.parse(StringIO(
+            'Title: Big Fish\r\n'
+            '\r\n'
+            'Some action.'
+        ))
+        self.assertEqual((2, 3, 19, 31), screenplay.spans[0])
+
+    def test_boneyard_is_skipped(self):
+        content = (
+            'One\r\n'
+            '/* x\n'
+            '\n'
+            'y */\r\n'
+            'Two /* three */'
+        )
+        screenplay = fountain.parse(StringIO(content))
+        self.assertEqual((0, 1, 0, 3), screenplay.spans[0])
+        self.assertEqual((4, 5, 17, 21), screenplay.spans[1])
+
+    def test_merged_paragraphs(self):
+        self.assertEqual([
+            'INT. HOUSE - DAY\n\n= Synopsis',
+            'BRICK\nHi.\n\nSTEEL ^\nHo.',
+        ], self.source_texts(
+            'INT. HOUSE - DAY\n'
+            '\n'
+            '= Synopsis\n'
+            '\n'
+            'BRICK\n'
+            'Hi.\n'
+            '\n'
+            'STEEL ^\n'
+            'Ho.\n'
+        ))
+
+    def test_sections_in_one_paragraph(self):
+        self.assertEqual(
+            ['# Act\n= Synopsis', '## Sequence'],
+            self.source_texts('# Act\n= Synopsis\n## Sequence')
+        )
+
+    def test_parse_lines_spans(self):
+        screenplay = fountain.parse_lines(['One\n', '\n', 'Two', '', 'Three'])
+        self.assertEqual((2, 3, 5, 8), screenplay.spans[1])
+        self.assertEqual((4, 5, 10, 15), screenplay.spans[2])
+
+    def test_appended_paragraph_has_no_span(self):
+        screenplay = fountain.parse(StringIO('Some action.'))
+        screenplay.append(PageBreak())
+        self.assertEqual(2, len(screenplay.spans))
+        self.assertIsNone(screenplay.spans[1])
+
+    def test_parallel_spans(self):
+        for path in fountain_files():
+            content = read_file(path)
+            expected = fountain.parse(StringIO(content)).spans
+            actual = fountain.parse_parallel(
+                StringIO(content), max_workers=2, chunk_lines=20
+            ).spans
+            self.assertEqual(
+                [expected[i] for i in range(len(expected))],
+                [actual[i] for i in range(len(actual))],
+                path
+            )
+
+
+class IncrementalParserTests(TestCase):
+
+    fragments = [
+        '', '', '', ' ',
+        'INT. HOUSE - DAY',
+        'Title: Something',
+        'Some action.',
+        'BRICK',
+        'STEEL ^',
+        '(quietly)',
+        'Fuck retirement.',
+        '= A synopsis',
+        '# Act one',
+        'CUT TO:',
+        '===',
+        '> THE END <',
+        'Action [[with a',
+        'note]] in it.',
+    ]
+
+    def assert_same_as_full_parse(self, parser):
+        expected = fountain.parse_lines(parser.lines)
+        self.assertEqual(expected.title_page, parser.screenplay.title_page)
+        self.assertEqual(
+            to_html(expected.paragraphs),
+            to_html(parser.screenplay.paragraphs)
+        )
+
+    def test_random_edits(self):
+        rng = random.Random(4711)
+        for _ in range(50):
+            lines = [rng.choice(self.fragments) for _ in range(30)]
+            parser = fountain.IncrementalParser(lines)
+            self.assert_same_as_full_parse(parser)
+            for _ in range(20):
+                start = rng.randint(0, len(parser.lines))
+                end = rng.randint(start, min(len(parser.lines), start + 3))
+                new_lines = [
+                    rng.choice(self.fragments)
+                    for _ in range(rng.randint(0, 3))
+                ]
+                old = list(parser.screenplay.paragraphs)
+                changed = parser.edit(start, end, new_lines)
+                self.assert_same_as_full_parse(parser)
+
+                new = parser.screenplay.paragraphs
+                after = len(new) - changed.stop
+                for index in range(changed.start):
+                    self.assertIs(old[index], new[index])
+                for index in range(1, after + 1):
+                    self.assertIs(old[-index], new[-index])
+
+    def test_edit_reparses_only_nearby_paragraphs(self):
+        lines = []
+        for number in range(1000):
+            lines += ['INT. HOUSE - DAY', '', f'Action {number}.', '']
+        parser = fountain.IncrementalParser(lines)
+
+        changed = parser.edit(2002, 2003, ['Changed action.'])
+        self.assertEqual(range(1000, 1002), changed)
+        self.assertEqual(
+            [plain('Changed action.')],
+            parser.screenplay.paragraphs[1001].lines
+        )
+
+    def test_blocks_stay_balanced(self):
+        # The blocks are kept in a tree that must stay shallow,
+        # so that an edit does not take longer in a longer script
+        def depth(block):
+            if block is None:
+                return 0
+            return 1 + max(depth(block.left), depth(block.right))
+
+        lines = []
+        for number in range(1000):
+            lines += ['INT. HOUSE - DAY', '', f'Action {number}.', '']
+        parser = fountain.IncrementalParser(lines)
+        for number in range(1000):
+            parser.edit(2, 2, [f'Action {number}.', ''])
+            parser.edit(len(parser.lines), len(parser.lines), ['', 'End.'])
+
+        self.assertEqual(4000, parser._blocks.count)
+        self.assertLess(depth(parser._blocks), 50)
+        self.assertEqual(
+            fountain.parse_lines(parser.lines).paragraphs,
+            parser.screenplay.paragraphs
+        )
+
+    def test_synopsis_added_to_previous_scene(self):
+        parser = fountain.IncrementalParser([
+            'INT. HOUSE - DAY', '', 'Action.'
+        ])
+        changed = parser.edit(1, 1, ['', '= Synopsis'])
+        self.assertEqual(range(0, 2), changed)
+        self.assertEqual('Synopsis', parser.screenplay.paragraphs[0].synopsis)
+        self.assertEqual([Slug, Action], [
+            type(p) for p in parser.screenplay.paragraphs
+        ])
+
+    def test_dual_dialog_created_by_edit(self):
+        parser = fountain.IncrementalParser([
+            'BRICK', 'Fuck retirement.', '', 'STEEL', 'Fuck retirement!'
+        ])
+        parser.edit(3, 4, ['STEEL ^'])
+        self.assertEqual([DualDialog], [
+            type(p) for p in parser.screenplay.paragraphs
+        ])
+
+    def test_edit_invalidates_index(self):
+        parser = fountain.IncrementalParser(['Action.', '', 'Action.'])
+        self.assertEqual(0, len(parser.screenplay.index.scene_starts))
+        parser.edit(2, 3, ['INT. HOUSE - DAY'])
+        self.assertEqual([1], list(parser.screenplay.index.scene_starts))
+
+    def test_edit_of_title_page(self):
+        parser = fountain.IncrementalParser(['Title: Big Fish', '', 'Hello.'])
+        parser.edit(0, 1, ['Title: Small Fish'])
+        self.assertEqual(
+            {'Title': ['Small Fish']}, parser.screenplay.title_page
+        )
@@ -0,0 +1,342 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import TestCase
+
+from screenplain.export.html import (
+    FragmentCache,
+    convert,
+    convert_bare,
+    convert_parallel,
+    convert_scenes,
+    iter_html,
+)
+from screenplain.parsers import fountain
+from screenplain.types import Section
+from tests.fountain_test import fountain_files, read_file
+
+
+class CountingWriter:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+
+def parse_files():
+    for path in fountain_files():
+        yield path, fountain.parse(StringIO(read_file(path)))
+
+
+class ChunkSizeTests(TestCase):
+
+    def test_same_output_for_any_chunk_size(self):
+        for path, screenplay in parse_files():
+            outputs = []
+            for chunk_size in (0, 1, 100, 10 ** 9):
+                out = StringIO()
+                convert(screenplay, out, chunk_size=chunk_size)
+                outputs.append(out.getvalue())
+            self.assertEqual([outputs[0]] * 4, outputs, path)
+
+    def test_number_of_writes(self):
+        for path, screenplay in parse_files():
+            out = CountingWriter()
+            convert(screenplay, out, bare=True, chunk_size=10 ** 9)
+            self.assertLessEqual(len(out.parts), 1, path)
+
+            out = CountingWriter()
+            convert(screenplay, out, bare=True, chunk_size=1000)
+            self.assertTrue(
+                all(len(part) >= 1000 for part in out.parts[:-1]), path
+            )
+
+
+class TrackingStream(StringIO):
+    """Stream that remembers whether it has been read to the end."""
+
+    exhausted = False
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            self.exhausted = True
+        return data
+
+
+class IterHtmlTests(TestCase):
+
+    def test_same_output_as_convert(self):
+        for path, screenplay in parse_files():
+            for bare in (False, True):
+                out = StringIO()
+                convert(screenplay, out, bare=bare)
+                chunks = list(iter_html(screenplay, bare=bare))
+                self.assertTrue(all(isinstance(c, bytes) for c in chunks))
+                self.assertEqual(
+                    out.getvalue(), b''.join(chunks).decode('utf-8'), path
+                )
+
+    def test_chunk_at_each_scene(self):
+        screenplay = fountain.parse(StringIO(
+            'INT. HOUSE\n\nAction.\n\nEXT. HOUSE\n\nMore action.\n'
+        ))
+        chunks = list(iter_html(screenplay, bare=True))
+        self.assertEqual(2, len(chunks))
+        self.assertTrue(all(c.startswith(b'<h6>') for c in chunks))
+
+    def test_chunk_size(self):
+        screenplay = fountain.parse(StringIO('\n\n'.join(
+            f'Action number {number}.' for number in range(100)
+        )))
+        chunks = list(iter_html(screenplay, bare=True, chunk_size=500))
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(len(c) >= 500 for c in chunks[:-1]))
+
+    def test_streaming_parser(self):
+        source = 'INT. HOUSE\n\nAction.\n\n' * 1000
+        stream = TrackingStream(source)
+        chunks = iter_html(
+            fountain.iter_paragraphs(stream, chunk_size=100), bare=True
+        )
+        self.assertEqual(b'<h6>INT. HOUSE</h6>\n', next(chunks)[:20])
+        self.assertFalse(stream.exhausted)
+        rest = b''.join(chunks)
+        self.assertTrue(stream.exhausted)
+        self.assertEqual(999, rest.count(b'<h6>'))
+
+
+class FragmentCacheTests(TestCase):
+
+    def convert(self, screenplay, cache):
+        out = StringIO()
+        convert(screenplay, out, bare=True, fragment_cache=cache)
+        return out.getvalue()
+
+    def test_same_output_as_without_cache(self):
+        cache = FragmentCache()
+        for path, screenplay in parse_files():
+            expected = self.convert(screenplay, None)
+            self.assertEqual(expected, self.convert(screenplay, cache), path)
+            self.assertEqual(expected, self.convert(screenplay, cache), path)
+
+    def test_only_changed_paragraphs_are_converted(self):
+        cache = FragmentCache()
+        self.convert(fountain.parse(StringIO(
+            'INT. HOUSE\n\nOne.\n\nTwo.\n'
+        )), cache)
+        self.assertEqual((0, 3), (cache.hits, cache.misses))
+        html = self.convert(fountain.parse(StringIO(
+            'INT. HOUSE\n\nOne.\n\nThree.\n'
+        )), cache)
+        self.assertEqual((2, 4), (cache.hits, cache.misses))
+        self.assertAlmostEqual(2 / 6, cache.hit_rate)
+        self.assertIn('Three.', html)
+
+    def test_page_break_is_part_of_key(self):
+        cache = FragmentCache()
+        html = self.convert(fountain.parse(StringIO(
+            'One.\n\n===\n\nOne.\n\nOne.\n'
+        )), cache)
+        self.assertEqual(1, html.count('page-break'))
+        self.assertEqual(
+            html, self.convert(fountain.parse(StringIO(
+                'One.\n\n===\n\nOne.\n\nOne.\n'
+            )), None)
+        )
+        self.assertEqual(3, len(cache))
+
+    def test_max_entries(self):
+        cache = FragmentCache(max_entries=2)
+        self.convert(
+            fountain.parse(StringIO('One.\n\nTwo.\n\nThree.')), cache
+        )
+        self.assertEqual(2, len(cache))
+        self.convert(fountain.parse(StringIO('One.')), cache)
+        self.assertEqual(0, cache.hits)
+
+
+class DocumentHeaderTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.css_file = os.path.join(self.dir, 'style.css')
+        self.write_css('body { color: red; }', 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_css(self, css, mtime):
+        with open(self.css_file, 'w', encoding='utf-8') as stream:
+            stream.write(css)
+        os.utime(self.css_file, (mtime, mtime))
+
+    def convert(self, **options):
+        out = StringIO()
+        convert(fountain.parse(StringIO('Action.')), out, **options)
+        return out.getvalue()
+
+    def test_header_is_reused(self):
+        first = self.convert(css_file=self.css_file)
+        self.assertIn('<style type="text/css">body { color: red; }', first)
+        # Same modification time and size: the old CSS is used
+        self.write_css('body { color: 00f; }', 1000)
+        self.assertEqual(first, self.convert(css_file=self.css_file))
+
+    def test_header_is_updated_when_file_changes(self):
+        self.convert(css_file=self.css_file)
+        self.write_css('body { color: blue; }', 2000)
+        self.assertIn(
+            'body { color: blue; }', self.convert(css_file=self.css_file)
+        )
+
+    def test_css_url(self):
+        html = self.convert(css_url='/static/screenplay.css?v=1&a=2')
+        self.assertIn(
+            '<link rel="stylesheet" type="text/css" '
+            'href="/static/screenplay.css?v=1&amp;a=2">',
+            html
+        )
+        self.assertNotIn('<style', html)
+
+
+class ConvertScenesTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def read_fragments(self, manifest):
+        fragments = []
+        for scene in manifest['scenes']:
+            path = os.path.join(self.dir, scene['path'])
+            with open(path, 'rb') as stream:
+                data = stream.read()
+            self.assertEqual(scene['size'], len(data))
+            fragments.append(data.decode('utf-8'))
+        return fragments
+
+    def test_fragments_are_same_as_bare_output(self):
+        for path, screenplay in parse_files():
+            screenplay.paragraphs = [
+                para for para in screenplay if not isinstance(para, Section)
+            ]
+            screenplay.invalidate_index()
+            out = StringIO()
+            convert_bare(screenplay, out)
+            manifest = convert_scenes(screenplay, self.dir)
+            self.assertEqual(
+                out.getvalue(), ''.join(self.read_fragments(manifest)), path
+            )
+
+    def test_manifest(self):
+        screenplay = fountain.parse(StringIO(
+            'Title: Test\n\n'
+            'Before the first scene.\n\n'
+            '# Act One\n\n'
+            '= The beginning\n\n'
+            'INT. HOUSE - DAY #1#\n\n'
+            '= Someone is home\n\n'
+            'Action.\n\n'
+            '## Part\n\n'
+            'EXT. HOUSE - DAY\n\n'
+            '# Act Two\n\n'
+            'INT. CAR - NIGHT\n'
+        ))
+        manifest = convert_scenes(screenplay, self.dir)
+        with open(os.path.join(self.dir, 'manifest.json')) as stream:
+            self.assertEqual(manifest, json.load(stream))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.dir, manifest['stylesheet']))
+        )
+        self.assertEqual(
+            [
+                (None, None, None, None),
+                ('INT. HOUSE - DAY', '1', 'Someone is home', 0),
+                ('EXT. HOUSE - DAY', None, None, 1),
+                ('INT. CAR - NIGHT', None, None, 2),
+            ],
+            [
+                (
+                    scene['slug'], scene['scene_number'],
+                    scene['synopsis'], scene['section'],
+                )
+                for scene in manifest['scenes']
+            ]
+        )
+        self.assertEqual(
+            [
+                ('Act One', 1, 'The beginning', None, [1]),
+                ('Part', 2, None, 0, [2]),
+                ('Act Two', 1, None, None, [3]),
+            ],
+            [
+                (
+                    section['title'], section['level'],
+                    section['synopsis'], section['parent'],
+                    section['scenes'],
+                )
+                for section in manifest['sections']
+            ]
+        )
+        fragments = self.read_fragments(manifest)
+        self.assertIn('Before the first scene.', fragments[0])
+        self.assertIn('Action.', fragments[1])
+        self.assertNotIn('Act One', ''.join(fragments))
+
+
+class ConvertParallelTests(TestCase):
+
+    def test_same_output_as_convert(self):
+        for path, screenplay in parse_files():
+            expected = StringIO()
+            convert(screenplay, expected)
+            actual = StringIO()
+            convert(screenplay, actual, workers=2)
+            self.assertEqual(expected.getvalue(), actual.getvalue(), path)
+
+    def test_page_break_across_jobs(self):
+        screenplay = fountain.parse(StringIO(
+            'One.\n\n===\n\nTwo.\n\n===\n\nThree.\n\nFour.'
+        ))
+        expected = StringIO()
+        convert_bare(screenplay, expected)
+        self.assertEqual(2, expected.getvalue().count('page-break'))
+        for paragraphs_per_job in (1, 2, 3):
+            actual = StringIO()
+            convert_parallel(
+                screenplay, actual, workers=2,
+                paragraphs_per_job=paragraphs_per_job,
+            )
+            self.assertEqual(
+                expected.getvalue(), actual.getvalue(), paragraphs_per_job
+            )
+
+    def test_chunk_size(self):
+        screenplay = fountain.parse(StringIO('\n\n'.join(['Action.'] * 9)))
+        out = CountingWriter()
+        convert_parallel(
+            screenplay, out, workers=2, paragraphs_per_job=2,
+            chunk_size=10 ** 9,
+        )
+        self.assertEqual(1, len(out.parts))
+
+    def test_fragment_cache_is_not_allowed(self):
+        screenplay = fountain.parse(StringIO('Action.'))
+        for bare in (False, True):
+            out = StringIO()
+            with self.assertRaises(ValueError):
+                convert(
+                    screenplay, out, bare=bare,
+                    fragment_cache=FragmentCache(), workers=2,
+                )
+            self.assertEqual('', out.getvalue())
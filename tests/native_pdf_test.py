@@ -0,0 +1,176 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+import os
+import re
+import tempfile
+import zlib
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from screenplain.export import native_pdf, pdf
+from screenplain.export.pagination import Layout, paginate
+from screenplain.main import main
+from screenplain.parsers import fountain
+from tests.fountain_test import read_file
+from tests.pagination_test import examples_dir, reportlab_page_count
+
+
+def parse(source):
+    return fountain.parse(StringIO(source))
+
+
+def read_objects(data):
+    """Get the objects of a PDF file through its cross-reference table."""
+    xref = int(re.findall(rb'startxref\n(\d+)', data)[-1])
+    count = int(re.match(rb'xref\n0 (\d+)\n', data[xref:]).group(1))
+    objects = {}
+    for number, offset in enumerate(re.findall(
+        rb'(\d{10}) 00000 n', data[xref:xref + 20 * (count + 1) + 20]
+    ), 1):
+        offset = int(offset)
+        header = b'%d 0 obj\n' % number
+        assert data[offset:offset + len(header)] == header, number
+        end = data.index(b'\nendobj\n', offset)
+        start = offset + len(header)
+        match = re.match(rb'(<<.*?>>)\nstream\n', data[start:end], re.S)
+        if match:
+            length = int(re.search(rb'/Length (\d+)', match.group(1))[1])
+            stream = data[start + match.end():start + match.end() + length]
+            end = data.index(b'\nendobj\n', start + match.end() + length)
+            if b'/FlateDecode' in match.group(1):
+                stream = zlib.decompress(stream)
+            objects[number] = (match.group(1), stream)
+        else:
+            objects[number] = (data[start:end], None)
+    return objects
+
+
+def to_pdf(screenplay, **kwargs):
+    output = BytesIO()
+    native_pdf.to_pdf(screenplay, output, **kwargs)
+    return output.getvalue()
+
+
+def page_contents(objects):
+    """Get the content stream of each page, in order."""
+    catalog = [d for d, _ in objects.values() if b'/Type /Catalog' in d][0]
+    pages = objects[int(re.search(rb'/Pages (\d+)', catalog)[1])][0]
+    return [
+        objects[int(re.search(
+            rb'/Contents (\d+)', objects[int(kid)][0]
+        )[1])][1]
+        for kid in re.findall(rb'(\d+) 0 R', pages)
+    ]
+
+
+class NativePdfTests(TestCase):
+
+    def test_page_count(self):
+        paths = [
+            os.path.join(examples_dir, name)
+            for name in ('Big-Fish.fountain', 'Brick-and-Steel.fountain')
+        ]
+        for path in paths:
+            screenplay = parse(read_file(path))
+            objects = read_objects(to_pdf(screenplay))
+            self.assertEqual(
+                reportlab_page_count(screenplay),
+                len(page_contents(objects)),
+                path
+            )
+
+    def test_text_placement(self):
+        screenplay = parse(
+            'Title: Test\n\n'
+            'INT. HOUSE - DAY #12#\n\n'
+            'Some _underlined_ text.\n\n'
+            '> THE END <\n\n'
+            'CUT TO:\n\n'
+            '===\n\n'
+            'BOB\nHello.\n'
+        )
+        contents = page_contents(
+            read_objects(to_pdf(screenplay, standard_font=True))
+        )
+        self.assertEqual(3, len(contents))
+        title, first, second = contents
+        self.assertIn(b'/F1 24 Tf 277.2 476 Td (Test) Tj', title)
+        self.assertIn(b'BT /F1 12 Tf 108 708 Td (INT. HOUSE - DAY) Tj', first)
+        # The scene number in both margins
+        self.assertIn(b'BT /F1 12 Tf 54 708 Td (12) Tj ET', first)
+        self.assertIn(b'BT /F1 12 Tf 532.8 708 Td (12) Tj ET', first)
+        self.assertIn(
+            b'BT /F1 12 Tf 108 684 Td (Some ) Tj (underlined) Tj '
+            b'( text.) Tj ET\n144 682.5 m 216 682.5 l S',
+            first
+        )
+        self.assertIn(b'BT /F1 12 Tf 302.4 660 Td (THE END) Tj ET', first)
+        self.assertIn(b'BT /F1 12 Tf 496.8 636 Td (CUT TO:) Tj ET', first)
+        self.assertNotIn(b'(1.)', first)
+        self.assertIn(b'BT /F1 12 Tf 532.8 750 Td (2.) Tj ET', second)
+        self.assertIn(b'BT /F1 12 Tf 244.8 708 Td (BOB) Tj ET', second)
+
+    def test_standard_font(self):
+        screenplay = parse('**Bold** and *italic* ★.\n')
+        objects = read_objects(to_pdf(screenplay, standard_font=True))
+        fonts = b' '.join(
+            re.search(rb'/BaseFont /(\S+)', d)[1]
+            for d, _ in objects.values() if b'/Type /Font' in d
+        )
+        self.assertEqual(
+            b'Courier Courier-Bold Courier-Oblique ZapfDingbats', fonts
+        )
+        # The character that Courier does not have is drawn as a square
+        self.assertIn(b'/F5 12 Tf (n) Tj', page_contents(objects)[0])
+
+    def test_embedded_font_is_subset(self):
+        screenplay = parse('Abc.\n')
+        objects = read_objects(to_pdf(screenplay))
+        fonts = [d for d, _ in objects.values() if b'/Type0' in d]
+        self.assertEqual(1, len(fonts))
+        self.assertRegex(fonts[0], rb'/BaseFont /[A-Z]{6}\+CourierPrime ')
+        font_file = [
+            (d, s) for d, s in objects.values() if b'/Length1' in d
+        ][0]
+        with open(native_pdf.COURIER_PRIME_FILES[0], 'rb') as f:
+            original = f.read()
+        self.assertLess(len(font_file[1]) * 4, len(original))
+        to_unicode = [
+            s for d, s in objects.values()
+            if s and b'beginbfchar' in s
+        ][0]
+        self.assertEqual(
+            4, int(re.search(rb'(\d+) beginbfchar', to_unicode)[1])
+        )
+
+    def test_empty_screenplay(self):
+        objects = read_objects(to_pdf(parse('')))
+        self.assertEqual([b''], page_contents(objects))
+
+    def test_backend_of_to_pdf(self):
+        screenplay = parse(read_file(
+            os.path.join(examples_dir, 'Brick-and-Steel.fountain')
+        ))
+        settings = pdf.Settings(lines_per_page=40)
+        output = BytesIO()
+        pdf.to_pdf(screenplay, output, settings=settings, backend='native')
+        self.assertEqual(
+            paginate(screenplay, Layout.from_settings(settings)).page_count,
+            len(page_contents(read_objects(output.getvalue())))
+        )
+        with self.assertRaises(ValueError):
+            pdf.to_pdf(screenplay, BytesIO(), backend='other')
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'out.pdf')
+            main([
+                '--pdf-backend', 'native', '--standard-font',
+                os.path.join(examples_dir, 'Brick-and-Steel.fountain'),
+                output,
+            ])
+            with open(output, 'rb') as f:
+                objects = read_objects(f.read())
+        self.assertEqual(4, len(page_contents(objects)))
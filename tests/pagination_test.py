@@ -0,0 +1,204 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+import glob
+import os
+from io import BytesIO, StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from reportlab.platypus import Paragraph, Table
+
+from screenplain.export import pdf
+from screenplain.export.pagination import (
+    Block,
+    DualBlock,
+    Layout,
+    Paginator,
+    count_lines,
+    paginate,
+)
+from screenplain.parsers import fountain
+from screenplain.richstring import plain
+from tests.fountain_test import read_file
+
+examples_dir = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'examples'
+)
+
+
+def export_page_count(screenplay, settings=None):
+    """Get the number of pages pdf.to_pdf writes for a screenplay."""
+    docs = []
+
+    def template(*args, **kwargs):
+        docs.append(pdf.DocTemplate(*args, **kwargs))
+        return docs[0]
+
+    pdf.to_pdf(
+        screenplay, BytesIO(), template_constructor=template,
+        settings=settings
+    )
+    return docs[0].page
+
+
+def html_paragraph(lines, style):
+    return Paragraph('<br/>'.join(line.to_html() for line in lines), style)
+
+
+def add_table_dual_dialog(story, dual, settings):
+    column_width = settings.frame_width / 2
+    story.append(Table(
+        [[
+            pdf._dialog_to_flowables(
+                dialog, settings, column_width=column_width
+            )
+            for dialog in (dual.left, dual.right)
+        ]],
+        splitInRow=1,
+        spaceBefore=settings.line_height,
+        colWidths=[column_width, column_width],
+        style=settings.dual_dialog_table_style,
+    ))
+
+
+def reportlab_page_count(screenplay, settings=None):
+    """Get the number of pages of a screenplay laid out by ReportLab
+    alone: like pdf.to_pdf, but with a Paragraph of the HTML of the text
+    instead of RichParagraph, and a Table for dual dialog instead of
+    DualDialogColumns, as those are built on the pagination module.
+
+    """
+    with patch.object(pdf, 'RichParagraph', html_paragraph), \
+            patch.object(pdf, 'add_dual_dialog', add_table_dual_dialog):
+        return export_page_count(screenplay, settings)
+
+
+def parse(source):
+    return fountain.parse(StringIO(source))
+
+
+class PaginationTests(TestCase):
+
+    def test_same_page_count_as_reportlab(self):
+        paths = sorted(glob.glob(os.path.join(examples_dir, '*.fountain')))
+        self.assertTrue(paths)
+        for path in paths:
+            screenplay = parse(read_file(path))
+            page_count = paginate(screenplay).page_count
+            self.assertEqual(
+                reportlab_page_count(screenplay), page_count, path
+            )
+            self.assertEqual(export_page_count(screenplay), page_count, path)
+
+    def test_layout_from_settings(self):
+        settings = pdf.Settings(lines_per_page=40)
+        layout = Layout.from_settings(settings)
+        default = Layout(lines_per_page=40)
+        for a, b in (
+            (default, layout),
+            (default.without_title_page(), layout.without_title_page()),
+        ):
+            for name in (
+                'action', 'centered_action', 'slug', 'transition',
+                'character', 'dialog', 'parenthetical', 'dual_character',
+                'dual_dialog', 'dual_parenthetical',
+            ):
+                self.assertEqual(getattr(a, name), getattr(b, name), name)
+        screenplay = parse(read_file(
+            os.path.join(examples_dir, 'Brick-and-Steel.fountain')
+        ))
+        self.assertEqual(
+            reportlab_page_count(screenplay, settings),
+            paginate(screenplay, layout).page_count
+        )
+
+    def test_count_lines(self):
+        self.assertEqual(2, count_lines([plain('a' * 62)], 61))
+        self.assertEqual(2, count_lines([plain('a ' + 'b' * 60)], 61))
+        self.assertEqual(1, count_lines([plain('a'), plain('')], 61))
+        self.assertEqual(
+            3, count_lines([plain('a'), plain(''), plain('b')], 61)
+        )
+
+    def test_scene_heading_is_kept_with_next(self):
+        screenplay = parse(
+            # 53 lines, so the heading and the action after it do not fit
+            '\n\n'.join(['Action.'] * 27) +
+            '\n\nINT. HOUSE - DAY\n\nAction.'
+        )
+        result = paginate(screenplay)
+        self.assertEqual([2], result.scene_pages)
+        self.assertEqual(reportlab_page_count(screenplay), result.page_count)
+
+    def test_page_break_and_title_page(self):
+        screenplay = parse('Title: Test\n\nOne.\n\n===\n\nTwo.')
+        result = paginate(screenplay)
+        self.assertTrue(result.has_title_page)
+        self.assertEqual([1, 2, 2], list(result.pages))
+        self.assertEqual(3, result.page_count)
+
+    def test_narrow_frame_without_title_page(self):
+        # 60 characters, so each action takes two lines
+        screenplay = parse('\n\n'.join(['Word ' * 11 + 'end.'] * 28))
+        result = paginate(screenplay)
+        self.assertEqual(2, result.page_count)
+        self.assertEqual(reportlab_page_count(screenplay), result.page_count)
+
+    def test_split_at_line_break(self):
+        # The second part of the split action starts with an empty line
+        screenplay = parse(
+            'Title: Test\n\n' +
+            '\n\n'.join(['One.'] * 26) + '\n\n' +
+            '\n'.join(['Line.'] * 10) + '\n\n' +
+            '\n\n'.join(['Two.'] * 24)
+        )
+        result = paginate(screenplay)
+        self.assertEqual(4, result.page_count)
+        self.assertEqual(reportlab_page_count(screenplay), result.page_count)
+
+    def test_empty_dialog_lines(self):
+        # Each empty line of the dialog takes up a line
+        screenplay = parse(
+            'Title: Test\n\nBOB\n' + '\n  \n'.join(['Hi.'] * 28)
+        )
+        result = paginate(screenplay)
+        self.assertEqual(3, result.page_count)
+        self.assertEqual(reportlab_page_count(screenplay), result.page_count)
+
+    def test_split_dual_dialog(self):
+        # The rest of the split dual dialog continues on the same page
+        dialog = 'Word ' * 7
+        screenplay = parse(
+            'Title: Test\n\n' +
+            '\n\n'.join(['One.'] * 26) +
+            f'\n\nANN\n{dialog}\n\nBOB ^\n{dialog}\n\n' +
+            '\n\n'.join(['Two.'] * 27)
+        )
+        result = paginate(screenplay)
+        self.assertEqual(3, result.page_count)
+        self.assertEqual(reportlab_page_count(screenplay), result.page_count)
+
+    def test_paginator_subclass(self):
+        placed = []
+
+        class Recorder(Paginator):
+            def placed(self, item, line):
+                super().placed(item, line)
+                placed.append((type(item), item.index, self.page, line))
+
+        screenplay = parse(
+            'INT. HOUSE - DAY\n\nAction.\n\nANN\nHi.\n\nBOB ^\nHey.'
+        )
+        paragraphs = list(screenplay)
+        pages = [0] * len(paragraphs)
+        Recorder(55, pages).run(
+            paragraphs, Layout().without_title_page()
+        )
+        self.assertEqual([
+            (Block, 0, 1, 0),
+            (Block, 1, 1, 2),
+            (DualBlock, 2, 1, 4),
+        ], placed)
+        self.assertEqual([1, 1, 1], pages)
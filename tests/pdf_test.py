@@ -0,0 +1,316 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+from io import BytesIO
+from unittest import TestCase
+
+from reportlab.lib import fonts as reportlab_fonts
+from reportlab.lib.fonts import tt2ps
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, Table
+
+from screenplain.export.pdf import (
+    DocTemplate,
+    DualDialogColumns,
+    FontRegistry,
+    RichParagraph,
+    Settings,
+    _dialog_to_flowables,
+    _unregister_font,
+    font_registry,
+    get_courier_prime_settings,
+    get_standard_font_settings,
+)
+from screenplain.richstring import bold, italic, plain, underline
+from screenplain.types import Dialog
+
+
+def courier_prime_as(family_name):
+    """Get settings for the Courier Prime files with another name."""
+    font_settings = get_courier_prime_settings()
+    font_settings.family_name = family_name
+    return font_settings
+
+
+class FontRegistryTests(TestCase):
+
+    def setUp(self):
+        self.registry = FontRegistry(max_entries=2)
+
+    def tearDown(self):
+        self.registry.clear()
+
+    def test_fonts_are_loaded_once(self):
+        font_name = Settings().font_name
+        font = pdfmetrics.getFont(font_name)
+        self.assertEqual(font_name, Settings().font_name)
+        self.assertIs(font, pdfmetrics.getFont(font_name))
+        self.assertIn(get_courier_prime_settings(), font_registry)
+
+    def test_custom_font_settings_are_registered(self):
+        font_settings = courier_prime_as('Test Custom')
+        settings = Settings(font_settings=font_settings)
+        self.assertIn(font_settings, font_registry)
+        self.assertTrue(settings.font_name.startswith('Test Custom '))
+        pdfmetrics.getFont(settings.font_name + ' Bold')
+
+    def test_same_family_with_other_files(self):
+        a = courier_prime_as('Test Family')
+        b = courier_prime_as('Test Family')
+        b.file_bold = b.file_normal
+        name_a = self.registry.register(a)
+        name_b = self.registry.register(b)
+        self.assertNotEqual(name_a, name_b)
+        self.assertIn(a, self.registry)
+        self.assertIn(b, self.registry)
+        self.assertIsNot(
+            pdfmetrics.getFont(name_a + ' Bold'),
+            pdfmetrics.getFont(name_b + ' Bold'),
+        )
+
+    def test_fonts_are_registered_as_plain_family_name(self):
+        a = courier_prime_as('Test Plain')
+        b = courier_prime_as('Test Plain')
+        b.file_bold = b.file_normal
+        self.registry.register(a)
+        self.registry.register(b)
+        self.assertIs(
+            pdfmetrics.getFont(self.registry.register(a) + ' Bold'),
+            pdfmetrics.getFont('Test Plain Bold'),
+        )
+        self.assertEqual('Test Plain Bold', tt2ps('Test Plain', 1, 0))
+        self.registry.clear()
+        self.assertNotIn('Test Plain', pdfmetrics.getRegisteredFontNames())
+        self.registry.register(b)
+        self.assertIs(
+            pdfmetrics.getFont(self.registry.register(b) + ' Bold'),
+            pdfmetrics.getFont('Test Plain Bold'),
+        )
+
+    def test_least_recently_used_is_unregistered(self):
+        a, b, c = (
+            courier_prime_as(name) for name in ('Test A', 'Test B', 'Test C')
+        )
+        self.registry.register(a)
+        name_b = self.registry.register(b)
+        self.registry.register(a)
+        name_c = self.registry.register(c)
+        self.assertEqual(2, len(self.registry))
+        self.assertIn(a, self.registry)
+        self.assertNotIn(b, self.registry)
+        self.assertNotIn(name_b, pdfmetrics.getRegisteredFontNames())
+        self.assertIn(name_c, pdfmetrics.getRegisteredFontNames())
+
+    def test_fonts_in_use_are_not_unregistered(self):
+        a, b, c = (
+            courier_prime_as(name) for name in ('Test D', 'Test E', 'Test F')
+        )
+        with self.registry.use(a) as name_a:
+            self.registry.register(b)
+            self.registry.register(c)
+            self.assertIn(a, self.registry)
+            self.assertIn(name_a, pdfmetrics.getRegisteredFontNames())
+            self.registry.clear()
+            self.assertIn(a, self.registry)
+        self.registry.register(b)
+        self.registry.register(c)
+        self.assertNotIn(a, self.registry)
+
+    def test_clear(self):
+        font_settings = courier_prime_as('Test Clear')
+        font_name = self.registry.register(font_settings)
+        self.registry.clear()
+        self.assertEqual(0, len(self.registry))
+        self.assertNotIn(
+            font_name + ' Italic', pdfmetrics.getRegisteredFontNames()
+        )
+
+    def test_unregistered_fonts_are_removed_from_reportlab(self):
+        registry = FontRegistry(max_entries=1)
+
+        def sizes():
+            return [
+                len(dictionary) for dictionary in (
+                    pdfmetrics._fonts, pdfmetrics._dynFaceNames,
+                    reportlab_fonts._tt2ps_map, reportlab_fonts._ps2tt_map,
+                )
+            ]
+
+        try:
+            registry.register(courier_prime_as('Test Growth'))
+            before = sizes()
+            for number in range(20):
+                registry.register(courier_prime_as(f'Test Growth {number}'))
+            self.assertEqual(before, sizes())
+            self.assertEqual(1, len(registry))
+        finally:
+            registry.clear()
+
+    def test_unregister_font(self):
+        # Fails if ReportLab keeps its fonts in other places than the ones
+        # _unregister_font changes
+        font = TTFont(
+            'Test Unregister', get_courier_prime_settings().file_normal
+        )
+        face_name = font.face.name
+        face_font = pdfmetrics._dynFaceNames.pop(face_name, None)
+        try:
+            pdfmetrics.registerFont(font)
+            self.assertIs(font, pdfmetrics._fonts['Test Unregister'])
+            self.assertIs(font, pdfmetrics._dynFaceNames[face_name])
+            _unregister_font('Test Unregister')
+            self.assertNotIn(
+                'Test Unregister', pdfmetrics.getRegisteredFontNames()
+            )
+            self.assertNotIn(face_name, pdfmetrics._dynFaceNames)
+        finally:
+            if face_font is not None:
+                pdfmetrics._dynFaceNames[face_name] = face_font
+
+
+def html_paragraph(lines, style):
+    return Paragraph('<br/>'.join(line.to_html() for line in lines), style)
+
+
+class RichParagraphTests(TestCase):
+
+    def setUp(self):
+        self.settings = Settings()
+        self.lines = [
+            [plain('')],
+            [plain('Short.')],
+            [plain('Some words ' * 30)],
+            [plain('  Spaces   between  words ' * 10)],
+            [plain('A'), plain(''), plain('B ' * 40), plain('')],
+            [plain('Long ' + 'x' * 50 + ' word')],
+            [plain('Wide \u2605 character ' * 4)],
+            [bold('Bold') + plain(' and ' * 20)],
+        ]
+
+    def assertSameHeight(self, lines, style, width):
+        expected = html_paragraph(lines, style).wrap(width, 1000)[1]
+        actual = RichParagraph(lines, style).wrap(width, 1000)[1]
+        self.assertEqual(expected, actual, [str(line) for line in lines])
+
+    def test_height_is_same_as_paragraph(self):
+        settings = self.settings
+        for lines in self.lines:
+            for style in (
+                settings.action_style, settings.dialog_style,
+                settings.transition_style, settings.parenthentical_style,
+            ):
+                self.assertSameHeight(lines, style, settings.frame_width)
+            self.assertSameHeight(
+                lines, settings.dialog_style, settings.frame_width / 2
+            )
+
+    def test_split_is_same_as_paragraph(self):
+        settings = self.settings
+        lines = [plain('A'), plain(''), plain('B ' * 100), plain('C')]
+        width = settings.frame_width
+        style = settings.action_style
+        for height in range(0, 120, 6):
+            expected = [
+                part.wrap(width, 1000)[1]
+                for part in html_paragraph(lines, style).split(width, height)
+            ]
+            actual = [
+                part.wrap(width, 1000)[1]
+                for part in RichParagraph(lines, style).split(width, height)
+            ]
+            self.assertEqual(expected, actual, height)
+
+    def test_spacing_from_style(self):
+        slug = RichParagraph([plain('INT. HOUSE')], self.settings.slug_style)
+        self.assertEqual(self.settings.line_height, slug.getSpaceBefore())
+        self.assertEqual(self.settings.line_height, slug.getSpaceAfter())
+        self.assertTrue(slug.getKeepWithNext())
+        dialog = RichParagraph([plain('Hi.')], self.settings.dialog_style)
+        self.assertFalse(dialog.getKeepWithNext())
+
+    def test_draw_with_font_variants(self):
+        settings = Settings(font_settings=get_standard_font_settings())
+        line = (
+            bold('Bold') + plain(' ') + italic('italic') + plain(' ') +
+            underline('under')
+        )
+        output = BytesIO()
+        DocTemplate(output, settings=settings, pageCompression=0).build([
+            RichParagraph([line], settings.action_style)
+        ])
+        data = output.getvalue()
+        for font in (b'Courier-Bold', b'Courier-Oblique'):
+            self.assertIn(b'/BaseFont /' + font, data)
+        self.assertIn(b'(under) Tj', data)
+        # The underline, 1/8 of the font size below the baseline
+        self.assertIn(b'86.4 -1.5 m 122.4 -1.5 l', data)
+
+
+class DualDialogColumnsTests(TestCase):
+
+    def setUp(self):
+        self.settings = Settings()
+        self.column_width = self.settings.frame_width / 2
+        self.dialogs = (
+            Dialog(plain('ANN'), [
+                plain('Some words ' * 20), plain('(beat)'), plain(''),
+                plain('More.'),
+            ]),
+            Dialog(plain('BOB'), [plain('Other words ' * 40)]),
+        )
+
+    def columns(self):
+        return [
+            _dialog_to_flowables(
+                dialog, self.settings, column_width=self.column_width
+            )
+            for dialog in self.dialogs
+        ]
+
+    def table(self):
+        return Table(
+            [self.columns()],
+            splitInRow=1,
+            spaceBefore=self.settings.line_height,
+            colWidths=[self.column_width] * 2,
+            style=self.settings.dual_dialog_table_style,
+        )
+
+    def dual_dialog(self):
+        return DualDialogColumns(
+            self.columns(), self.column_width,
+            spaceBefore=self.settings.line_height,
+        )
+
+    def test_size_is_same_as_table(self):
+        width = self.settings.frame_width
+        self.assertEqual(
+            self.table().wrap(width, 1000),
+            self.dual_dialog().wrap(width, 1000)
+        )
+
+    def test_split_is_same_as_table(self):
+        width = self.settings.frame_width
+        for height in range(0, 400, 6):
+            expected = [
+                (part.wrap(width, 1000), part.getSpaceBefore())
+                for part in self.table().split(width, height)
+            ]
+            actual = [
+                (part.wrap(width, 1000), part.getSpaceBefore())
+                for part in self.dual_dialog().split(width, height)
+            ]
+            self.assertEqual(expected, actual, height)
+
+    def test_column_styles_are_cached(self):
+        styles = self.settings.column_styles(self.column_width)
+        self.assertIs(styles, self.settings.column_styles(self.column_width))
+        character, dialog, parenthetical = styles
+        self.assertEqual(
+            self.settings.dialog_style.leftIndent / 2, dialog.leftIndent
+        )
+        self.assertEqual(
+            self.settings.dialog_style.rightIndent / 2, dialog.rightIndent
+        )
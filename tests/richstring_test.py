@@ -2,6 +2,9 @@
 # Licensed under the MIT license:
 # http://www.opensource.org/licenses/mit-license.php
 
+import pickle
+import random
+import re
 from unittest import TestCase
 
 from screenplain.richstring import (
@@ -9,6 +12,7 @@ from screenplain.richstring import (
     Italic,
     RichString,
     Segment,
+    all_styles,
     bold,
     empty_string,
     italic,
@@ -17,6 +21,53 @@ from screenplain.richstring import (
     underline,
 )
 
+_magic_re = re.compile('[\ue700-\ue705]')
+
+
+def reference_parse_emphasis(source):
+    """The original implementation of parse_emphasis, which makes one
+    substitution pass per style, inserting magic characters.
+
+    """
+    source = source.replace('\\*', '\ue706')
+    for style in all_styles:
+        source = style.parse_re.sub(
+            style.start_magic + r'\1' + style.end_magic, source
+        )
+    source = source.replace('\ue706', '*')
+
+    styles = set()
+    segments = []
+    pos = 0
+
+    def append(pos, end):
+        if pos == end:
+            return
+        text = source[pos:end]
+        segments.append(Segment(text, styles))
+
+    for match in _magic_re.finditer(source):
+        end = match.start()
+        append(pos, end)
+        pos = end + 1
+        magic = match.group(0)
+        for style in all_styles:
+            if magic == style.start_magic:
+                styles.add(style)
+            elif magic == style.end_magic:
+                styles.remove(style)
+    append(pos, len(source))
+
+    return RichString(*segments)
+
+
+def random_markup(rng, length):
+    """Create a random string that is likely to contain emphasis."""
+    return ''.join(
+        rng.choice(('a', 'b', ' ', '*', '**', '_', '\\', '\\*'))
+        for _ in range(length)
+    )
+
 
 class LowLevelRichStringTests(TestCase):
 
@@ -26,6 +77,14 @@ class LowLevelRichStringTests(TestCase):
         self.assertEqual('hello', s.segments[0].text)
         self.assertEqual(set(), s.segments[0].styles)
 
+    def test_styles_are_stored_as_bit_mask(self):
+        segment = Segment('hello', {Italic, Bold})
+        self.assertEqual(Bold.mask | Italic.mask, segment.style_mask)
+        self.assertEqual({Bold, Italic}, segment.styles)
+        self.assertEqual((Bold, Italic), segment.get_ordered_styles())
+        self.assertEqual(segment, Segment.from_mask('hello', 3))
+        self.assertFalse(hasattr(segment, '__dict__'))
+
 
 class RichStringOperatorTests(TestCase):
 
@@ -61,6 +120,25 @@ class RichStringOperatorTests(TestCase):
         result = s1 + s2
         self.assertEqual(expected, result)
 
+    def test_hash(self):
+        self.assertEqual(hash(bold('Hello')), hash(bold('Hello')))
+        self.assertEqual(1, len({bold('Hello'), bold('Hello')}))
+        self.assertEqual(2, len({bold('Hello'), plain('Hello')}))
+
+    def test_immutable(self):
+        s = bold('Hello')
+        with self.assertRaises(AttributeError):
+            s.segments = ()
+        with self.assertRaises(AttributeError):
+            s.segments[0].text = 'Goodbye'
+        with self.assertRaises(AttributeError):
+            del s.segments[0].style_mask
+        self.assertEqual(bold('Hello'), s)
+
+    def test_pickle(self):
+        s = bold('Hello') + plain(' there')
+        self.assertEqual(s, pickle.loads(pickle.dumps(s)))
+
 
 class StyleGeneratorTests(TestCase):
 
@@ -93,6 +171,28 @@ class RichStringTests(TestCase):
         )
 
 
+class PlainFastPathTests(TestCase):
+
+    def test_plain_line_gives_single_segment(self):
+        s = parse_emphasis.__wrapped__('CUT TO:')
+        self.assertEqual(plain('CUT TO:'), s)
+        self.assertEqual('CUT TO:', s.to_html())
+
+    def test_escaped_characters(self):
+        for line, html in (
+            ('Tom & Jerry', 'Tom &amp; Jerry'),
+            ('a <b>', 'a &lt;b&gt;'),
+            ('caf\xe9', 'caf&#233;'),
+            ('  two', '&nbsp; two'),
+            ('one  two', 'one&nbsp; two'),
+            ('back\\slash', 'back\\slash'),
+        ):
+            self.assertEqual(html, parse_emphasis.__wrapped__(line).to_html())
+
+    def test_empty_line(self):
+        self.assertEqual(empty_string, parse_emphasis.__wrapped__(''))
+
+
 class ParseEmphasisTests(TestCase):
 
     def test_parse_without_emphasis(self):
@@ -212,3 +312,33 @@ class ParseEmphasisTests(TestCase):
             parse_emphasis(r'\*hello*'),
             plain('*hello*')
         )
+
+
+class ParseEmphasisCacheTests(TestCase):
+
+    def setUp(self):
+        parse_emphasis.cache_clear()
+
+    def test_repeated_source_gives_same_object(self):
+        first = parse_emphasis('CUT TO:')
+        self.assertIs(first, parse_emphasis('CUT TO:'))
+        info = parse_emphasis.cache_info()
+        self.assertEqual((1, 1), (info.hits, info.misses))
+
+    def test_uncached_function(self):
+        first = parse_emphasis('**JOHN**')
+        uncached = parse_emphasis.__wrapped__('**JOHN**')
+        self.assertIsNot(first, uncached)
+        self.assertEqual(first, uncached)
+
+
+class ParseEmphasisDifferentialTests(TestCase):
+
+    def test_same_result_as_reference(self):
+        rng = random.Random(1234)
+        for _ in range(20000):
+            source = random_markup(rng, rng.randint(0, 12))
+            self.assertEqual(
+                reference_parse_emphasis(source), parse_emphasis(source),
+                source
+            )
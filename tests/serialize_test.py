@@ -0,0 +1,103 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+from io import StringIO
+from unittest import TestCase
+
+from screenplain import serialize
+from screenplain.parsers import fountain
+from screenplain.richstring import bold, plain
+from screenplain.types import (
+    Action,
+    ColumnarParagraphs,
+    Dialog,
+    DualDialog,
+    PageBreak,
+    Screenplay,
+    Section,
+    Slug,
+    Transition,
+)
+from tests.fountain_test import fountain_files, read_file, to_html
+
+
+def attributes(paragraph):
+    """Get the contents of a paragraph as something comparable."""
+    if isinstance(paragraph, DualDialog):
+        return attributes(paragraph.left), attributes(paragraph.right)
+    return type(paragraph), [
+        getattr(paragraph, name) for name in type(paragraph).__slots__
+    ]
+
+
+class SerializeTests(TestCase):
+
+    def assert_round_trip(self, screenplay, **options):
+        result = serialize.loads(serialize.dumps(screenplay), **options)
+        self.assertEqual(screenplay.title_page, result.title_page)
+        self.assertEqual(
+            [attributes(p) for p in screenplay],
+            [attributes(p) for p in result]
+        )
+        if screenplay.spans is None:
+            self.assertIsNone(result.spans)
+        else:
+            self.assertEqual(
+                [screenplay.spans[i] for i in range(len(screenplay.spans))],
+                [result.spans[i] for i in range(len(result.spans))]
+            )
+        return result
+
+    def test_files(self):
+        for path in fountain_files():
+            screenplay = fountain.parse(StringIO(read_file(path)))
+            result = self.assert_round_trip(screenplay)
+            self.assertEqual(
+                to_html(screenplay.paragraphs), to_html(result.paragraphs)
+            )
+
+    def test_all_paragraph_types(self):
+        slug = Slug(bold('INT. HOUSE - DAY'), plain('1A'))
+        slug.set_synopsis('A synopsis')
+        dialog = Dialog(plain('BRICK'), [plain('(quietly)'), plain('Hi')])
+        screenplay = Screenplay(
+            {'Title': ['Brick & Steel', 'Part 2'], 'Author': []},
+            [
+                Section(plain('Act one'), 1, 'Section synopsis'),
+                slug,
+                Slug(plain('EXT. HOUSE')),
+                Action([plain('One'), bold('Two')], centered=True),
+                dialog,
+                DualDialog(dialog, Dialog(plain('STEEL'), [plain('Ho')])),
+                Transition(plain('CUT TO:')),
+                PageBreak(),
+                Action([plain('Unicode åäö \U0001f600')]),
+            ]
+        )
+        self.assert_round_trip(screenplay)
+
+    def test_load_columnar(self):
+        screenplay = Screenplay(paragraphs=[Action([plain('Hello')])])
+        result = self.assert_round_trip(screenplay, columnar=True)
+        self.assertIsInstance(result.paragraphs, ColumnarParagraphs)
+        result.append(Action([plain('Hello again')]))
+        self.assertEqual(
+            [plain('Hello again')], result.paragraphs[1].lines
+        )
+
+    def test_empty_screenplay(self):
+        self.assert_round_trip(Screenplay())
+
+    def test_unknown_paragraph_type(self):
+        with self.assertRaises(TypeError):
+            serialize.dumps(Screenplay(paragraphs=[object()]))
+
+    def test_invalid_data(self):
+        data = serialize.dumps(Screenplay())
+        with self.assertRaises(ValueError):
+            serialize.loads(b'PICKLE' + data[6:])
+        with self.assertRaises(ValueError):
+            serialize.loads(data[:6] + b'\xff\xff' + data[8:])
+        with self.assertRaises(ValueError):
+            serialize.loads(data[:-1])
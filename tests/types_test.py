@@ -0,0 +1,155 @@
+# Copyright (c) 2026 Martin Vilcans
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license.php
+
+from io import StringIO
+from unittest import TestCase
+
+from screenplain.export.fdx import to_fdx
+from screenplain.parsers import fountain
+from screenplain.richstring import bold, plain
+from screenplain.types import (
+    Action,
+    ColumnarParagraphs,
+    Dialog,
+    PageBreak,
+    Screenplay,
+    Slug,
+)
+from tests.fountain_test import fountain_files, read_file, to_html
+
+
+def to_fdx_string(screenplay):
+    out = StringIO()
+    to_fdx(screenplay, out)
+    return out.getvalue()
+
+
+class ColumnarParagraphsTests(TestCase):
+
+    def test_same_output_as_list(self):
+        for path in fountain_files():
+            screenplay = fountain.parse(StringIO(read_file(path)))
+            html = to_html(screenplay.paragraphs)
+            fdx = to_fdx_string(screenplay)
+            screenplay.compact()
+            self.assertIsInstance(screenplay.paragraphs, ColumnarParagraphs)
+            self.assertEqual(html, to_html(screenplay.paragraphs), path)
+            self.assertEqual(fdx, to_fdx_string(screenplay), path)
+
+    def test_paragraph_attributes(self):
+        slug = Slug(bold('INT. HOUSE'), plain('1'))
+        slug.set_synopsis('Synopsis')
+        dialog = Dialog(plain('JOHN'), [plain('(quietly)'), plain('Hi')])
+        paragraphs = ColumnarParagraphs([slug, dialog])
+
+        slug = paragraphs[0]
+        self.assertEqual(bold('INT. HOUSE'), slug.line)
+        self.assertEqual(plain('1'), slug.scene_number)
+        self.assertEqual('Synopsis', slug.synopsis)
+        dialog = paragraphs[-1]
+        self.assertEqual(plain('JOHN'), dialog.character)
+        self.assertEqual(
+            [(True, plain('(quietly)')), (False, plain('Hi'))],
+            dialog.blocks
+        )
+
+    def test_append_to_compact_screenplay(self):
+        screenplay = Screenplay(paragraphs=[Action([plain('One')])])
+        screenplay.compact()
+        screenplay.append(PageBreak())
+        screenplay.append(Action([plain('Two')], centered=True))
+        paragraphs = list(screenplay)
+        self.assertEqual(
+            [Action, PageBreak, Action], [type(p) for p in paragraphs]
+        )
+        self.assertTrue(paragraphs[2].centered)
+        self.assertEqual(
+            [[plain('One')], [plain('Two')]],
+            [p.lines for p in screenplay.paragraphs[::2]]
+        )
+
+    def test_texts_are_stored_once(self):
+        paragraphs = ColumnarParagraphs(
+            [Action([plain('Same')]) for _ in range(10)]
+        )
+        self.assertEqual(['Same'], paragraphs.texts)
+
+    def test_unknown_paragraph_type(self):
+        paragraph = object()
+        paragraphs = ColumnarParagraphs([paragraph])
+        self.assertIs(paragraph, paragraphs[0])
+
+
+class ScreenplayIndexTests(TestCase):
+
+    def setUp(self):
+        self.screenplay = fountain.parse(StringIO('\n'.join([
+            '# Act 1',
+            '',
+            'Before the first scene.',
+            '',
+            '## Sequence',
+            '',
+            'INT. HOUSE - DAY',
+            '',
+            'JOHN (V.O.)',
+            '(quietly)',
+            'Hello.',
+            '',
+            'MARY',
+            'Hi.',
+            '',
+            'JOHN ^',
+            'Bye.',
+            '',
+            '# Act 2',
+            '',
+            'EXT. HOUSE - NIGHT',
+            '',
+            'JOHN',
+            'Again.',
+        ])))
+
+    def test_scenes(self):
+        index = self.screenplay.index
+        self.assertEqual([3, 7], list(index.scene_starts))
+        self.assertIsNone(index.scene_of(1))
+        self.assertEqual(0, index.scene_of(5))
+        self.assertEqual(1, index.scene_of(8))
+        self.assertEqual((3, 7), index.scene_range(0))
+        self.assertEqual((7, 9), index.scene_range(1))
+
+    def test_sections(self):
+        index = self.screenplay.index
+        self.assertEqual([0, 2, 6], list(index.section_starts))
+        self.assertEqual([-1, 0, -1], list(index.section_parents))
+        self.assertEqual((0, 6), index.section_range(0))
+        self.assertEqual((2, 6), index.section_range(1))
+        self.assertEqual((6, 9), index.section_range(2))
+        self.assertEqual([1], index.subsections(0))
+        self.assertEqual(1, index.section_of(4))
+        self.assertEqual(2, index.section_of(8))
+
+    def test_characters_include_dual_dialog(self):
+        index = self.screenplay.index
+        self.assertEqual(
+            [4, 5, 8], [number for number, _ in index.dialogs_of('JOHN')]
+        )
+        self.assertEqual(
+            [plain('Hello.'), plain('Bye.'), plain('Again.')],
+            index.lines_of('JOHN')
+        )
+        self.assertEqual([plain('Hi.')], index.lines_of('MARY'))
+        self.assertEqual([], index.lines_of('NOBODY'))
+
+    def test_index_is_created_once(self):
+        self.assertIs(self.screenplay.index, self.screenplay.index)
+
+    def test_append_invalidates_index(self):
+        self.assertEqual(2, len(self.screenplay.index.scene_starts))
+        self.screenplay.append(Slug(plain('INT. CAR')))
+        self.assertEqual(
+            [3, 7, 9], list(self.screenplay.index.scene_starts)
+        )
+        self.assertEqual((7, 9), self.screenplay.index.scene_range(1))
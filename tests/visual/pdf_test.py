@@ -9,15 +9,19 @@ PDF file using diff-pdf.
 diff-pdf can be installed on Debian with:
 
     sudo apt install diff-pdf-wx
+
+Use --backend native to test the PDF writer that does not use ReportLab
+against the same reference files.
 """
 
+import argparse
 import subprocess
 from pathlib import Path
 import sys
 import screenplain.main
 
 
-def compare(directory) -> bool:
+def compare(directory, backend="reportlab") -> bool:
     """Test that PDF generation produces consistent output."""
     reference_dir = Path(directory)
     fountain_files = list(reference_dir.glob("*.fountain"))
@@ -37,7 +41,9 @@ def compare(directory) -> bool:
         ).with_suffix(".pdf")
 
         # Generate PDF using screenplain Python API
-        screenplain.main.main([str(fountain_file), str(actual_file)])
+        screenplain.main.main([
+            "--pdf-backend", backend, str(fountain_file), str(actual_file)
+        ])
 
         # Compare files using diff-pdf (visual comparison)
         result = subprocess.run(
@@ -69,6 +75,14 @@ def compare(directory) -> bool:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--backend",
+        choices=screenplain.main.pdf_backends,
+        default="reportlab",
+        help="How to write the PDF files (default: reportlab)",
+    )
+    args = parser.parse_args()
     for path in ["tests/files", "examples"]:
-        if not compare(path):
+        if not compare(path, args.backend):
             sys.exit(1)